@@ -0,0 +1,123 @@
+# atlas.py
+import pygame
+
+from settings import ATLAS_PAGE_SIZE
+
+
+def pack_shelves(sizes: dict, page_size: int) -> dict:
+    """
+    Reparte rectángulos (clave -> (ancho, alto)) en páginas de `page_size` x
+    `page_size` por estanterías (shelf packing).
+
+    Se colocan de más alto a más bajo: cada estantería tiene la altura de su
+    primer sprite y se llena de izquierda a derecha; cuando no cabe, se abre
+    otra debajo y, si la página está llena, otra página. Un sprite más grande
+    que una página tiene página propia.
+
+    Devuelve clave -> (página, x, y).
+    """
+    placed = {}
+    pages = []  # por página: lista de estanterías [y, alto, x libre] y la y libre
+    order = sorted(sizes, key=lambda k: (sizes[k][1], sizes[k][0]), reverse=True)
+
+    for key in order:
+        w, h = sizes[key]
+        if w > page_size or h > page_size:
+            pages.append({"shelves": [], "free_y": page_size})
+            placed[key] = (len(pages) - 1, 0, 0)
+            continue
+
+        spot = None
+        for page_index, page in enumerate(pages):
+            for shelf in page["shelves"]:
+                if h <= shelf[1] and shelf[2] + w <= page_size:
+                    spot = (page_index, shelf[2], shelf[0])
+                    shelf[2] += w
+                    break
+            if spot is None and page["free_y"] + h <= page_size:
+                spot = (page_index, 0, page["free_y"])
+                page["shelves"].append([page["free_y"], h, w])
+                page["free_y"] += h
+            if spot is not None:
+                break
+
+        if spot is None:
+            pages.append({"shelves": [[0, h, w]], "free_y": h})
+            spot = (len(pages) - 1, 0, 0)
+        placed[key] = spot
+    return placed
+
+
+def pack_atlas(sprites: dict, page_size: int = ATLAS_PAGE_SIZE) -> tuple:
+    """
+    Copia las Surfaces de `sprites` (clave -> Surface) en unas pocas páginas grandes.
+
+    Devuelve (páginas, regiones) con regiones = clave -> (página, x, y, ancho, alto),
+    una estructura simple que también se puede guardar en la caché en disco.
+    Cada página se recorta al espacio que de verdad se usa.
+    """
+    sizes = {key: surf.get_size() for key, surf in sprites.items()}
+    placed = pack_shelves(sizes, page_size)
+
+    extents = {}
+    for key, (page, x, y) in placed.items():
+        w, h = sizes[key]
+        right, bottom = extents.get(page, (0, 0))
+        extents[page] = (max(right, x + w), max(bottom, y + h))
+
+    template = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+    pages = [pygame.Surface(extents[i], pygame.SRCALPHA, template) for i in range(len(extents))]
+
+    regions = {}
+    for key, (page, x, y) in placed.items():
+        surf = sprites[key]
+        if not surf.get_flags() & pygame.SRCALPHA:
+            surf = surf.convert_alpha()
+        # Página transparente + MAX = copia exacta de color y alpha (sin mezclar)
+        pages[page].blit(surf, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        regions[key] = (page, x, y) + sizes[key]
+    return pages, regions
+
+
+class SpriteAtlas:
+    """
+    Sprites empaquetados en unas pocas Surfaces grandes (páginas).
+
+    Cada sprite es una región (página, rect): se dibuja con
+    `screen.blit(página, pos, rect)`. Menos objetos Surface, píxeles
+    contiguos en memoria y un solo sitio donde contar la memoria de sprites.
+
+    Las regiones salen de `pack_atlas` (o de la caché en disco).
+    Todas las Surfaces que entren deben usarse sin alpha de superficie
+    (`set_alpha`): esa propiedad es de la página entera, no de la región.
+    """
+
+    def __init__(self, pages: list, regions: dict):
+        self.pages = pages
+        self.regions = {
+            key: (pages[page], pygame.Rect(x, y, w, h))
+            for key, (page, x, y, w, h) in regions.items()
+        }
+
+    def __getitem__(self, key) -> tuple:
+        """(página, rect de origen) del sprite `key`."""
+        return self.regions[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.regions
+
+    def size(self, key) -> tuple:
+        return self.regions[key][1].size
+
+    def nbytes(self) -> int:
+        return sum(page.get_pitch() * page.get_height() for page in self.pages)
+
+    def stats(self) -> dict:
+        used = sum(rect.width * rect.height * 4 for _, rect in self.regions.values())
+        total = self.nbytes()
+        return {
+            "pages": len(self.pages),
+            "sprites": len(self.regions),
+            "bytes": total,
+            "fill": round(used / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,163 @@
+# benchmark.py
+"""
+Benchmark de tiempos de frame de GameState (headless).
+
+Construye GameState con una semilla fija y entrada programada, ejecuta N ticks
+con dt fijo y mide update() y draw() por separado, además de sus subfases
+(scroll, colisiones, cada capa de render, HUD...) con el PhaseProfiler.
+Si la ardilla muere, se reinicia con la misma semilla (como al perder una vida).
+
+Saca un JSON con mean, p50, p95, p99 y max (ms) por fase, y la ocupación de
+los pools de obstáculos (pico y desbordamientos por plano) y del atlas de
+sprites (páginas, bytes y proporción ocupada).
+
+Uso (desde la raíz del repo):
+    python src/benchmark.py --ticks 5000 --output bench.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+
+import pygame
+
+from settings import FPS
+from headless import init_headless, default_script
+from input_sources import ScriptedInput, ReplayInput
+from profiling import PhaseProfiler
+
+
+def merge_pool_stats(totals: dict, state) -> dict:
+    """Acumula las estadísticas de los pools de `state` (pico máximo, desbordamientos sumados)."""
+    for name in ("trees", "acorns", "enemies"):
+        pool = getattr(state, name, None)
+        if pool is None or not hasattr(pool, "stats"):
+            continue
+        pools = totals.setdefault(name, {})
+        for plane, stats in pool.stats().items():
+            total = pools.setdefault(plane, {"capacity": stats["capacity"], "peak": 0, "overflows": 0})
+            total["peak"] = max(total["peak"], stats["peak"])
+            total["overflows"] += stats["overflows"]
+    return totals
+
+
+def run_benchmark(
+    ticks: int,
+    seed: int = 1234,
+    dt: float = 1.0 / FPS,
+    draw: bool = True,
+    replay_path: str = None,
+) -> dict:
+    from game_states import GameState
+
+    screen = pygame.display.get_surface() or init_headless()
+
+    if replay_path:
+        input_source = ReplayInput.load(replay_path)
+        seed = input_source.seed
+        dt = 1.0 / input_source.tick_rate
+    else:
+        input_source = ScriptedInput(default_script)
+
+    profiler = PhaseProfiler()
+    clock = time.perf_counter
+
+    def new_state():
+        state = GameState(input_source=input_source, seed=seed, dt=dt)
+        state.profiler = profiler
+        return state
+
+    state = new_state()
+    restarts = 0
+    pools = {}
+    for _ in range(ticks):
+        t0 = clock()
+        state.update(dt)
+        t1 = clock()
+        profiler.record("update", t1 - t0)
+
+        if draw:
+            state.draw(screen)
+            profiler.record("draw", clock() - t1)
+
+        if state.restart_requested:
+            restarts += 1
+            merge_pool_stats(pools, state)
+            state = new_state()
+    merge_pool_stats(pools, state)
+
+    return {
+        "seed": seed,
+        "ticks": ticks,
+        "dt": dt,
+        "draw": draw,
+        "replay": replay_path,
+        "restarts": restarts,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "phases": profiler.summary(),
+        "pools": pools,
+        "atlas": state.atlas.stats(),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de GameState.update / GameState.draw")
+    parser.add_argument("--ticks", type=int, default=5000, help="ticks a simular")
+    parser.add_argument("--seed", type=int, default=1234, help="semilla del mundo")
+    parser.add_argument("--dt", type=float, default=1.0 / FPS, help="paso fijo en segundos")
+    parser.add_argument("--no-draw", action="store_true", help="medir solo update()")
+    parser.add_argument(
+        "--replay", metavar="FICHERO", default=None,
+        help="usar una partida grabada (main.py --record) como carga de trabajo",
+    )
+    parser.add_argument("--output", metavar="FICHERO", default=None, help="escribir el JSON aquí")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    init_headless()
+
+    # Los prints de depuración del juego falsearían los tiempos
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        result = run_benchmark(
+            args.ticks, seed=args.seed, dt=args.dt, draw=not args.no_draw,
+            replay_path=args.replay,
+        )
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"[INFO] Benchmark guardado en {args.output}")
+    else:
+        print(text)
+
+    for name in ("update", "draw"):
+        stats = result["phases"].get(name)
+        if stats:
+            print(
+                f"[PERF] {name}: mean {stats['mean_ms']:.3f} ms, p95 {stats['p95_ms']:.3f} ms, "
+                f"p99 {stats['p99_ms']:.3f} ms",
+                file=sys.stderr,
+            )
+    for name, planes in result["pools"].items():
+        overflows = sum(p["overflows"] for p in planes.values())
+        if overflows:
+            print(f"[WARN] Pool {name}: {overflows} desbordamientos", file=sys.stderr)
+    atlas = result["atlas"]
+    print(
+        f"[PERF] Atlas: {atlas['sprites']} sprites en {atlas['pages']} páginas, "
+        f"{atlas['bytes'] / (1024 * 1024):.1f} MB ({atlas['fill']:.0%} ocupado)",
+        file=sys.stderr,
+    )
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# collision_masks.py
+import math
+
+import pygame
+
+from settings import COLLISION_ALPHA_THRESHOLD
+
+
+def build_mask(surface: pygame.Surface, clip: pygame.Rect = None) -> tuple:
+    """
+    Máscara de colisión de `surface` (los píxeles con alpha por encima de
+    COLLISION_ALPHA_THRESHOLD) y el rect que ocupan esos píxeles.
+    Con `clip` (rect relativo a la Surface) solo chocan los píxeles de dentro
+    de ese rectángulo (p. ej. el tronco de un árbol).
+    """
+    if clip is None:
+        clip = surface.get_rect()
+        mask = pygame.mask.from_surface(surface, COLLISION_ALPHA_THRESHOLD)
+    else:
+        # Solo se lee la zona recortada; el resto de la máscara queda vacío
+        clip = clip.clip(surface.get_rect())
+        mask = pygame.mask.Mask(surface.get_size())
+        zone = surface.subsurface(clip)
+        mask.draw(pygame.mask.from_surface(zone, COLLISION_ALPHA_THRESHOLD), clip.topleft)
+        surface = zone
+    bounds = surface.get_bounding_rect(COLLISION_ALPHA_THRESHOLD + 1).move(clip.topleft)
+    return mask, bounds
+
+
+class MaskBank:
+    """
+    Máscaras de colisión precalculadas: clave -> (Mask, rect opaco).
+
+    El rect opaco (relativo a la Surface) es el prefiltro barato: solo si
+    dos rects se tocan se compara píxel a píxel con `Mask.overlap`.
+    Se generan una vez al cargar; en la partida solo se consultan.
+    Las Surfaces repetidas (mismo objeto) comparten máscara.
+
+    Para sprites que se dibujan escalados (la ardilla), `scaled()` da la
+    máscara en el nivel de una ScaleLadder: la misma Surface que se ve.
+    """
+
+    def __init__(self, surfaces: dict, clips: dict = None):
+        clips = clips or {}
+        self.masks = {}
+        # (id de la máscara base, nivel) -> (Mask, rect opaco), al primer uso
+        self.scaled_masks = {}
+        done = {}
+        for key, surface in surfaces.items():
+            clip = clips.get(key)
+            done_key = (id(surface), None if clip is None else tuple(clip))
+            entry = done.get(done_key)
+            if entry is None:
+                entry = done[done_key] = build_mask(surface, clip)
+            self.masks[key] = entry
+
+    def __getitem__(self, key) -> tuple:
+        """(Mask, rect opaco) de `key`."""
+        return self.masks[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.masks
+
+    def scaled(self, key, ladder, scale: float) -> tuple:
+        """
+        (Mask, rect opaco) de `key` en el nivel de `ladder` más cercano a
+        `scale`, al mismo tamaño que el frame escalado con ScaledFrameTarget.
+        `Mask.scale` (vecino más cercano) da los mismos bits que enmascarar
+        el frame escalado con `transform.scale`.
+        """
+        mask, bounds = self.masks[key]
+        level = ladder.levels[ladder.nearest(scale)]
+        if level == 1.0:
+            return mask, bounds
+
+        scaled_key = (id(mask), level)
+        entry = self.scaled_masks.get(scaled_key)
+        if entry is None:
+            w, h = mask.get_size()
+            size = (max(1, int(w * level)), max(1, int(h * level)))
+            sx, sy = size[0] / w, size[1] / h
+            # Rect opaco escalado hacia fuera: sigue cubriendo todos los bits
+            left, top = int(bounds.left * sx), int(bounds.top * sy)
+            right = min(size[0], math.ceil(bounds.right * sx))
+            bottom = min(size[1], math.ceil(bounds.bottom * sy))
+            entry = (mask.scale(size), pygame.Rect(left, top, right - left, bottom - top))
+            self.scaled_masks[scaled_key] = entry
+        return entry
+
+    def nbytes(self) -> int:
+        # Un bit por píxel (aprox.), contando una vez cada máscara compartida
+        unique = {id(mask): mask for mask, _ in self.masks.values()}
+        unique.update((id(mask), mask) for mask, _ in self.scaled_masks.values())
+        return sum(w * h // 8 for w, h in (m.get_size() for m in unique.values()))
+
+    def stats(self) -> dict:
+        return {"masks": len(self.masks), "bytes": self.nbytes()}
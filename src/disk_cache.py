@@ -0,0 +1,243 @@
+# disk_cache.py
+import hashlib
+import json
+import mmap
+import os
+import threading
+
+import pygame
+
+# Sube este número si cambia cómo se generan las variantes (tintes, flips,
+# esquinas...) sin cambiar su clave: invalida todo lo guardado en disco.
+DISK_CACHE_VERSION = 1
+
+INDEX_NAME = "index.json"
+
+
+# ----------------- SERIALIZAR LA ESTRUCTURA -----------------
+
+def _encode(value, surfaces, seen):
+    """
+    Convierte un asset (Surface, lista/tupla/dict de Surfaces y números/textos)
+    en algo que cabe en JSON. Cada Surface se sustituye por su índice en
+    `surfaces`; una Surface repetida (mismo objeto) se guarda una sola vez.
+    """
+    if isinstance(value, pygame.Surface):
+        index = seen.get(id(value))
+        if index is None:
+            index = seen[id(value)] = len(surfaces)
+            surfaces.append(value)
+        return {"s": index}
+    if isinstance(value, (bool, int, float, str)) or value is None:
+        return value
+    if isinstance(value, list):
+        return {"l": [_encode(v, surfaces, seen) for v in value]}
+    if isinstance(value, tuple):
+        return {"t": [_encode(v, surfaces, seen) for v in value]}
+    if isinstance(value, dict):
+        return {"d": [[_encode(k, surfaces, seen), _encode(v, surfaces, seen)] for k, v in value.items()]}
+    raise TypeError(f"no se puede guardar en disco: {type(value).__name__}")
+
+
+def _decode(data, surfaces):
+    if isinstance(data, dict):
+        if "s" in data:
+            return surfaces[data["s"]]
+        if "l" in data:
+            return [_decode(v, surfaces) for v in data["l"]]
+        if "t" in data:
+            return tuple(_decode(v, surfaces) for v in data["t"])
+        return {_decode(k, surfaces): _decode(v, surfaces) for k, v in data["d"]}
+    return data
+
+
+# ----------------- CACHÉ EN DISCO -----------------
+
+class DiskSpriteCache:
+    """
+    Caché persistente (entre ejecuciones) de sprites ya decodificados y transformados.
+
+    Guarda el resultado FINAL de una factory de assets (escalado, tintado,
+    girado, con esquinas redondeadas...) como píxeles RGBA en crudo, un
+    fichero `.rgba` por entrada, más un `index.json` pequeño con la
+    estructura y el tamaño de cada Surface.
+
+    - Clave: hash del contenido de los ficheros fuente + la clave de la caché
+      en memoria (que ya incluye tamaño y transformación). Si cambia una
+      imagen, cambia la clave y la entrada vieja se borra al guardar la nueva.
+    - Lectura: el `.rgba` se mapea en memoria (mmap) y cada Surface se crea
+      con `pygame.image.frombuffer` sobre ese mapa, sin decodificar nada:
+      en un arranque en caliente no se usa PIL ni smoothscale.
+    - El hash de cada fuente se recuerda junto a su tamaño y fecha de
+      modificación, para no releer las imágenes en cada arranque.
+
+    Si algo falla (disco lleno, índice corrupto, fuente que no existe...)
+    se ejecuta la factory sin más: la caché en disco nunca rompe la carga.
+    """
+
+    def __init__(self, directory: str, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._lock = threading.RLock()
+        self._index = None   # se lee del disco la primera vez que hace falta
+
+    # ---------- índice ----------
+
+    def _load_index(self) -> dict:
+        if self._index is None:
+            index = {}
+            try:
+                with open(os.path.join(self.directory, INDEX_NAME)) as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                pass
+            if index.get("version") != DISK_CACHE_VERSION:
+                index = {"version": DISK_CACHE_VERSION, "sources": {}, "entries": {}}
+            self._index = index
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, INDEX_NAME)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp, path)
+
+    def _source_hash(self, path: str) -> str:
+        """Hash del contenido de `path` (recordado mientras no cambien tamaño ni fecha)."""
+        st = os.stat(path)
+        sources = self._load_index()["sources"]
+        known = sources.get(path)
+        if known is not None and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+            return known[2]
+
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        sources[path] = [st.st_mtime_ns, st.st_size, digest.hexdigest()]
+        return sources[path][2]
+
+    def _entry_id(self, key, sources) -> str:
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16)
+        for path in sources:
+            digest.update(self._source_hash(path).encode())
+        return digest.hexdigest()
+
+    # ---------- lectura / escritura ----------
+
+    def _read(self, entry_id: str, entry: dict):
+        surfaces = []
+        path = os.path.join(self.directory, entry_id + ".rgba")
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for w, h, offset, alpha in entry["surfaces"]:
+                    size = w * h * 4
+                    if offset + size > len(view):
+                        raise ValueError(f"{path} está truncado")
+                    raw = pygame.image.frombuffer(view[offset:offset + size], (w, h), "RGBA")
+                    # convert_alpha copia al formato del display: después el mapa ya no hace falta
+                    surf = raw.convert_alpha()
+                    del raw
+                    if alpha is not None:
+                        surf.set_alpha(alpha)
+                    surfaces.append(surf)
+            finally:
+                view.release()
+        self.bytes_read += sum(w * h * 4 for w, h, _, _ in entry["surfaces"])
+        return _decode(entry["layout"], surfaces)
+
+    def _write(self, key, entry_id: str, value):
+        surfaces = []
+        layout = _encode(value, surfaces, {})
+        if not surfaces:
+            return
+
+        meta = []
+        offset = 0
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, entry_id + ".rgba")
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            for surf in surfaces:
+                w, h = surf.get_size()
+                f.write(pygame.image.tobytes(surf, "RGBA"))
+                alpha = surf.get_alpha()
+                meta.append([w, h, offset, alpha if alpha not in (None, 255) else None])
+                offset += w * h * 4
+        os.replace(tmp, path)
+        self.bytes_written += offset
+
+        entries = self._load_index()["entries"]
+        # La misma clave con fuentes distintas (imagen editada): la entrada vieja sobra
+        key_repr = repr(key)
+        for old_id in [i for i, e in entries.items() if e["key"] == key_repr and i != entry_id]:
+            del entries[old_id]
+            try:
+                os.remove(os.path.join(self.directory, old_id + ".rgba"))
+            except OSError:
+                pass
+        entries[entry_id] = {"key": key_repr, "layout": layout, "surfaces": meta}
+        self._save_index()
+
+    def load_or_build(self, key, sources, factory):
+        """
+        Devuelve el asset de `key` desde disco o lo crea con `factory()` y lo guarda.
+        `sources` son las rutas de los ficheros de los que sale el asset.
+        """
+        if not self.enabled:
+            return factory()
+
+        with self._lock:
+            try:
+                entry_id = self._entry_id(key, sources)
+            except OSError:
+                # Falta alguna fuente: la factory decide (fallback, excepción...)
+                return factory()
+            entry = self._load_index()["entries"].get(entry_id)
+            if entry is not None:
+                try:
+                    value = self._read(entry_id, entry)
+                    self.hits += 1
+                    return value
+                except (OSError, ValueError, pygame.error) as e:
+                    print(f"[WARN] Caché en disco inválida para {key}: {e}")
+                    del self._index["entries"][entry_id]
+
+        self.misses += 1
+        value = factory()
+        with self._lock:
+            try:
+                self._write(key, entry_id, value)
+            except (OSError, TypeError, pygame.error) as e:
+                print(f"[WARN] No se pudo guardar {key} en la caché en disco: {e}")
+        return value
+
+    def clear(self):
+        """Borra todo lo guardado en disco."""
+        with self._lock:
+            index = self._load_index()
+            for entry_id in index["entries"]:
+                try:
+                    os.remove(os.path.join(self.directory, entry_id + ".rgba"))
+                except OSError:
+                    pass
+            index["entries"].clear()
+            self._save_index()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._load_index()["entries"]),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes_read": self.bytes_read,
+                "bytes_written": self.bytes_written,
+            }
@@ -1,12 +1,13 @@
 # entities.py
 import pygame
-from utils import load_gif_frames, load_image
+from utils import load_gif_frames, load_image, asset_cache
 from settings import (
     PLANE_FOREGROUND,
     PLANE_MID,
     PLANE_BACKGROUND,
 )
 from abilities import BreakObjectsAbility
+from collision_masks import MaskBank
 
 
 class Entity:
@@ -57,13 +58,60 @@ def apply_plane_filter_to_image(img: pygame.Surface, plane: int) -> pygame.Surfa
     return img
 
 
+# Tinte extra por plano (antes se aplicaba en GameState.draw en cada frame)
+PLANE_DRAW_TINTS = {
+    PLANE_FOREGROUND: (160, 160, 160, 255),
+    PLANE_BACKGROUND: (140, 140, 160, 255),
+}
+
+
+def make_plane_frame(img: pygame.Surface, plane: int, facing_right: bool) -> pygame.Surface:
+    """Frame final para un plano y orientación: filtro del plano + tinte + flip."""
+    surf = apply_plane_filter_to_image(img, plane)
+    tint = PLANE_DRAW_TINTS.get(plane)
+    if tint is not None:
+        if surf is img:
+            surf = img.copy()
+        surf.fill(tint, special_flags=pygame.BLEND_RGBA_MULT)
+    if not facing_right:
+        surf = pygame.transform.flip(surf, True, False)
+    return surf
+
+
+def build_frame_bank(animations: dict) -> dict:
+    """
+    Genera todas las combinaciones (animación, índice, plano, mira_derecha) -> Surface.
+    Los frames repetidos entre animaciones (p. ej. idle = run[0]) se generan una vez.
+    """
+    bank = {}
+    done = {}
+    for name, frames in animations.items():
+        for index, frame in enumerate(frames):
+            for plane in (PLANE_FOREGROUND, PLANE_MID, PLANE_BACKGROUND):
+                for facing_right in (True, False):
+                    done_key = (id(frame), plane, facing_right)
+                    surf = done.get(done_key)
+                    if surf is None:
+                        surf = make_plane_frame(frame, plane, facing_right)
+                        done[done_key] = surf
+                    bank[(name, index, plane, facing_right)] = surf
+    return bank
+
+
 class Squirrel(Entity):
+    # Zona del frame que choca (centrada): la cola y las orejas se atraviesan
+    HIT_WIDTH_FACTOR = 0.4
+    HIT_HEIGHT_FACTOR = 0.8
+
     def __init__(self, x, y):
         # Tamaño objetivo del sprite
         target_size = (250, 110)
 
         # Cargar TODOS los frames del GIF de carrera
-        run_base = load_gif_frames("assets/sprites/squirrel/run/player.gif", size=target_size)
+        run_path = "assets/sprites/squirrel/run/player.gif"
+        jump_front_path = "assets/sprites/squirrel/run/jump_front.png"
+        jump_back_path = "assets/sprites/squirrel/run/jump_back.png"
+        run_base = load_gif_frames(run_path, size=target_size)
         if not run_base:
             surf = pygame.Surface(target_size, pygame.SRCALPHA)
             surf.fill((160, 82, 45))
@@ -71,49 +119,58 @@ class Squirrel(Entity):
 
         idle_base = [run_base[0]]
 
-        # Animaciones base (sin filtro de plano)
-        self.base_animations = {
-            "idle": idle_base,
-            "run": run_base,
-        }
-
-        # Animaciones por plano
-        # 🔥 FOREGROUND AHORA USA LOS MISMOS FRAMES QUE MID (SIN SILUETA NEGRA)
-        self.animations_by_plane = {
-            PLANE_MID: {
-                "idle": idle_base,
-                "run": run_base,
-            },
-            PLANE_FOREGROUND: {
-                "idle": idle_base,          # <- ANTES era make_silhouette_frames(idle_base)
-                "run": run_base,            # <- ANTES era make_silhouette_frames(run_base)
-            },
-            PLANE_BACKGROUND: {
-                "idle": make_background_frames(idle_base),
-                "run": make_background_frames(run_base),
-            },
-        }
-
         # Cargar sprites de salto especial (frontal y trasero) base (sin filtro)
         try:
-            self.jump_front_base = load_image(
-                "assets/sprites/squirrel/run/jump_front.png",
-                size=target_size,
-            )
+            self.jump_front_base = load_image(jump_front_path, size=target_size)
         except Exception:
             self.jump_front_base = idle_base[0]
 
         try:
-            self.jump_back_base = load_image(
-                "assets/sprites/squirrel/run/jump_back.png",
-                size=target_size,
-            )
+            self.jump_back_base = load_image(jump_back_path, size=target_size)
         except Exception:
             self.jump_back_base = idle_base[0]
 
-        # Imagen override actual (ya filtrada según plano)
-        self.override_image = None
-        self.override_image_base = None  # sin filtro
+        # Animaciones base (sin filtro de plano)
+        # 🔥 FOREGROUND USA LOS MISMOS FRAMES QUE MID (SIN SILUETA NEGRA), solo tintados
+        self.base_animations = {
+            "idle": idle_base,
+            "run": run_base,
+            "jump_front": [self.jump_front_base],
+            "jump_back": [self.jump_back_base],
+        }
+        self.animation_lengths = {
+            name: len(frames) for name, frames in self.base_animations.items()
+        }
+
+        # Banco de frames: (animación, índice, plano, mira_derecha) -> Surface
+        # Ya filtrados, tintados y girados: en update solo se elige uno.
+        self.frame_bank = asset_cache.get_or_create(
+            (run_path, target_size, "frame_bank"),
+            lambda: build_frame_bank(self.base_animations),
+            sources=(run_path, jump_front_path, jump_back_path),
+        )
+        # Máscaras de colisión de cada frame del banco (misma clave). El tinte de
+        # plano no cambia el alpha: todos los planos usan la del frame del plano medio.
+        # Solo choca el cuerpo (como el tronco en los árboles): la máscara se
+        # recorta a la zona central HIT_WIDTH_FACTOR x HIT_HEIGHT_FACTOR del frame.
+        # La escala a la que se dibuja la pone GameState (`MaskBank.scaled`).
+        body = pygame.Rect(
+            0, 0, int(target_size[0] * self.HIT_WIDTH_FACTOR), int(target_size[1] * self.HIT_HEIGHT_FACTOR)
+        )
+        body.center = (target_size[0] // 2, target_size[1] // 2)
+        self.mask_bank = asset_cache.get_or_create(
+            (run_path, target_size, "mask_bank", (self.HIT_WIDTH_FACTOR, self.HIT_HEIGHT_FACTOR)),
+            lambda: MaskBank(
+                {
+                    key: self.frame_bank[(key[0], key[1], PLANE_MID, key[3])]
+                    for key in self.frame_bank
+                },
+                {key: body for key in self.frame_bank},
+            ),
+        )
+
+        # Override del salto especial ("jump_front" / "jump_back")
+        self.override_animation = None
         self.override_timer = 0.0
 
         # Estado de animación / plano
@@ -135,9 +192,9 @@ class Squirrel(Entity):
         self.on_ground = True
 
         # Imagen inicial
-        frames = self.animations_by_plane[self.plane][self.current_animation]
-        image = frames[self.frame_index]
-        super().__init__(x, y, image)
+        key = (self.current_animation, self.frame_index, self.plane, True)
+        super().__init__(x, y, self.frame_bank[key])
+        self.frame_key = key
 
         # Suelo inicial = donde empieza
         self.ground_y = self.rect.bottom
@@ -168,15 +225,6 @@ class Squirrel(Entity):
 
     # ----------------- EFECTO VISUAL SALTO ENTRE PLANOS -----------------
 
-    def _update_override_plane_image(self):
-        """Recalcula override_image aplicando el filtro del plano actual."""
-        if self.override_image_base is None:
-            self.override_image = None
-        else:
-            self.override_image = apply_plane_filter_to_image(
-                self.override_image_base, self.plane
-            )
-
     def start_plane_jump_visual(self, direction: str, duration: float = 0.5):
         """
         Activa el sprite especial de salto hacia cámara (frontal/trasero)
@@ -184,16 +232,15 @@ class Squirrel(Entity):
         """
         if direction == "down":
             # S + ↓ → hacia cámara (sprite frontal)
-            self.override_image_base = self.jump_front_base
+            self.override_animation = "jump_front"
         elif direction == "up":
             # S + ↑ → hacia el fondo (sprite de espaldas)
-            self.override_image_base = self.jump_back_base
+            self.override_animation = "jump_back"
         else:
             return
 
+        # La variante del plano actual se elige del banco en update()
         self.override_timer = duration
-        # Recalcular imagen filtrada según el plano actual
-        self._update_override_plane_image()
 
     # ----------------- POWER-UP: RESPLANDOR Y ESTADO -----------------
 
@@ -258,26 +305,21 @@ class Squirrel(Entity):
             self.frame_index = 0
             self.frame_timer = 0.0
 
-        frames = self.animations_by_plane[self.plane][self.current_animation]
-        self.frame_index %= len(frames)
-        base_image = frames[self.frame_index]
+        self.frame_index %= self.animation_lengths[self.current_animation]
 
         # Gestionar override del salto especial
-        if self.override_timer > 0 and self.override_image is not None:
+        if self.override_timer > 0 and self.override_animation is not None:
             self.override_timer -= dt
-            img = self.override_image
+            key = (self.override_animation, 0, self.plane, self.facing_right)
             if self.override_timer <= 0:
                 self.override_timer = 0.0
-                self.override_image = None
-                self.override_image_base = None
+                self.override_animation = None
         else:
-            img = base_image
+            key = (self.current_animation, self.frame_index, self.plane, self.facing_right)
 
-        # Flip horizontal si mira a la izquierda
-        if self.facing_right:
-            self.image = img
-        else:
-            self.image = pygame.transform.flip(img, True, False)
+        # Frame ya tintado y girado (si mira a la izquierda) desde el banco
+        self.image = self.frame_bank[key]
+        self.frame_key = key
 
         # Actualizar la habilidad de la bellota (maneja duración del power-up)
         self.acorn_power.update(dt)
@@ -295,10 +337,6 @@ class Squirrel(Entity):
 
         print(f"Nuevo plano de la ardilla: {self.plane}")
 
-        # Si hay un override activo, hay que recalcularlo con el filtro del nuevo plano
-        if self.override_image_base is not None:
-            self._update_override_plane_image()
-
     # ----------------- DRAW -----------------
 
     def draw(self, screen):
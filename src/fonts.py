@@ -0,0 +1,74 @@
+# fonts.py
+import threading
+
+import pygame
+
+from settings import TEXT_CACHE_MAX_BYTES
+from utils import AssetCache
+
+
+# ----------------- REGISTRO DE FUENTES -----------------
+
+# (nombre, tamaño) -> pygame.font.Font
+_fonts = {}
+# La precarga corre en otro hilo: si algún fallback pide una fuente, que no
+# se creen dos a la vez ni se pise el registro
+_fonts_lock = threading.Lock()
+
+
+def get_font(name=None, size=32) -> pygame.font.Font:
+    """
+    Devuelve la fuente (name, size) resolviéndola una sola vez por proceso.
+    pygame.font.SysFont recorre las fuentes del sistema (en Linux es lento),
+    así que los estados ya no la llaman en cada constructor.
+    """
+    key = (name, size)
+    with _fonts_lock:
+        font = _fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size)
+            _fonts[key] = font
+    return font
+
+
+def discover_fonts() -> int:
+    """
+    Recorre las fuentes del sistema (pygame lo hace en el primer SysFont) y
+    devuelve cuántas hay. Llamarla al arrancar deja ese coste medido aparte.
+    """
+    return len(pygame.font.get_fonts())
+
+
+# ----------------- CACHÉ DE TEXTO RENDERIZADO -----------------
+
+# Superficies de texto ya renderizadas (LRU por bytes, igual que los sprites)
+text_cache = AssetCache(TEXT_CACHE_MAX_BYTES)
+
+
+def render_text(font_spec, text, color, background=None) -> pygame.Surface:
+    """
+    Renderiza `text` con la fuente `font_spec` = (nombre, tamaño), pasando por la caché.
+
+    `background` (opcional) = (color_rgba, padding_x, padding_y): devuelve el
+    texto ya compuesto sobre un fondo semitransparente de ese color, como los
+    mensajes del HUD. Solo se renderiza de nuevo cuando cambia la clave
+    (fuente, texto, color, fondo).
+    """
+    key = (font_spec, text, color, background)
+
+    def factory():
+        text_surf = get_font(*font_spec).render(text, True, color)
+        if background is None:
+            return text_surf
+
+        bg_color, padding_x, padding_y = background
+        surf = pygame.Surface(
+            (text_surf.get_width() + padding_x * 2,
+             text_surf.get_height() + padding_y * 2),
+            pygame.SRCALPHA,
+        )
+        surf.fill(bg_color)
+        surf.blit(text_surf, text_surf.get_rect(center=surf.get_rect().center))
+        return surf
+
+    return text_cache.get_or_create(key, factory)
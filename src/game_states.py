@@ -11,11 +11,26 @@ from settings import (
     PLANE_BACKGROUND,
     SOUND_POWERUP,
     SOUND_HIT,
+    SCALE_LADDER_STEPS,
+    SIM_RATE,
+    CHUNKS_AHEAD,
+    ATLAS_PAGE_SIZE,
 )
 from entities import Squirrel
     # abilities.py
 from abilities import SpecialJump
-from utils import load_image
+from utils import load_image, load_sound, asset_cache
+from scaled_sprites import ScaleLadder, ScaledSprite, ScaledFrameTarget
+from fonts import get_font, render_text
+from input_sources import KeyboardInput
+from profiling import NULL_PROFILER
+from obstacles import ObstacleArrays, TileRow, GroundStrip, bake_ground_strip
+from world_chunks import ChunkStreamer
+from atlas import SpriteAtlas, pack_atlas
+from collision_masks import MaskBank
+# Los estados de menú viven en menu_states.py (ligero, sin el mundo de juego);
+# se reexportan aquí para quien los siga importando desde game_states
+from menu_states import LoadingState, RetainedMenuState, MainMenuState, GameOverState
 
 
 def make_silhouette(img: pygame.Surface) -> pygame.Surface:
@@ -55,8 +70,13 @@ class GameState:
     # Velocidad del fondo de cielo
     SKY_SCROLL_SPEED = 80
 
+    # Los fantasmas van más rápido que el scroll de su plano
+    ENEMY_SPEED_FACTOR = 1.6
+
     # Tiempo de cuenta atrás inicial (segundos)
     START_COUNTDOWN = 3.0
+    # Frames precalculados por segundo de la animación 3-2-1
+    COUNTDOWN_TABLE_FPS = 30
 
     # Solapamiento entre tiles
     TILE_GAP_MID = -80
@@ -72,19 +92,73 @@ class GameState:
     TREE_FG_SCALE_FACTOR = 2     # foreground más grandes
     TREE_BG_SCALE_FACTOR = 0.2   # background más pequeños
 
+    # Sprites de árboles (kind 0, 1, 2)
+    TREE_PATHS = (
+        "assets/sprites/world/tree1.png",  # kind 0
+        "assets/sprites/world/tree2.png",  # kind 1
+        "assets/sprites/world/tree3.png",  # kind 2
+    )
+    TREE_KINDS = (0, 1, 2)
+
+    # Suelo (un tile por plano, compuesto en una tira en bucle)
+    GROUND_PATH = "assets/sprites/world/ground1.png"
+    # Por plano: (variante, alto del tile, offset de su borde superior respecto
+    # a los pies iniciales de la ardilla, solapamiento entre tiles)
+    GROUND_LAYERS = {
+        PLANE_MID: ("mid", 500, -220, TILE_GAP_MID),               # suelo jugable
+        PLANE_FOREGROUND: ("silhouette", 1200, -350, TILE_GAP_FG),  # primer plano
+        PLANE_BACKGROUND: ("background", 250, -200, TILE_GAP_BG),   # fondo
+    }
+
     # Hitbox de tronco
     TRUNK_WIDTH_FACTOR_DEFAULT = 0.2
     TRUNK_WIDTH_FACTOR_TREE3 = 0.33
     TRUNK_HEIGHT_FACTOR = 0.5
 
-    # 👉 CANTIDAD INICIAL DE ÁRBOLES POR PLANO (AJUSTABLE)
-    INITIAL_MID_TREES = 3   # plano medio (lo que ve el jugador principal)
-    INITIAL_FG_TREES = 2    # foreground
-    INITIAL_BG_TREES = 2    # background
+    # 👉 CANTIDAD DE ÁRBOLES POR CHUNK Y PLANO (AJUSTABLE)
+    # Calibrado con la densidad del antiguo reciclaje por la derecha
+    # (obstáculos por segundo que pasan por cada plano)
+    CHUNK_MID_TREES = 6     # plano medio (lo que ve el jugador principal)
+    CHUNK_FG_TREES = 4      # foreground
+    CHUNK_BG_TREES = 1      # background
+
+    # Bellotas (solo plano medio) y fantasmas (plano al azar) por chunk
+    CHUNK_ACORNS = 2
+    CHUNK_ENEMIES = 1
+
+    # Huecos de los pools por plano, medidos en chunks vivos a la vez
+    CHUNK_POOL_CHUNKS = 5
+
+    # El primer chunk deja despejado este tramo inicial (px) para poder arrancar
+    CHUNK_START_CLEAR = SCREEN_WIDTH // 2 + 300
 
-    def __init__(self):
+    # Los fantasmas nunca aparecen más cerca que esto (px de pantalla); los que
+    # caerían antes se reparten al azar en los ENEMY_SPAWN_SPREAD px siguientes
+    ENEMY_MIN_SPAWN_X = SCREEN_WIDTH + 800
+    ENEMY_SPAWN_SPREAD = 1200
+
+    def __init__(self, input_source=None, seed=None, rng=None, dt=None):
         self.entities = []
 
+        # Paso fijo con el que se va a simular (--sim-rate, tick_rate de un replay)
+        self.sim_dt = dt if dt is not None else 1.0 / SIM_RATE
+
+        # Semilla del mundo: una semilla reproduce la misma partida.
+        # Todo el azar está en los chunks: cada uno usa su propio rng derivado
+        # de `seed`, así su contenido no depende de cuándo se genere.
+        # Un random.Random inyectado con `rng` solo sirve para sacar esa semilla
+        # (se lee una vez; la partida no lo vuelve a usar).
+        if seed is None:
+            seed = rng.getrandbits(32) if rng is not None else random.randrange(2**32)
+        self.seed = seed
+        print(f"[INFO] Semilla de GameState: {seed}")
+
+        # Fuente de entrada: teclado por defecto; en modo headless, una ScriptedInput
+        self.input_source = input_source if input_source is not None else KeyboardInput()
+
+        # Profiler por fases de update/draw (desactivado; benchmark.py pone un PhaseProfiler)
+        self.profiler = NULL_PROFILER
+
         # Vidas del jugador (de momento solo para el HUD)
         self.lives = 3
 
@@ -92,12 +166,12 @@ class GameState:
         self.powerup_sound = None
         self.hit_sound = None
         try:
-            self.powerup_sound = pygame.mixer.Sound(SOUND_POWERUP)
+            self.powerup_sound = load_sound(SOUND_POWERUP)
         except Exception as e:
             print(f"[WARN] No se pudo cargar powerup: {SOUND_POWERUP} -> {e}")
 
         try:
-            self.hit_sound = pygame.mixer.Sound(SOUND_HIT)
+            self.hit_sound = load_sound(SOUND_HIT)
         except Exception as e:
             print(f"[WARN] No se pudo cargar hit: {SOUND_HIT} -> {e}")
 
@@ -113,20 +187,24 @@ class GameState:
         self.countdown = self.START_COUNTDOWN
         self.scrolling = False
 
-        # Listas para tiles de suelo
-        self.mid_ground_tiles = []
-        self.fg_ground_tiles = []
-        self.bg_ground_tiles = []
-
-        # Lista para fondos de cielo
-        self.sky_tiles = []
-
-        # Listas de árboles por plano
-        # Cada elemento: {"img": Surface, "rect": Rect, "kind": 0/1/2}
-        self.mid_trees = []
-        self.fg_trees = []
-        self.bg_trees = []
-        self.tree_defs = []  # lista base (img_mid, kind) para randomizar
+        # Suelo de cada plano horneado en una tira en bucle (plane -> GroundStrip)
+        self.ground_strips = {}
+
+        # Fondos de cielo (TileRow + imagen de cada tile)
+        self.sky_row = None
+        self.sky_tile_imgs = []
+
+        # Árboles de todos los planos en arrays (x, y, w, h, kind, plane...),
+        # ver obstacles.ObstacleArrays
+        self.trees = ObstacleArrays(capacity=0)
+        # Generador del mundo por chunks (se crea al tener todos los sprites)
+        self.world = None
+        # Sprites del mundo y del HUD empaquetados en páginas (ver _load_sprite_atlas)
+        self.atlas = None
+        # Tabla precalculada (kind, plane) -> (página, rect de origen, (trunk_w, trunk_h))
+        self.tree_variants = {}
+        # Altura del suelo de los árboles por plano
+        self.tree_ground_y = {}
 
         # --- CREAR ARDILLA ---
         self.squirrel = Squirrel(0, 0)
@@ -136,98 +214,47 @@ class GameState:
         self.squirrel.rect.center = (center_x, center_y)
         self.entities.append(self.squirrel)
 
-        # --- CARGAR GROUND1 ORIGINAL ---
-        original_ground = load_image("assets/sprites/world/ground1.png")
-        orig_w, orig_h = original_ground.get_size()
-
-        # ==============================
-        # PLANE_MID (suelo jugable)
-        # ==============================
-        GROUND_TARGET_H = 500
-        ground_scale = GROUND_TARGET_H / orig_h
-        ground_target_w = int(orig_w * ground_scale)
-
-        self.ground_img = pygame.transform.scale(
-            original_ground, (ground_target_w, GROUND_TARGET_H)
-        )
-        self.ground_rect = self.ground_img.get_rect()
-
-        GROUND_OFFSET_Y = -220
-        self.ground_rect.midtop = (
-            center_x,
-            self.squirrel.rect.bottom + GROUND_OFFSET_Y,
-        )
-
-        # ==============================
-        # PLANE_FOREGROUND (primer plano)
-        # ==============================
-        FG_TARGET_H = 1200
-        fg_scale = FG_TARGET_H / orig_h
-        fg_target_w = int(orig_w * fg_scale)
-
-        fg_base_img = pygame.transform.scale(
-            original_ground, (fg_target_w, FG_TARGET_H)
-        )
-        self.ground_fg_img = make_silhouette(fg_base_img)
-        self.ground_fg_rect = self.ground_fg_img.get_rect()
-
-        FG_OFFSET_Y = -350
-        self.ground_fg_rect.midtop = (
-            center_x,
-            self.squirrel.rect.bottom + FG_OFFSET_Y,
-        )
-
-        # ==============================
-        # PLANE_BACKGROUND (fondo)
-        # ==============================
-        BG_TARGET_H = 250
-        bg_scale = BG_TARGET_H / orig_h
-        bg_target_w = int(orig_w * bg_scale)
-
-        bg_base_img = pygame.transform.scale(
-            original_ground, (bg_target_w, BG_TARGET_H)
-        )
-        self.ground_bg_img = make_background_variant(bg_base_img)
-        self.ground_bg_rect = self.ground_bg_img.get_rect()
-
-        BG_OFFSET_Y = -200
-        self.ground_bg_rect.midtop = (
-            center_x,
-            self.squirrel.rect.bottom + BG_OFFSET_Y,
-        )
+        # --- GROUND1 (cada plano usa su propia variante cacheada) ---
+        grounds = self._layout_grounds(self.squirrel.rect.bottom)
+        self.ground_img, self.ground_rect = grounds[PLANE_MID]
+        self.ground_fg_img, self.ground_fg_rect = grounds[PLANE_FOREGROUND]
+        self.ground_bg_img, self.ground_bg_rect = grounds[PLANE_BACKGROUND]
 
         # --- GENERAR FONDO DE CIELO ---
         self._generate_sky_background()
 
+        # --- SPRITES DEL MUNDO Y DEL HUD (atlas) ---
+        self._load_sprite_atlas()
+
         # --- GENERAR TILES DE SUELO + ÁRBOLES ---
         self._generate_scrolling_world()
 
         # --- POWER-UPS: BELLOTAS ---
-        self.acorns = []
-
-        try:
-            acorn_raw = load_image("assets/sprites/world/acorn.png")
-        except Exception:
-            acorn_raw = pygame.Surface((40, 40), pygame.SRCALPHA)
-            pygame.draw.circle(acorn_raw, (210, 180, 140), (20, 20), 20)
-
-        # Icono pequeño de bellota para las vidas (HUD)
-        self.life_icon_img = pygame.transform.smoothscale(acorn_raw, (32, 32))
-
-        # Tamaño de la bellota en el plano medio (powerup)
-        self.acorn_img_mid = pygame.transform.smoothscale(acorn_raw, (60, 60))
-        self._spawn_acorn(PLANE_MID)
+        self.acorns = ObstacleArrays(
+            capacity={PLANE_MID: self.CHUNK_ACORNS * self.CHUNK_POOL_CHUNKS}
+        )
 
         # --- ENEMIGO: FANTASMA ---
-        self.enemies = []
-        try:
-            ghost_raw = load_image("assets/sprites/world/enemy2.png")
-        except Exception:
-            ghost_raw = pygame.Surface((80, 80), pygame.SRCALPHA)
-            pygame.draw.circle(ghost_raw, (200, 200, 255), (40, 40), 40)
+        self.enemies = ObstacleArrays(
+            capacity=self.CHUNK_ENEMIES * self.CHUNK_POOL_CHUNKS, speed=self.ENEMY_SPEED_FACTOR
+        )
 
-        self.enemy_img_mid = pygame.transform.smoothscale(ghost_raw, (120, 120))
-        self._spawn_enemy()
+        # --- MUNDO POR CHUNKS ---
+        # Cuánto avanza cada plano respecto al medio (parallax); se recalcula
+        # en cada tick con los píxeles enteros que avanza de verdad cada plano
+        speeds = (self.SCROLL_SPEED_FG, self.SCROLL_SPEED_MID, self.SCROLL_SPEED_BG)
+        self.parallax = {plane: speed / self.SCROLL_SPEED_MID for plane, speed in enumerate(speeds)}
+        self._update_parallax([int(speed * self.sim_dt) for speed in speeds])
+        # Un chunk se descarta cuando su sprite más ancho ya no puede verse
+        self.chunk_margin = max(
+            [area.width for _, area, _ in self.tree_variants.values()]
+            + [area.width for _, area in self.enemy_variants.values()]
+            + [self.acorn_sprite[1].width]
+        )
+        self.world = ChunkStreamer(self._generate_chunk, self._evict_chunk)
+        # Lo que se ve al empezar se genera entero antes del primer frame
+        self._stream_world()
+        self.world.flush()
 
         # --- HABILIDAD SALTO ESPECIAL ---
         self.special_jump = SpecialJump(self.squirrel, SPECIAL_JUMP_COOLDOWN)
@@ -244,45 +271,95 @@ class GameState:
         self.plane_start_scale = 1.0
         self.plane_end_scale = 1.0
 
+        # Avance del scroll por plano en el tick actual (indexado por plano)
+        self._dx_by_plane = [0.0, 0.0, 0.0]
+
         # Escala actual usada para dibujar
         self.current_plane_scale = self._get_plane_scale(self.squirrel.plane)
 
-        # Fuente UI para mensajes encima del jugador
-        self.ui_font = pygame.font.SysFont(None, 32)
-
-        # ---------- IMÁGENES START + CUENTA ATRÁS ----------
-        # Banner start.png
-        try:
-            self.start_img = load_image(
-                "assets/sprites/menu/start.png",
-                size=(600, 220)
-            )
-        except Exception:
-            self.start_img = self.ui_font.render("¡Empieza el juego!", True, (255, 255, 255))
-
-        # Números 3, 2, 1
-        self.countdown_font = pygame.font.SysFont(None, 220)
-        self.countdown_imgs = {}
-        for num in (1, 2, 3):
-            path = f"assets/sprites/menu/{num}.png"
-            try:
-                img = load_image(path, size=(260, 260))
-            except Exception:
-                img = self.countdown_font.render(str(num), True, (255, 255, 0))
-            self.countdown_imgs[num] = img
+        # Escalera de escalas para la ardilla y su resplandor: se elige el nivel
+        # más cercano en cada frame (sin crear superficies nuevas)
+        self.scale_ladder = self._make_scale_ladder()
+        self.squirrel_scaler = ScaledFrameTarget(
+            self.squirrel.image.get_size(), self.scale_ladder, self.squirrel.image
+        )
+        self.glow_scaler = self._load_glow_scaler(self.squirrel, self.scale_ladder)
 
-        # Imagen "VIDAS" para el HUD
-        try:
-            vidas_raw = load_image("assets/sprites/menu/vidas.png")
-            self.vidas_img = pygame.transform.smoothscale(vidas_raw, (220, 80))
-        except Exception:
-            self.vidas_img = self.ui_font.render("VIDAS", True, (255, 255, 255))
+        # Fuente UI para mensajes encima del jugador
+        self.ui_font_spec = (None, 32)
+        self.ui_font = get_font(*self.ui_font_spec)
+
+        # ---------- START + CUENTA ATRÁS (regiones del atlas) ----------
+        self.start_rect = pygame.Rect((0, 0), self.start_sprite[1].size)
+        self.start_rect.center = (SCREEN_WIDTH // 2, int(SCREEN_HEIGHT * 0.3))
+        self.countdown_overlay = asset_cache.get_or_create(
+            ("overlay", (SCREEN_WIDTH, SCREEN_HEIGHT), (0, 0, 0, 160)),
+            lambda: self._make_overlay((0, 0, 0, 160)),
+        )
 
         # Colocamos inicialmente a la ardilla en su plano
         self._align_squirrel_to_plane()
 
+        # ---------- INTERPOLACIÓN DE RENDER (paso fijo) ----------
+        # main.py pone render_alpha = fracción del siguiente tick ya transcurrida.
+        # Se dibuja entre el tick anterior y el actual: cada capa retrocede
+        # (1 - alpha) de lo que avanzó en el último tick y la ardilla se
+        # interpola entre su posición anterior y la actual.
+        # Con 1.0 (por defecto) se dibuja el último tick tal cual.
+        self.render_alpha = 1.0
+        self.last_scroll_dx = {"sky": 0, PLANE_MID: 0, PLANE_FOREGROUND: 0, PLANE_BACKGROUND: 0}
+        self.last_enemy_dx = {PLANE_MID: 0, PLANE_FOREGROUND: 0, PLANE_BACKGROUND: 0}
+        self.squirrel_prev_pos = (self.squirrel.rect.centerx, self.squirrel.rect.bottom)
+
     # ---------- HELPERS PARA POSICIÓN Y ESCALA POR PLANO ----------
 
+    @classmethod
+    def preload_tasks(cls) -> list:
+        """
+        Pasos para calentar la caché con todo lo que carga una partida
+        (ver preloader.AssetPreloader). Corren en otro hilo: solo generan datos
+        (Surfaces, máscaras, sonidos) con las mismas claves de caché que usa
+        __init__; nada de fuentes ni texto, que se quedan en el hilo principal.
+        """
+        return [
+            ("sonidos", lambda: (load_sound(SOUND_POWERUP), load_sound(SOUND_HIT))),
+            ("ardilla", cls._preload_squirrel),
+            ("cielo", cls._load_sky_images),
+            ("suelo", cls._preload_grounds),
+            ("atlas", cls._load_atlas),
+            ("máscaras", lambda: cls._load_world_masks(cls._load_atlas())),
+        ]
+
+    @classmethod
+    def _make_scale_ladder(cls) -> ScaleLadder:
+        return ScaleLadder(
+            cls.SQUIRREL_SCALE_BG,
+            cls.SQUIRREL_SCALE_FG,
+            SCALE_LADDER_STEPS,
+            anchors=(cls.SQUIRREL_SCALE_BG, cls.SQUIRREL_SCALE_MID, cls.SQUIRREL_SCALE_FG),
+        )
+
+    @classmethod
+    def _load_glow_scaler(cls, squirrel: Squirrel, ladder: ScaleLadder) -> ScaledSprite:
+        glow = squirrel.power_glow_surface
+        return asset_cache.get_or_create(
+            ("power_glow", glow.get_size(), ("ladder", SCALE_LADDER_STEPS)),
+            lambda: ScaledSprite(glow, ladder),
+        )
+
+    @classmethod
+    def _preload_squirrel(cls):
+        """Banco de frames y máscaras de la ardilla y su resplandor escalado."""
+        cls._load_glow_scaler(Squirrel(0, 0), cls._make_scale_ladder())
+
+    @classmethod
+    def _preload_grounds(cls):
+        """Variantes del suelo y sus tiras, en la posición inicial de la ardilla."""
+        squirrel_rect = pygame.Rect((0, 0), Squirrel(0, 0).rect.size)
+        squirrel_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        for plane, (img, rect) in cls._layout_grounds(squirrel_rect.bottom).items():
+            cls._load_ground_strip(plane, img, rect.top)
+
     def _get_plane_ground_y(self, plane: int) -> float:
         if plane == PLANE_MID:
             base = self.ground_rect.top
@@ -333,37 +410,245 @@ class GameState:
 
     # ----------------- GENERAR FONDO DE CIELO -----------------
 
-    def _generate_sky_background(self):
+    @staticmethod
+    def _load_sky_images() -> list:
         bg_paths = [
             "assets/sprites/world/background.png",
         ]
 
-        self.sky_tiles = []
         sky_imgs = []
 
         for path in bg_paths:
             try:
-                img = load_image(path)
+                img = load_image(path, height=SCREEN_HEIGHT)
             except Exception:
                 img = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
                 img.fill((135, 206, 235))
-            w, h = img.get_size()
-            scale = SCREEN_HEIGHT / h
-            img = pygame.transform.scale(img, (int(w * scale), SCREEN_HEIGHT))
             sky_imgs.append(img)
+        return sky_imgs
+
+    def _generate_sky_background(self):
+        sky_imgs = self._load_sky_images()
 
+        xs = []
+        self.sky_tile_imgs = []
         x = 0
         idx = 0
         while x < SCREEN_WIDTH * 2:
             img = sky_imgs[idx % len(sky_imgs)]
-            rect = img.get_rect(topleft=(x, 0))
-            self.sky_tiles.append((img, rect))
-            x += rect.width
+            xs.append(x)
+            self.sky_tile_imgs.append(img)
+            x += img.get_width()
             idx += 1
+        self.sky_row = TileRow(xs, [img.get_width() for img in self.sky_tile_imgs], 0)
+
+    # ----------------- ATLAS DE SPRITES -----------------
+
+    ATLAS_SOURCES = TREE_PATHS + (
+        "assets/sprites/world/enemy2.png",
+        "assets/sprites/world/acorn.png",
+        "assets/sprites/menu/start.png",
+        "assets/sprites/menu/vidas.png",
+        "assets/sprites/menu/1.png",
+        "assets/sprites/menu/2.png",
+        "assets/sprites/menu/3.png",
+    )
+
+    @classmethod
+    def _atlas_key(cls) -> tuple:
+        return (
+            "sprite_atlas",
+            cls.ATLAS_SOURCES,
+            (cls.TREE_MID_SCALE, cls.TREE_FG_SCALE_FACTOR, cls.TREE_BG_SCALE_FACTOR),
+            (cls.SQUIRREL_SCALE_FG, cls.SQUIRREL_SCALE_MID, cls.SQUIRREL_SCALE_BG),
+            cls.COUNTDOWN_TABLE_FPS,
+            ATLAS_PAGE_SIZE,
+        )
+
+    @classmethod
+    def _load_atlas(cls) -> SpriteAtlas:
+        """
+        Empaqueta en un atlas todas las variantes de sprites del mundo y del HUD
+        (árboles y fantasma por plano, bellota, icono de vida, VIDAS, START y
+        los frames de la cuenta atrás). Las páginas se guardan también en la
+        caché en disco: en un arranque en caliente no se genera ninguna variante.
+        """
+        pages, regions = asset_cache.get_or_create(
+            cls._atlas_key(),
+            lambda: pack_atlas(cls._build_atlas_sprites()),
+            sources=cls.ATLAS_SOURCES,
+        )
+        return SpriteAtlas(pages, regions)
+
+    @classmethod
+    def _load_world_masks(cls, atlas: SpriteAtlas) -> MaskBank:
+        return asset_cache.get_or_create(
+            cls._atlas_key() + ("collision_masks",),
+            lambda: cls._build_world_masks(atlas),
+        )
+
+    def _load_sprite_atlas(self):
+        """Atlas de sprites, variantes por plano y máscaras de colisión de la partida."""
+        self.atlas = self._load_atlas()
+
+        self.tree_variants = {}
+        for kind in self.TREE_KINDS:
+            for plane in (PLANE_FOREGROUND, PLANE_MID, PLANE_BACKGROUND):
+                page, area = self.atlas[("tree", kind, plane)]
+                self.tree_variants[(kind, plane)] = (page, area, self._get_trunk_size(area.size, kind))
+        self.enemy_variants = {
+            plane: self.atlas[("enemy", plane)]
+            for plane in (PLANE_FOREGROUND, PLANE_MID, PLANE_BACKGROUND)
+        }
+        self.acorn_sprite = self.atlas["acorn"]
+        self.life_icon_sprite = self.atlas["life_icon"]
+        self.vidas_sprite = self.atlas["vidas"]
+        self.start_sprite = self.atlas["start"]
+        self.countdown_table = self._build_countdown_table()
+
+        # Máscaras de colisión de los obstáculos, con la clave (kind, plane) de sus pools
+        world_masks = self._load_world_masks(self.atlas)
+        planes = (PLANE_FOREGROUND, PLANE_MID, PLANE_BACKGROUND)
+        self.tree_masks = {
+            (kind, plane): world_masks[("tree", kind, plane)]
+            for kind in self.TREE_KINDS for plane in planes
+        }
+        self.enemy_masks = {(0, plane): world_masks[("enemy", plane)] for plane in planes}
+        self.acorn_masks = {(0, plane): world_masks["acorn"] for plane in planes}
+
+    @classmethod
+    def _build_world_masks(cls, atlas: SpriteAtlas) -> MaskBank:
+        """
+        Máscaras de colisión de árboles, fantasmas y bellota sacadas del atlas.
+        En los árboles solo choca el tronco: la máscara se recorta a su hitbox
+        (la copa se puede atravesar saltando).
+        """
+        planes = (PLANE_FOREGROUND, PLANE_MID, PLANE_BACKGROUND)
+        surfaces = {}
+        clips = {}
+        for kind in cls.TREE_KINDS:
+            for plane in planes:
+                key = ("tree", kind, plane)
+                page, area = atlas[key]
+                surfaces[key] = page.subsurface(area)
+                trunk = pygame.Rect((0, 0), cls._get_trunk_size(area.size, kind))
+                trunk.midbottom = (area.width // 2, area.height)
+                clips[key] = trunk
+        for plane in planes:
+            page, area = atlas[("enemy", plane)]
+            surfaces[("enemy", plane)] = page.subsurface(area)
+        page, area = atlas["acorn"]
+        surfaces["acorn"] = page.subsurface(area)
+        return MaskBank(surfaces, clips)
+
+    @classmethod
+    def _build_atlas_sprites(cls) -> dict:
+        """Genera todas las Surfaces que van al atlas (clave -> Surface)."""
+        sprites = {}
+        for (kind, plane), img in cls._build_tree_variants().items():
+            sprites[("tree", kind, plane)] = img
+
+        try:
+            enemy_img_mid = load_image(
+                "assets/sprites/world/enemy2.png", size=(120, 120), smooth=True
+            )
+        except Exception:
+            ghost_raw = pygame.Surface((80, 80), pygame.SRCALPHA)
+            pygame.draw.circle(ghost_raw, (200, 200, 255), (40, 40), 40)
+            enemy_img_mid = pygame.transform.smoothscale(ghost_raw, (120, 120))
+        for plane, img in cls._build_enemy_variants(enemy_img_mid).items():
+            sprites[("enemy", plane)] = img
+
+        acorn_path = "assets/sprites/world/acorn.png"
+        try:
+            # Tamaño de la bellota en el plano medio (powerup)
+            sprites["acorn"] = load_image(acorn_path, size=(60, 60), smooth=True)
+            # Icono pequeño de bellota para las vidas (HUD)
+            sprites["life_icon"] = load_image(acorn_path, size=(32, 32), smooth=True)
+        except Exception:
+            acorn_raw = pygame.Surface((40, 40), pygame.SRCALPHA)
+            pygame.draw.circle(acorn_raw, (210, 180, 140), (20, 20), 20)
+            sprites["acorn"] = pygame.transform.smoothscale(acorn_raw, (60, 60))
+            sprites["life_icon"] = pygame.transform.smoothscale(acorn_raw, (32, 32))
+
+        # Imagen "VIDAS" para el HUD
+        try:
+            sprites["vidas"] = load_image(
+                "assets/sprites/menu/vidas.png", size=(220, 80), smooth=True
+            )
+        except Exception:
+            sprites["vidas"] = get_font(None, 32).render("VIDAS", True, (255, 255, 255))
+
+        # Banner start.png
+        try:
+            sprites["start"] = load_image("assets/sprites/menu/start.png", size=(600, 220))
+        except Exception:
+            sprites["start"] = get_font(None, 32).render("¡Empieza el juego!", True, (255, 255, 255))
+
+        # Números 3, 2, 1 y sus frames de la animación
+        countdown_imgs = {}
+        for num in (1, 2, 3):
+            try:
+                img = load_image(f"assets/sprites/menu/{num}.png", size=(260, 260))
+            except Exception:
+                img = get_font(None, 220).render(str(num), True, (255, 255, 0))
+            countdown_imgs[num] = img
+        sprites.update(cls._build_countdown_frames(countdown_imgs))
+        return sprites
+
+    # ----------------- CUENTA ATRÁS PRECALCULADA -----------------
+
+    @staticmethod
+    def _make_overlay(color) -> pygame.Surface:
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill(color)
+        return overlay
+
+    @staticmethod
+    def _countdown_scale(t_segment: float) -> float:
+        """Escala del número según el progreso dentro de su segundo (easing back-out)."""
+        c1 = 1.70158
+        c3 = c1 + 1.0
+        base = 1 + c3 * (t_segment - 1) ** 3 + c1 * (t_segment - 1) ** 2
+        scale = 0.4 + 0.8 * base
+        return max(0.4, min(1.3, scale))
+
+    @classmethod
+    def _build_countdown_frames(cls, countdown_imgs: dict) -> dict:
+        """
+        Sprites ("countdown", n, i) -> Surface: COUNTDOWN_TABLE_FPS frames por
+        número, ya escalados con la curva de easing.
+        """
+        frames = {}
+        for n, number_img in countdown_imgs.items():
+            w, h = number_img.get_size()
+            for i in range(cls.COUNTDOWN_TABLE_FPS):
+                scale = cls._countdown_scale(i / cls.COUNTDOWN_TABLE_FPS)
+                frames[("countdown", n, i)] = pygame.transform.smoothscale(
+                    number_img, (int(w * scale), int(h * scale))
+                )
+        return frames
+
+    def _build_countdown_table(self) -> dict:
+        """
+        Tabla n -> [(página, rect de origen, topleft), ...] con los frames del
+        atlas ya colocados en pantalla.
+        """
+        table = {}
+        for n in (1, 2, 3):
+            frames = []
+            for i in range(self.COUNTDOWN_TABLE_FPS):
+                page, area = self.atlas[("countdown", n, i)]
+                num_rect = pygame.Rect((0, 0), area.size)
+                num_rect.center = (SCREEN_WIDTH // 2, int(SCREEN_HEIGHT * 0.6))
+                frames.append((page, area, num_rect.topleft))
+            table[n] = frames
+        return table
 
     # ----------------- TINTAR ÁRBOLES SEGÚN PLANO -----------------
 
-    def _tint_tree_for_plane(self, img: pygame.Surface, plane: int) -> pygame.Surface:
+    @staticmethod
+    def _tint_tree_for_plane(img: pygame.Surface, plane: int) -> pygame.Surface:
         """Aplica el mismo tipo de tinte que usamos para squirrel/ground en cada plano."""
         surf = img.copy()
         if plane == PLANE_FOREGROUND:
@@ -374,175 +659,271 @@ class GameState:
 
     # ----------------- GENERAR MUNDO SCROLLING -----------------
 
+    @classmethod
+    def _layout_grounds(cls, feet_y: int) -> dict:
+        """
+        Tile de suelo de cada plano (variante cacheada) y su rect colocado
+        respecto a los pies iniciales de la ardilla: plane -> (Surface, Rect).
+        """
+        path = cls.GROUND_PATH
+        grounds = {}
+        for plane, (variant, height, offset_y, _) in cls.GROUND_LAYERS.items():
+            if variant == "mid":
+                img = load_image(path, height=height)
+            else:
+                make = make_silhouette if variant == "silhouette" else make_background_variant
+                img = asset_cache.get_or_create(
+                    (path, ("height", height), variant),
+                    lambda make=make, height=height: make(load_image(path, height=height)),
+                    sources=(path,),
+                )
+            rect = img.get_rect(midtop=(SCREEN_WIDTH // 2, feet_y + offset_y))
+            grounds[plane] = (img, rect)
+        return grounds
+
+    @classmethod
+    def _load_ground_strip(cls, plane: int, img: pygame.Surface, y: int) -> tuple:
+        """
+        Copias del tile cada (ancho + TILE_GAP) px, la primera centrada en x=0,
+        compuestas en una tira sin costuras: (Surface, y de su borde superior).
+        La tira va a la caché de assets (y a la de disco): al reiniciar no se
+        vuelve a componer.
+        """
+        variant, _, _, gap = cls.GROUND_LAYERS[plane]
+        w, h = img.get_size()
+        period = w + gap
+        return asset_cache.get_or_create(
+            (cls.GROUND_PATH, (w, h), variant, "ground_strip",
+             period, y, -w // 2, (SCREEN_WIDTH, SCREEN_HEIGHT)),
+            lambda: bake_ground_strip(
+                img, period, y, start_x=-w // 2,
+                view_width=SCREEN_WIDTH, view_height=SCREEN_HEIGHT,
+            ),
+            sources=(cls.GROUND_PATH,),
+        )
+
     def _generate_scrolling_world(self):
-        mid_y = self.ground_rect.top
-        fg_y = self.ground_fg_rect.top
-        bg_y = self.ground_bg_rect.top
-
-        mid_w = self.ground_img.get_width()
-        fg_w = self.ground_fg_img.get_width()
-        bg_w = self.ground_bg_img.get_width()
-
-        num_mid_tiles = 8
-        num_fg_tiles = 8
-        num_bg_tiles = 8
-
-        # MID
-        start_x_mid = -mid_w // 2
-        for i in range(num_mid_tiles):
-            x = start_x_mid + i * (mid_w + self.TILE_GAP_MID)
-            r = self.ground_img.get_rect(topleft=(x, mid_y))
-            self.mid_ground_tiles.append(r)
-
-        # FG
-        start_x_fg = -fg_w // 2
-        for i in range(num_fg_tiles):
-            x = start_x_fg + i * (fg_w + self.TILE_GAP_FG)
-            r = self.ground_fg_img.get_rect(topleft=(x, fg_y))
-            self.fg_ground_tiles.append(r)
-
-        # BG
-        start_x_bg = -bg_w // 2
-        for i in range(num_bg_tiles):
-            x = start_x_bg + i * (bg_w + self.TILE_GAP_BG)
-            r = self.ground_bg_img.get_rect(topleft=(x, bg_y))
-            self.bg_ground_tiles.append(r)
-
-        # -------- DEFINICIÓN BASE DE ÁRBOLES (img_mid, kind) --------
-        tree_paths = [
-            "assets/sprites/world/tree1.png",  # kind 0
-            "assets/sprites/world/tree2.png",  # kind 1
-            "assets/sprites/world/tree3.png",  # kind 2
-        ]
+        for plane, img, rect in (
+            (PLANE_MID, self.ground_img, self.ground_rect),
+            (PLANE_FOREGROUND, self.ground_fg_img, self.ground_fg_rect),
+            (PLANE_BACKGROUND, self.ground_bg_img, self.ground_bg_rect),
+        ):
+            surface, top = self._load_ground_strip(plane, img, rect.top)
+            self.ground_strips[plane] = GroundStrip(surface, top, view_width=SCREEN_WIDTH)
+
+        self.tree_ground_y = {
+            PLANE_MID: self._get_plane_ground_y(PLANE_MID) + self.TREE_MID_OFFSET_Y,
+            PLANE_FOREGROUND: self._get_plane_ground_y(PLANE_FOREGROUND) + self.TREE_MID_OFFSET_Y,
+            PLANE_BACKGROUND: self._get_plane_ground_y(PLANE_BACKGROUND) + self.TREE_BG_OFFSET_Y,
+        }
+
+        # Árboles por chunk de cada plano; el pool guarda los de CHUNK_POOL_CHUNKS chunks
+        self.chunk_tree_counts = {
+            PLANE_MID: self.CHUNK_MID_TREES,
+            PLANE_FOREGROUND: self.CHUNK_FG_TREES,
+            PLANE_BACKGROUND: self.CHUNK_BG_TREES,
+        }
+        self.trees = ObstacleArrays(capacity={
+            plane: count * self.CHUNK_POOL_CHUNKS
+            for plane, count in self.chunk_tree_counts.items()
+        })
 
-        tree_defs = []
-        for kind, path in enumerate(tree_paths):
+    @classmethod
+    def _build_tree_variants(cls) -> dict:
+        """
+        Construye las variantes (kind, plane) -> Surface, escaladas y tintadas
+        por plano. Se hace una sola vez, al empaquetar el atlas.
+        """
+        variants = {}
+        for kind, path in enumerate(cls.TREE_PATHS):
             try:
-                img = load_image(path)
+                img_mid = load_image(path, scale=cls.TREE_MID_SCALE, smooth=True)
             except Exception:
                 img = pygame.Surface((80, 120), pygame.SRCALPHA)
                 img.fill((0, 255, 0, 255))
+                w, h = img.get_size()
+                img_mid = pygame.transform.smoothscale(
+                    img,
+                    (int(w * cls.TREE_MID_SCALE), int(h * cls.TREE_MID_SCALE))
+                )
 
-            w, h = img.get_size()
-            img_mid = pygame.transform.smoothscale(
-                img,
-                (int(w * self.TREE_MID_SCALE), int(h * self.TREE_MID_SCALE))
-            )
-            tree_defs.append((img_mid, kind))
-
-        self.tree_defs = tree_defs
-        self.mid_trees = []
-        self.fg_trees = []
-        self.bg_trees = []
-
-        min_x = -SCREEN_WIDTH
-        max_x = SCREEN_WIDTH * 3
-
-        # MID
-        ground_y_mid = self._get_plane_ground_y(PLANE_MID) + self.TREE_MID_OFFSET_Y
-        for _ in range(self.INITIAL_MID_TREES):
-            img_mid, kind = random.choice(self.tree_defs)
-            r = img_mid.get_rect()
-            x = random.randint(min_x, max_x)
-            r.midbottom = (x, ground_y_mid)
-            self.mid_trees.append({"img": img_mid, "rect": r, "kind": kind})
-
-        # FG
-        ground_y_fg = self._get_plane_ground_y(PLANE_FOREGROUND) + self.TREE_MID_OFFSET_Y
-        for _ in range(self.INITIAL_FG_TREES):
-            base_mid, kind = random.choice(self.tree_defs)
-            w, h = base_mid.get_size()
+            w, h = img_mid.get_size()
             img_fg = pygame.transform.smoothscale(
-                base_mid,
-                (int(w * self.TREE_FG_SCALE_FACTOR), int(h * self.TREE_FG_SCALE_FACTOR))
+                img_mid,
+                (int(w * cls.TREE_FG_SCALE_FACTOR), int(h * cls.TREE_FG_SCALE_FACTOR))
             )
-            img_fg = self._tint_tree_for_plane(img_fg, PLANE_FOREGROUND)
-            r = img_fg.get_rect()
-            x = random.randint(min_x, max_x)
-            r.midbottom = (x, ground_y_fg)
-            self.fg_trees.append({"img": img_fg, "rect": r, "kind": kind})
-
-        # BG
-        ground_y_bg = self._get_plane_ground_y(PLANE_BACKGROUND) + self.TREE_BG_OFFSET_Y
-        for _ in range(self.INITIAL_BG_TREES):
-            base_mid, kind = random.choice(self.tree_defs)
-            w, h = base_mid.get_size()
             img_bg = pygame.transform.smoothscale(
-                base_mid,
-                (int(w * self.TREE_BG_SCALE_FACTOR), int(h * self.TREE_BG_SCALE_FACTOR))
+                img_mid,
+                (int(w * cls.TREE_BG_SCALE_FACTOR), int(h * cls.TREE_BG_SCALE_FACTOR))
             )
-            img_bg = self._tint_tree_for_plane(img_bg, PLANE_BACKGROUND)
-            r = img_bg.get_rect()
-            x = random.randint(min_x, max_x)
-            r.midbottom = (x, ground_y_bg)
-            self.bg_trees.append({"img": img_bg, "rect": r, "kind": kind})
+
+            for plane, img in (
+                (PLANE_MID, img_mid),
+                (PLANE_FOREGROUND, cls._tint_tree_for_plane(img_fg, PLANE_FOREGROUND)),
+                (PLANE_BACKGROUND, cls._tint_tree_for_plane(img_bg, PLANE_BACKGROUND)),
+            ):
+                variants[(kind, plane)] = img
+        return variants
+
+    def _spawn_tree(self, plane: int, x: int, kind: int, chunk: int = -1):
+        """
+        Saca un árbol del pool y lo coloca en `x` (pantalla) usando la variante
+        precalculada de su tipo y plano (imagen + hitbox del tronco).
+        """
+        _, area, trunk_size = self.tree_variants[(kind, plane)]
+        rect = pygame.Rect((0, 0), area.size)
+        rect.midbottom = (x, self.tree_ground_y[plane])
+        self.trees.spawn(rect, plane=plane, kind=kind, hit_size=trunk_size, chunk=chunk)
 
     # ----------------- SPAWN DE BELLOTAS -----------------
 
-    def _spawn_acorn(self, plane: int):
+    def _spawn_acorn(self, plane: int, x: int, chunk: int = -1):
+        """Saca una bellota del pool y la coloca en `x` (pantalla)."""
         if plane == PLANE_MID:
-            img = self.acorn_img_mid
             ground_y = self._get_plane_ground_y(PLANE_MID) + self.TREE_MID_OFFSET_Y
-            spawn_x = SCREEN_WIDTH + random.randint(300, 700)
-            rect = img.get_rect(midbottom=(spawn_x, ground_y))
-            self.acorns.append({"img": img, "rect": rect, "plane": plane})
+            rect = pygame.Rect((0, 0), self.acorn_sprite[1].size)
+            rect.midbottom = (x, ground_y)
+            self.acorns.spawn(rect, plane=plane, chunk=chunk)
 
     # ----------------- SPAWN DE ENEMIGOS (FANTASMA) -----------------
 
-    def _spawn_enemy(self):
+    def _spawn_enemy(self, plane: int, x: int, phase: float, chunk: int = -1):
         """
-        Crea un fantasma en un plano aleatorio (FG, MID o BG) que aparecerá
-        desde la derecha y se moverá con el scroll, con vaivén vertical.
+        Saca un fantasma del pool en `plane`, en `x` (pantalla), que se moverá
+        con el scroll con vaivén vertical.
         """
-        if not hasattr(self, "enemy_img_mid"):
+        if not hasattr(self, "enemy_variants"):
             return
 
-        plane = random.choice((PLANE_FOREGROUND, PLANE_MID, PLANE_BACKGROUND))
-
-        base_img = self.enemy_img_mid
-        if plane == PLANE_FOREGROUND:
-            scale = self.SQUIRREL_SCALE_FG / self.SQUIRREL_SCALE_MID
-        elif plane == PLANE_BACKGROUND:
-            scale = self.SQUIRREL_SCALE_BG / self.SQUIRREL_SCALE_MID
-        else:
-            scale = 1.0
-
-        img = base_img
-        if scale != 1.0:
-            w, h = base_img.get_size()
-            img = pygame.transform.smoothscale(base_img, (int(w * scale), int(h * scale)))
-
-        img = self._tint_tree_for_plane(img, plane)
+        _, area = self.enemy_variants[plane]
 
         ground_y = self._get_plane_ground_y(plane)
         # Lo colocamos un poco por encima del suelo (flotando)
         base_y = ground_y - 20
 
-        spawn_x = SCREEN_WIDTH + random.randint(800, 2000)
-        rect = img.get_rect(midbottom=(spawn_x, base_y))
+        rect = pygame.Rect((0, 0), area.size)
+        rect.midbottom = (x, base_y)
+        self.enemies.spawn(rect, plane=plane, base_y=rect.centery, phase=phase, chunk=chunk)
 
-        self.enemies.append({
-            "img": img,
-            "rect": rect,
-            "plane": plane,
-            "base_y": rect.centery,
-            "phase": random.uniform(0, 2 * math.pi),
-        })
+    # ----------------- MUNDO POR CHUNKS -----------------
+
+    def _chunk_screen_x(self, index: int, plane: int, u: float) -> int:
+        """
+        X de pantalla del punto `u` (0..1) del chunk `index` en `plane`. En cada
+        plano el chunk mide CHUNK_WIDTH * parallax, así que un chunk ocupa el
+        mismo tramo de partida en los tres planos.
+        """
+        width = self.world.chunk_width * self.parallax[plane]
+        return int((index + u) * width) - int(self.trees.scroll_x[plane])
+
+    def _generate_chunk(self, index: int):
+        """
+        Contenido del chunk `index`: árboles de los tres planos, bellotas y
+        fantasmas, con un rng propio del chunk. Es un generador: hace `yield`
+        tras cada alta para que ChunkStreamer reparta el trabajo entre ticks.
+        """
+        rng = random.Random(f"{self.seed}:{index}")
+        # Todo el azar del chunk se decide antes de la primera alta.
+        # El primer chunk solo se llena a partir de `start`: lleva la parte
+        # proporcional de obstáculos, para no concentrarlos al empezar.
+        start = self.CHUNK_START_CLEAR / self.world.chunk_width if index == 0 else 0.0
+        trees = [
+            (plane, rng.uniform(start, 1.0), rng.choice(self.TREE_KINDS))
+            for plane, count in self.chunk_tree_counts.items()
+            for _ in range(round(count * (1.0 - start)))
+        ]
+        acorns = [rng.uniform(start, 1.0) for _ in range(round(self.CHUNK_ACORNS * (1.0 - start)))]
+        enemies = [
+            (
+                rng.choice((PLANE_FOREGROUND, PLANE_MID, PLANE_BACKGROUND)),
+                rng.uniform(start, 1.0),
+                rng.uniform(0, 2 * math.pi),
+                rng.random(),
+            )
+            for _ in range(self.CHUNK_ENEMIES)
+        ]
+
+        # Las posiciones de pantalla se calculan al dar de alta (el scroll sigue)
+        for plane, u, kind in trees:
+            self._spawn_tree(plane, self._chunk_screen_x(index, plane, u), kind, index)
+            yield
+        for u in acorns:
+            self._spawn_acorn(PLANE_MID, self._chunk_screen_x(index, PLANE_MID, u), index)
+            yield
+        for plane, u, phase, spread in enemies:
+            x = self._chunk_screen_x(index, plane, u)
+            if x < self.ENEMY_MIN_SPAWN_X:
+                # Caería demasiado cerca (primeros chunks, o el fondo, que es más
+                # estrecho): aparece por delante, en un punto al azar y no todos juntos
+                x = self.ENEMY_MIN_SPAWN_X + int(spread * self.ENEMY_SPAWN_SPREAD)
+            self._spawn_enemy(plane, x, phase, index)
+            yield
+
+    def _update_parallax(self, step_by_plane):
+        """
+        Parallax de cada plano a partir de los px enteros que avanza en un tick.
+        Un plano que no avanza ningún px entero (tick muy corto) conserva el anterior.
+        """
+        mid_step = step_by_plane[PLANE_MID]
+        if mid_step > 0:
+            for plane in (PLANE_FOREGROUND, PLANE_MID, PLANE_BACKGROUND):
+                if step_by_plane[plane] > 0:
+                    self.parallax[plane] = step_by_plane[plane] / mid_step
+
+    def _evict_chunk(self, index: int):
+        """Devuelve a los pools lo que quede del chunk `index`."""
+        for pool in (self.trees, self.acorns, self.enemies):
+            pool.despawn_chunk(index)
+
+    def _stream_world(self):
+        """
+        Encola los chunks que pronto serán visibles en algún plano, descarta los
+        que ya no se ven en ninguno y avanza la generación pendiente (con presupuesto).
+        """
+        scroll = self.trees.scroll_x
+        width = self.world.chunk_width
+        # Pasado a distancia de cámara (plano medio) con el parallax de cada plano
+        ahead = max(
+            (scroll[plane] + SCREEN_WIDTH) / factor for plane, factor in self.parallax.items()
+        ) + CHUNKS_AHEAD * width
+        behind = min(
+            (scroll[plane] - self.chunk_margin) / factor for plane, factor in self.parallax.items()
+        )
+        self.world.evict_behind(behind)
+        self.world.request_until(ahead)
+        self.world.step()
+
+    @classmethod
+    def _build_enemy_variants(cls, enemy_img_mid: pygame.Surface) -> dict:
+        """Fantasma escalado y tintado para cada plano (plane -> Surface)."""
+        variants = {}
+        for plane in (PLANE_FOREGROUND, PLANE_MID, PLANE_BACKGROUND):
+            if plane == PLANE_FOREGROUND:
+                scale = cls.SQUIRREL_SCALE_FG / cls.SQUIRREL_SCALE_MID
+            elif plane == PLANE_BACKGROUND:
+                scale = cls.SQUIRREL_SCALE_BG / cls.SQUIRREL_SCALE_MID
+            else:
+                scale = 1.0
+
+            img = enemy_img_mid
+            if scale != 1.0:
+                w, h = img.get_size()
+                img = pygame.transform.smoothscale(img, (int(w * scale), int(h * scale)))
+            variants[plane] = cls._tint_tree_for_plane(img, plane)
+        return variants
 
     # ----------------- HITBOX DE ÁRBOL (TRONCO) -----------------
 
-    def _get_tree_hitbox(self, rect: pygame.Rect, kind: int) -> pygame.Rect:
+    @classmethod
+    def _get_trunk_size(cls, size: tuple, kind: int) -> tuple:
+        """Plantilla del hitbox del tronco (ancho, alto) para una variante de árbol de tamaño `size`."""
         if kind == 2:
-            width_factor = self.TRUNK_WIDTH_FACTOR_TREE3
+            width_factor = cls.TRUNK_WIDTH_FACTOR_TREE3
         else:
-            width_factor = self.TRUNK_WIDTH_FACTOR_DEFAULT
-
-        trunk_w = int(rect.width * width_factor)
-        trunk_h = int(rect.height * self.TRUNK_HEIGHT_FACTOR)
+            width_factor = cls.TRUNK_WIDTH_FACTOR_DEFAULT
 
-        hb = pygame.Rect(0, 0, trunk_w, trunk_h)
-        hb.midbottom = rect.midbottom
-        return hb
+        w, h = size
+        return (int(w * width_factor), int(h * cls.TRUNK_HEIGHT_FACTOR))
 
     # ----------------- ACTUALIZAR MUNDO SCROLLING -----------------
 
@@ -552,6 +933,15 @@ class GameState:
         dx_fg = self.SCROLL_SPEED_FG * dt
         dx_sky = self.SKY_SCROLL_SPEED * dt
 
+        # Píxeles que avanza cada capa en este tick (para interpolar al dibujar)
+        self.last_scroll_dx["sky"] = int(dx_sky)
+        self.last_scroll_dx[PLANE_MID] = int(dx_mid)
+        self.last_scroll_dx[PLANE_BACKGROUND] = int(dx_bg)
+        self.last_scroll_dx[PLANE_FOREGROUND] = int(dx_fg)
+        self.last_enemy_dx[PLANE_MID] = int(dx_mid * self.ENEMY_SPEED_FACTOR)
+        self.last_enemy_dx[PLANE_BACKGROUND] = int(dx_bg * self.ENEMY_SPEED_FACTOR)
+        self.last_enemy_dx[PLANE_FOREGROUND] = int(dx_fg * self.ENEMY_SPEED_FACTOR)
+
         if self.squirrel.plane == PLANE_MID:
             squirrel_dx = dx_mid
         elif self.squirrel.plane == PLANE_FOREGROUND:
@@ -563,812 +953,355 @@ class GameState:
 
         self.squirrel.rect.x -= int(squirrel_dx)
 
-        # Cielo
-        for _, r in self.sky_tiles:
-            r.x -= int(dx_sky)
-        if self.sky_tiles:
-            max_right = max(r.right for _, r in self.sky_tiles)
-            for _, r in self.sky_tiles:
-                if r.right < 0:
-                    r.x = max_right
-                    max_right = r.right
-
-        # Suelos MID
-        for r in self.mid_ground_tiles:
-            r.x -= int(dx_mid)
-        if self.mid_ground_tiles:
-            tile_w = self.ground_img.get_width()
-            max_x = max(r.x for r in self.mid_ground_tiles)
-            for r in self.mid_ground_tiles:
-                if r.right < 0:
-                    r.x = max_x + tile_w + self.TILE_GAP_MID
-                    max_x = r.x
-
-        # Suelos BG
-        for r in self.bg_ground_tiles:
-            r.x -= int(dx_bg)
-        if self.bg_ground_tiles:
-            tile_w = self.ground_bg_img.get_width()
-            max_x = max(r.x for r in self.bg_ground_tiles)
-            for r in self.bg_ground_tiles:
-                if r.right < 0:
-                    r.x = max_x + tile_w + self.TILE_GAP_BG
-                    max_x = r.x
-
-        # Suelos FG
-        for r in self.fg_ground_tiles:
-            r.x -= int(dx_fg)
-        if self.fg_ground_tiles:
-            tile_w = self.ground_fg_img.get_width()
-            max_x = max(r.x for r in self.fg_ground_tiles)
-            for r in self.fg_ground_tiles:
-                if r.right < 0:
-                    r.x = max_x + tile_w + self.TILE_GAP_FG
-                    max_x = r.x
-
-        # Árboles MID
-        for tree in self.mid_trees:
-            tree["rect"].x -= int(dx_mid)
-        if self.mid_trees:
-            for tree in self.mid_trees:
-                rect = tree["rect"]
-                if rect.right < 0:
-                    spawn_x = SCREEN_WIDTH + random.randint(150, 400)
-                    ground_y_mid = self._get_plane_ground_y(PLANE_MID) + self.TREE_MID_OFFSET_Y
-                    base_mid, kind = random.choice(self.tree_defs)
-                    img_mid = base_mid
-                    new_rect = img_mid.get_rect(midbottom=(spawn_x, ground_y_mid))
-                    tree["img"] = img_mid
-                    tree["rect"] = new_rect
-                    tree["kind"] = kind
-
-        # Árboles BG
-        for tree in self.bg_trees:
-            tree["rect"].x -= int(dx_bg)
-        if self.bg_trees:
-            for tree in self.bg_trees:
-                rect = tree["rect"]
-                if rect.right < 0:
-                    spawn_x = SCREEN_WIDTH + random.randint(150, 400)
-                    ground_y_bg = self._get_plane_ground_y(PLANE_BACKGROUND) + self.TREE_BG_OFFSET_Y
-                    base_mid, kind = random.choice(self.tree_defs)
-                    w, h = base_mid.get_size()
-                    img_bg = pygame.transform.smoothscale(
-                        base_mid,
-                        (int(w * self.TREE_BG_SCALE_FACTOR), int(h * self.TREE_BG_SCALE_FACTOR))
-                    )
-                    img_bg = self._tint_tree_for_plane(img_bg, PLANE_BACKGROUND)
-                    new_rect = img_bg.get_rect(midbottom=(spawn_x, ground_y_bg))
-                    tree["img"] = img_bg
-                    tree["rect"] = new_rect
-                    tree["kind"] = kind
-
-        # Árboles FG
-        for tree in self.fg_trees:
-            tree["rect"].x -= int(dx_fg)
-        if self.fg_trees:
-            for tree in self.fg_trees:
-                rect = tree["rect"]
-                if rect.right < 0:
-                    spawn_x = SCREEN_WIDTH + random.randint(150, 400)
-                    ground_y_fg = self._get_plane_ground_y(PLANE_FOREGROUND) + self.TREE_MID_OFFSET_Y
-                    base_mid, kind = random.choice(self.tree_defs)
-                    w, h = base_mid.get_size()
-                    img_fg = pygame.transform.smoothscale(
-                        base_mid,
-                        (int(w * self.TREE_FG_SCALE_FACTOR), int(h * self.TREE_FG_SCALE_FACTOR))
-                    )
-                    img_fg = self._tint_tree_for_plane(img_fg, PLANE_FOREGROUND)
-                    new_rect = img_fg.get_rect(midbottom=(spawn_x, ground_y_fg))
-                    tree["img"] = img_fg
-                    tree["rect"] = new_rect
-                    tree["kind"] = kind
-
-        # Bellotas
-        for acorn in self.acorns:
-            if acorn["plane"] == PLANE_MID:
-                acorn["rect"].x -= int(dx_mid)
-                if acorn["rect"].right < 0:
-                    ground_y_mid = self._get_plane_ground_y(PLANE_MID) + self.TREE_MID_OFFSET_Y
-                    spawn_x = SCREEN_WIDTH + random.randint(300, 700)
-                    acorn["rect"].midbottom = (spawn_x, ground_y_mid)
-
-        # Enemigos (fantasmas) – más rápidos y con vaivén vertical
-        for enemy in self.enemies:
-            plane = enemy["plane"]
-
-            if plane == PLANE_MID:
-                move_dx = dx_mid * 1.6
-            elif plane == PLANE_FOREGROUND:
-                move_dx = dx_fg * 1.6
-            else:
-                move_dx = dx_bg * 1.6
+        dx_by_plane = self._dx_by_plane
+        dx_by_plane[PLANE_MID] = dx_mid
+        dx_by_plane[PLANE_BACKGROUND] = dx_bg
+        dx_by_plane[PLANE_FOREGROUND] = dx_fg
+
+        # Cielo (los tiles que salen por la izquierda pasan al final) y suelos
+        self.sky_row.scroll(int(dx_sky))
+        for plane, strip in self.ground_strips.items():
+            strip.scroll(int(dx_by_plane[plane]))
 
-            enemy["rect"].x -= int(move_dx)
+        # Árboles y bellotas: al salir por la izquierda vuelven al pool
+        self.trees.scroll(dx_by_plane)
+        for i in self.trees.offscreen_left().tolist():
+            self.trees.despawn(i)
 
-            # Baibén vertical
-            enemy["phase"] += 2.0 * dt       # velocidad angular
-            amplitude = 20                   # altura del vaivén
-            base_y = enemy["base_y"]
-            enemy["rect"].centery = int(base_y + math.sin(enemy["phase"]) * amplitude)
+        self.acorns.scroll(dx_by_plane)
+        for i in self.acorns.offscreen_left().tolist():
+            self.acorns.despawn(i)
 
-        for enemy in list(self.enemies):
-            if enemy["rect"].right < 0:
-                self.enemies.remove(enemy)
-                self._spawn_enemy()
+        # Enemigos (fantasmas) – más rápidos (ENEMY_SPEED_FACTOR) y con vaivén vertical
+        self.enemies.scroll(dx_by_plane)
+        self.enemies.bob(dt, angular_speed=2.0, amplitude=20)
+        for i in self.enemies.offscreen_left().tolist():
+            self.enemies.despawn(i)
+
+        # Chunks nuevos por delante (repartidos entre ticks) y fuera los de atrás
+        self._update_parallax([int(dx) for dx in dx_by_plane])
+        self._stream_world()
 
     # ----------------- COLISIÓN CON BELLOTAS -----------------
 
-    def _check_acorn_collisions(self):
+    def _squirrel_feet(self, centerx: int, bottom: int, scale: float) -> tuple:
+        """
+        Pies de la ardilla en pantalla. Durante la transición de plano van
+        donde su rect; si no, la altura del salto se escala con el plano.
+        """
+        if self.plane_anim_active:
+            return centerx, bottom
+
+        ground_y = self.squirrel.ground_y
+        dy_visual = int((bottom - ground_y) * scale)
+        return centerx, int(ground_y + dy_visual)
+
+    def _squirrel_hitbox(self) -> tuple:
+        """
+        Máscara de la ardilla tal como se dibuja: frame actual en el nivel de
+        escala del plano, anclado por los pies igual que en draw().
+        Devuelve (Mask, esquina en pantalla, rect opaco para el prefiltro).
+        """
+        squirrel = self.squirrel
+        scale = self.current_plane_scale
+        mask, bounds = squirrel.mask_bank.scaled(squirrel.frame_key, self.scale_ladder, scale)
+        draw_rect = mask.get_rect(
+            midbottom=self._squirrel_feet(squirrel.rect.centerx, squirrel.rect.bottom, scale)
+        )
+        return mask, draw_rect.topleft, bounds.move(draw_rect.topleft)
+
+    def _collide_squirrel(self, obstacles: ObstacleArrays, masks: dict, hitbox: tuple):
+        """Obstáculos del plano de la ardilla que tocan su máscara (tras el prefiltro de rects)."""
+        mask, origin, hit_rect = hitbox
+        return obstacles.collide_mask(hit_rect, self.squirrel.plane, mask, origin, masks)
+
+    def _check_acorn_collisions(self, hitbox: tuple):
         if not self.acorns:
             return
 
-        squirrel_rect = self.squirrel.rect
-        current_plane = self.squirrel.plane
-
-        for acorn in list(self.acorns):
-            if acorn["plane"] != current_plane:
-                continue
-            if squirrel_rect.colliderect(acorn["rect"]):
-                if hasattr(self.squirrel, "on_acorn_collected"):
-                    self.squirrel.on_acorn_collected()
+        for i in self._collide_squirrel(self.acorns, self.acorn_masks, hitbox).tolist():
+            if hasattr(self.squirrel, "on_acorn_collected"):
+                self.squirrel.on_acorn_collected()
 
-                if self.powerup_sound:
-                    self.powerup_sound.play()
+            if self.powerup_sound:
+                self.powerup_sound.play()
 
-                self.acorns.remove(acorn)
-                self._spawn_acorn(current_plane)
+            # Bellota recogida: vuelve al pool
+            self.acorns.despawn(i)
 
     # ----------------- COLISIÓN CON ENEMIGOS (FANTASMA) -----------------
 
-    def _check_enemy_collisions(self):
+    def _check_enemy_collisions(self, hitbox: tuple):
         if not self.enemies:
             return
 
-        squirrel_rect = self.squirrel.rect
-        current_plane = self.squirrel.plane
-
-        for enemy in list(self.enemies):
-            if enemy["plane"] != current_plane:
-                continue
-            if squirrel_rect.colliderect(enemy["rect"]):
-                self.restart_requested = True
-                return
+        if len(self._collide_squirrel(self.enemies, self.enemy_masks, hitbox)):
+            self.restart_requested = True
 
     def handle_event(self, event):
         pass
 
     def update(self, dt: float):
-        keys = pygame.key.get_pressed()
-        self.squirrel.handle_input(keys)
+        prof = self.profiler
 
-        if keys[pygame.K_SPACE]:
-            self.squirrel.jump()
+        # Posición de la ardilla antes de este tick (para interpolar al dibujar)
+        self.squirrel_prev_pos = (self.squirrel.rect.centerx, self.squirrel.rect.bottom)
 
-        self.special_jump.update(dt)
-        direction = None
-        if keys[pygame.K_a]:
-            direction = "up"
-        elif keys[pygame.K_s]:
-            direction = "down"
+        with prof.phase("update.entities"):
+            keys = self.input_source.get_pressed()
+            self.squirrel.handle_input(keys)
 
-        if direction is not None:
-            old_plane = self.squirrel.plane
-            self.special_jump.try_activate(direction)
-            new_plane = self.squirrel.plane
-            if new_plane != old_plane:
-                self._start_plane_transition(old_plane, new_plane)
+            if keys[pygame.K_SPACE]:
+                self.squirrel.jump()
 
-        for entity in self.entities:
-            entity.update(dt)
+            self.special_jump.update(dt)
+            direction = None
+            if keys[pygame.K_a]:
+                direction = "up"
+            elif keys[pygame.K_s]:
+                direction = "down"
 
-        # Animación de cambio de plano
-        if self.plane_anim_active:
-            self.plane_anim_timer += dt
-            t = min(self.plane_anim_timer / self.plane_anim_duration, 1.0)
+            if direction is not None:
+                old_plane = self.squirrel.plane
+                self.special_jump.try_activate(direction)
+                new_plane = self.squirrel.plane
+                if new_plane != old_plane:
+                    self._start_plane_transition(old_plane, new_plane)
+
+            for entity in self.entities:
+                entity.update(dt)
 
-            alpha = t * t * (3 - 2 * t)
-            linear_y = self.plane_start_y + (self.plane_end_y - self.plane_start_y) * alpha
+            # Animación de cambio de plano
+            if self.plane_anim_active:
+                self.plane_anim_timer += dt
+                t = min(self.plane_anim_timer / self.plane_anim_duration, 1.0)
 
-            avg_scale = (self.plane_start_scale + self.plane_end_scale) * 0.5
-            effective_arc = self.PLANE_JUMP_ARC * avg_scale
+                alpha = t * t * (3 - 2 * t)
+                linear_y = self.plane_start_y + (self.plane_end_y - self.plane_start_y) * alpha
 
-            jump_offset = -effective_arc * 4 * (alpha * (1 - alpha))
-            cur_y = linear_y + jump_offset
+                avg_scale = (self.plane_start_scale + self.plane_end_scale) * 0.5
+                effective_arc = self.PLANE_JUMP_ARC * avg_scale
 
-            cur_scale = self.plane_start_scale + (self.plane_end_scale - self.plane_start_scale) * alpha
+                jump_offset = -effective_arc * 4 * (alpha * (1 - alpha))
+                cur_y = linear_y + jump_offset
 
-            self.squirrel.rect.bottom = int(cur_y)
-            self.current_plane_scale = cur_scale
+                cur_scale = self.plane_start_scale + (self.plane_end_scale - self.plane_start_scale) * alpha
 
-            if t >= 1.0:
-                self.plane_anim_active = False
-                self.squirrel.rect.bottom = int(self.plane_end_y)
-                self.current_plane_scale = self.plane_end_scale
+                self.squirrel.rect.bottom = int(cur_y)
+                self.current_plane_scale = cur_scale
+
+                if t >= 1.0:
+                    self.plane_anim_active = False
+                    self.squirrel.rect.bottom = int(self.plane_end_y)
+                    self.current_plane_scale = self.plane_end_scale
 
         # Cuenta atrás + scroll
-        if self.countdown > 0:
-            self.countdown -= dt
-            if self.countdown <= 0:
-                self.countdown = 0
-                self.scrolling = True
+        with prof.phase("update.scroll"):
+            if self.countdown > 0:
+                self.countdown -= dt
+                if self.countdown <= 0:
+                    self.countdown = 0
+                    self.scrolling = True
 
-        if self.scrolling:
-            self._update_scrolling_world(dt)
+            if self.scrolling:
+                self._update_scrolling_world(dt)
 
         # Muerte por salir por la izquierda
-        if self.squirrel.rect.right < 0:
-            self.restart_requested = True
-            return
+        with prof.phase("update.collisions"):
+            if self.squirrel.rect.right < 0:
+                self.restart_requested = True
+                return
 
-        # Bellotas
-        self._check_acorn_collisions()
+            # Máscara común: la ardilla a la escala y posición con que se dibuja
+            hitbox = self._squirrel_hitbox()
 
-        # Enemigos
-        self._check_enemy_collisions()
+            # Bellotas
+            self._check_acorn_collisions(hitbox)
 
-        # Colisiones con árboles
-        if self.squirrel.plane == PLANE_MID:
-            trees = self.mid_trees
-        elif self.squirrel.plane == PLANE_FOREGROUND:
-            trees = self.fg_trees
-        elif self.squirrel.plane == PLANE_BACKGROUND:
-            trees = self.bg_trees
-        else:
-            trees = []
-
-        if trees:
-            squirrel_hitbox = self.squirrel.rect.copy()
-            squirrel_hitbox = squirrel_hitbox.inflate(
-                -squirrel_hitbox.width * 0.6,
-                -squirrel_hitbox.height * 0.2
-            )
+            # Enemigos
+            self._check_enemy_collisions(hitbox)
 
-            for tree in list(trees):
-                tree_hitbox = self._get_tree_hitbox(tree["rect"], tree["kind"])
-                if squirrel_hitbox.colliderect(tree_hitbox):
+            # Colisiones con árboles (troncos del plano de la ardilla, píxel a píxel)
+            if len(self.trees):
+                hits = self._collide_squirrel(self.trees, self.tree_masks, hitbox)
+                if len(hits):
                     if self.squirrel.is_powered:
                         if self.hit_sound:
                             self.hit_sound.play()
 
-                        spawn_x = SCREEN_WIDTH + random.randint(150, 400)
-
-                        if self.squirrel.plane == PLANE_MID:
-                            ground_y = self._get_plane_ground_y(PLANE_MID) + self.TREE_MID_OFFSET_Y
-                            base_mid, kind = random.choice(self.tree_defs)
-                            img_new = base_mid
-                        elif self.squirrel.plane == PLANE_FOREGROUND:
-                            ground_y = self._get_plane_ground_y(PLANE_FOREGROUND) + self.TREE_MID_OFFSET_Y
-                            base_mid, kind = random.choice(self.tree_defs)
-                            w, h = base_mid.get_size()
-                            img_new = pygame.transform.smoothscale(
-                                base_mid,
-                                (int(w * self.TREE_FG_SCALE_FACTOR), int(h * self.TREE_FG_SCALE_FACTOR))
-                            )
-                            img_new = self._tint_tree_for_plane(img_new, PLANE_FOREGROUND)
-                        elif self.squirrel.plane == PLANE_BACKGROUND:
-                            ground_y = self._get_plane_ground_y(PLANE_BACKGROUND) + self.TREE_BG_OFFSET_Y
-                            base_mid, kind = random.choice(self.tree_defs)
-                            w, h = base_mid.get_size()
-                            img_new = pygame.transform.smoothscale(
-                                base_mid,
-                                (int(w * self.TREE_BG_SCALE_FACTOR), int(h * self.TREE_BG_SCALE_FACTOR))
-                            )
-                            img_new = self._tint_tree_for_plane(img_new, PLANE_BACKGROUND)
-                        else:
-                            ground_y = tree["rect"].bottom
-                            base_mid, kind = random.choice(self.tree_defs)
-                            img_new = base_mid
-
-                        new_rect = img_new.get_rect(midbottom=(spawn_x, ground_y))
-                        tree["img"] = img_new
-                        tree["rect"] = new_rect
-                        tree["kind"] = kind
-                        break
+                        # Árbol destruido (el primero): vuelve al pool
+                        self.trees.despawn(int(hits[0]))
                     else:
                         self.restart_requested = True
                         return
 
+    def _draw_plane(self, screen, plane: int, ox: dict, ox_enemy: dict):
+        """
+        Dibuja un plano completo: suelo, árboles, fantasmas y bellotas, desplazados
+        por la interpolación (`ox`, `ox_enemy`). Solo se recorren los obstáculos visibles.
+        """
+        dx = ox[plane]
+        left = -dx
+        right = SCREEN_WIDTH - dx
+
+        self.ground_strips[plane].draw(screen, dx)
+
+        trees = self.trees
+        idx = trees.visible(plane, left, right)
+        tree_variants = self.tree_variants
+        for kind, x, y in zip(trees.kind[idx].tolist(), trees.x[idx].tolist(), trees.y[idx].tolist()):
+            page, area, _ = tree_variants[(kind, plane)]
+            screen.blit(page, (x + dx, y), area)
+
+        enemies = self.enemies
+        enemy_dx = ox_enemy[plane]
+        page, area = self.enemy_variants[plane]
+        idx = enemies.visible(plane, -enemy_dx, SCREEN_WIDTH - enemy_dx)
+        for x, y in zip(enemies.x[idx].tolist(), enemies.y[idx].tolist()):
+            screen.blit(page, (x + enemy_dx, y), area)
+
+        acorns = self.acorns
+        page, area = self.acorn_sprite
+        idx = acorns.visible(plane, left, right)
+        for x, y in zip(acorns.x[idx].tolist(), acorns.y[idx].tolist()):
+            screen.blit(page, (x + dx, y), area)
+
     def draw(self, screen):
-        screen.fill((135, 206, 235))
+        prof = self.profiler
 
-        # Cielo
-        for img, r in self.sky_tiles:
-            screen.blit(img, r)
+        # Interpolación entre el tick anterior y el actual (ver render_alpha)
+        back = 1.0 - self.render_alpha
+        ox = {layer: int(dx * back) for layer, dx in self.last_scroll_dx.items()}
+        ox_enemy = {plane: int(dx * back) for plane, dx in self.last_enemy_dx.items()}
 
-        # --- 1) Fondo (BG) siempre detrás ---
-        for r in self.bg_ground_tiles:
-            screen.blit(self.ground_bg_img, r)
-        for tree in self.bg_trees:
-            screen.blit(tree["img"], tree["rect"])
+        with prof.phase("draw.sky"):
+            screen.fill((135, 206, 235))
 
-        # Enemigos en BG
-        for enemy in self.enemies:
-            if enemy["plane"] == PLANE_BACKGROUND:
-                screen.blit(enemy["img"], enemy["rect"])
+            # Cielo
+            sky_y = self.sky_row.y
+            for img, x in zip(self.sky_tile_imgs, self.sky_row.x.tolist()):
+                screen.blit(img, (x + ox["sky"], sky_y))
+
+        # --- 1) Fondo (BG) siempre detrás ---
+        with prof.phase("draw.bg"):
+            self._draw_plane(screen, PLANE_BACKGROUND, ox, ox_enemy)
 
         # --- 2) Plano medio detrás de la ardilla si ella no está en BG ---
         if self.squirrel.plane != PLANE_BACKGROUND:
-            for r in self.mid_ground_tiles:
-                screen.blit(self.ground_img, r)
-            for tree in self.mid_trees:
-                screen.blit(tree["img"], tree["rect"])
-
-            for enemy in self.enemies:
-                if enemy["plane"] == PLANE_MID:
-                    screen.blit(enemy["img"], enemy["rect"])
-
-            for acorn in self.acorns:
-                if acorn["plane"] == PLANE_MID:
-                    screen.blit(acorn["img"], acorn["rect"])
+            with prof.phase("draw.mid"):
+                self._draw_plane(screen, PLANE_MID, ox, ox_enemy)
 
         # --- 3) Foreground detrás de la ardilla si ella está en FG ---
         if self.squirrel.plane == PLANE_FOREGROUND:
-            for r in self.fg_ground_tiles:
-                screen.blit(self.ground_fg_img, r)
-            for tree in self.fg_trees:
-                screen.blit(tree["img"], tree["rect"])
+            with prof.phase("draw.fg"):
+                self._draw_plane(screen, PLANE_FOREGROUND, ox, ox_enemy)
 
-            for enemy in self.enemies:
-                if enemy["plane"] == PLANE_FOREGROUND:
-                    screen.blit(enemy["img"], enemy["rect"])
+        # --- 4) Ardilla (frame ya tintado desde el banco; escala por niveles) ---
+        with prof.phase("draw.squirrel"):
+            scale_factor = self.current_plane_scale
+            draw_img = self.squirrel_scaler.render(self.squirrel.image, scale_factor)
 
-        # --- 4) Ardilla (con tintado y escala) ---
-        base_img = self.squirrel.image
-        scale_factor = self.current_plane_scale
+            # Posición interpolada entre el tick anterior y el actual
+            alpha = self.render_alpha
+            prev_centerx, prev_bottom = self.squirrel_prev_pos
+            centerx = int(prev_centerx + (self.squirrel.rect.centerx - prev_centerx) * alpha)
+            bottom = int(prev_bottom + (self.squirrel.rect.bottom - prev_bottom) * alpha)
 
-        if self.squirrel.plane == PLANE_BACKGROUND:
-            tinted = base_img.copy()
-            tinted.fill((140, 140, 160, 255), special_flags=pygame.BLEND_RGBA_MULT)
-            base_img = tinted
-        elif self.squirrel.plane == PLANE_FOREGROUND:
-            tinted = base_img.copy()
-            tinted.fill((160, 160, 160, 255), special_flags=pygame.BLEND_RGBA_MULT)
-            base_img = tinted
-
-        if scale_factor != 1.0:
-            w, h = base_img.get_size()
-            draw_img = pygame.transform.scale(
-                base_img,
-                (int(w * scale_factor), int(h * scale_factor))
-            )
-        else:
-            draw_img = base_img
+            feet = self._squirrel_feet(centerx, bottom, scale_factor)
+            draw_rect = draw_img.get_rect(midbottom=feet)
 
-        if self.plane_anim_active:
-            feet_x = self.squirrel.rect.centerx
-            feet_y = self.squirrel.rect.bottom
-        else:
-            ground_y = self.squirrel.ground_y
-            dy_phys = self.squirrel.rect.bottom - ground_y
-            dy_visual = int(dy_phys * scale_factor)
-            feet_x = self.squirrel.rect.centerx
-            feet_y = int(ground_y + dy_visual)
-
-        draw_rect = draw_img.get_rect(midbottom=(feet_x, feet_y))
-
-        # Resplandor del powerup
-        if self.squirrel.is_powered and getattr(self.squirrel, "power_glow_surface", None) is not None:
-            glow_img = self.squirrel.power_glow_surface
-            if scale_factor != 1.0:
-                gw, gh = glow_img.get_size()
-                glow_img = pygame.transform.scale(
-                    glow_img,
-                    (int(gw * scale_factor), int(gh * scale_factor))
-                )
-            glow_rect = glow_img.get_rect(center=draw_rect.center)
-            screen.blit(glow_img, glow_rect)
+            # Resplandor del powerup
+            if self.squirrel.is_powered and getattr(self.squirrel, "power_glow_surface", None) is not None:
+                glow_img = self.glow_scaler.get(scale_factor)
+                glow_rect = glow_img.get_rect(center=draw_rect.center)
+                screen.blit(glow_img, glow_rect)
 
-        screen.blit(draw_img, draw_rect)
+            screen.blit(draw_img, draw_rect)
 
         # --- 5) Si Nutty está en BG, el MID va por delante suyo ---
         if self.squirrel.plane == PLANE_BACKGROUND:
-            for r in self.mid_ground_tiles:
-                screen.blit(self.ground_img, r)
-            for tree in self.mid_trees:
-                screen.blit(tree["img"], tree["rect"])
-
-            for enemy in self.enemies:
-                if enemy["plane"] == PLANE_MID:
-                    screen.blit(enemy["img"], enemy["rect"])
-
-            for acorn in self.acorns:
-                if acorn["plane"] == PLANE_MID:
-                    screen.blit(acorn["img"], acorn["rect"])
+            with prof.phase("draw.mid"):
+                self._draw_plane(screen, PLANE_MID, ox, ox_enemy)
 
         # --- 6) Foreground por delante si Nutty NO está en FG ---
         if self.squirrel.plane != PLANE_FOREGROUND:
-            for r in self.fg_ground_tiles:
-                screen.blit(self.ground_fg_img, r)
-            for tree in self.fg_trees:
-                screen.blit(tree["img"], tree["rect"])
-
-            for enemy in self.enemies:
-                if enemy["plane"] == PLANE_FOREGROUND:
-                    screen.blit(enemy["img"], enemy["rect"])
+            with prof.phase("draw.fg"):
+                self._draw_plane(screen, PLANE_FOREGROUND, ox, ox_enemy)
 
         # --- 7) HUD: mensajes encima de Nutty (powerup + fantasma) ---
-        mensajes = []
-
-        if getattr(self.squirrel, "is_powered", False) and hasattr(self.squirrel, "acorn_power"):
-            remaining = self.squirrel.acorn_power.remaining
-            if remaining > 0:
-                seconds_left = int(remaining) + 1
-                textos = f"¡Te quedan {seconds_left} segundos de protección!"
-                mensajes.append(("powerup", textos))
-
-        ghost_on_screen = False
-        for enemy in self.enemies:
-            if enemy["rect"].right > 0 and enemy["rect"].left < SCREEN_WIDTH:
-                ghost_on_screen = True
-                break
-
-        if ghost_on_screen:
-            mensajes.append(("ghost", "¡Cuidado con el fantasma!"))
-
-        if mensajes:
-            base_y = draw_rect.top - 10
-            gap = 6
-            current_bottom = base_y
-
-            for tipo, texto in mensajes:
-                text_surf = self.ui_font.render(texto, True, (255, 255, 255))
-                padding_x = 10
-                padding_y = 6
-                bg_surf = pygame.Surface(
-                    (text_surf.get_width() + padding_x * 2,
-                     text_surf.get_height() + padding_y * 2),
-                    pygame.SRCALPHA,
-                )
-
-                if tipo == "ghost":
-                    bg_color = (80, 0, 120, 200)
-                else:
-                    bg_color = (0, 0, 0, 160)
-
-                bg_surf.fill(bg_color)
-
-                bg_rect = bg_surf.get_rect(midbottom=(draw_rect.centerx, current_bottom))
-                text_rect = text_surf.get_rect(center=bg_rect.center)
-
-                screen.blit(bg_surf, bg_rect)
-                screen.blit(text_surf, text_rect)
-
-                current_bottom = bg_rect.top - gap
-
-        # --- 8) HUD de VIDAS arriba izquierda ---
-        vidas_x = 20
-        vidas_y = 10
-        label_rect = self.vidas_img.get_rect(topleft=(vidas_x, vidas_y))
-        screen.blit(self.vidas_img, label_rect)
-
-        acorn_x = label_rect.right + 10
-        acorn_y = vidas_y + 35
-        for i in range(self.lives):
-            rect = self.life_icon_img.get_rect(topleft=(acorn_x + i * 40, acorn_y))
-            screen.blit(self.life_icon_img, rect)
-
-        # --- 9) Debug hitboxes (desactivado) ---
-        # if self.squirrel.plane == PLANE_MID:
-        #     squirrel_hitbox = self.squirrel.rect.copy()
-        #     squirrel_hitbox = squirrel_hitbox.inflate(
-        #         -squirrel_hitbox.width * 0.6,
-        #         -squirrel_hitbox.height * 0.2
-        #     )
-        #     pygame.draw.rect(screen, (255, 0, 0), squirrel_hitbox, 2)
-        #     for tree in self.mid_trees:
-        #         tree_hitbox = self._get_tree_hitbox(tree["rect"], tree["kind"])
-        #         pygame.draw.rect(screen, (0, 255, 0), tree_hitbox, 2)
-
-        # --- 10) Cuenta atrás inicial con START + 3-2-1 animado ---
-        if self.countdown > 0:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 160))
-            screen.blit(overlay, (0, 0))
-
-            start_rect = self.start_img.get_rect()
-            start_rect.centerx = SCREEN_WIDTH // 2
-            start_rect.centery = int(SCREEN_HEIGHT * 0.3)
-            screen.blit(self.start_img, start_rect)
-
-            n = int(self.countdown) + 1
-            if n < 1:
-                n = 1
-            elif n > 3:
-                n = 3
-
-            number_img = self.countdown_imgs.get(n)
-            if number_img:
-                t_segment = n - self.countdown
-                t_segment = max(0.0, min(1.0, t_segment))
-
-                c1 = 1.70158
-                c3 = c1 + 1.0
-                base = 1 + c3 * (t_segment - 1) ** 3 + c1 * (t_segment - 1) ** 2
-                scale = 0.4 + 0.8 * base
-                scale = max(0.4, min(1.3, scale))
-
-                w, h = number_img.get_size()
-                scaled_w = int(w * scale)
-                scaled_h = int(h * scale)
-                scaled_img = pygame.transform.smoothscale(number_img, (scaled_w, scaled_h))
-
-                num_rect = scaled_img.get_rect()
-                num_rect.centerx = SCREEN_WIDTH // 2
-                num_rect.centery = int(SCREEN_HEIGHT * 0.6)
-
-                screen.blit(scaled_img, num_rect)
-
-
-class MainMenuState:
-    """
-    Pantalla de inicio:
-    - Jugar
-    - Tutorial
-    - Salir
-    """
-
-    def __init__(self):
-        self.options = ["Jugar", "Tutorial", "Salir"]
-        self.selected = 0
-
-        self.font_opt = pygame.font.SysFont(None, 48)
-        self.text_color = (230, 230, 230)
-        self.text_selected_color = (255, 255, 120)
-
-        # Fondo
-        try:
-            bg = load_image("assets/sprites/menu/menu.png")
-            self.bg_image = pygame.transform.scale(bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        except Exception:
-            self.bg_image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            self.bg_image.fill((10, 20, 40))
-
-        # Logo
-        try:
-            self.logo_image = load_image("assets/sprites/menu/logo.png")
-            LOGO_SCALE = 0.4
-            w, h = self.logo_image.get_size()
-            self.logo_image = pygame.transform.smoothscale(
-                self.logo_image,
-                (int(w * LOGO_SCALE), int(h * LOGO_SCALE))
-            )
-        except Exception:
-            self.logo_image = pygame.Surface((400, 120), pygame.SRCALPHA)
-            self.logo_image.fill((0, 0, 0, 0))
-            font_title = pygame.font.SysFont(None, 96)
-            txt = font_title.render("Nutty Lucky", True, (255, 255, 255))
-            rect = txt.get_rect(center=self.logo_image.get_rect().center)
-            self.logo_image.blit(txt, rect)
-
-        self.logo_rect = self.logo_image.get_rect(
-            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3.5)
-        )
-
-        # Botones
-        button_paths = [
-            "assets/sprites/menu/play.png",
-            "assets/sprites/menu/tutorial.png",
-            "assets/sprites/menu/salir.png",
-        ]
-
-        self.buttons = []
-        start_y = int(SCREEN_HEIGHT * 0.63)
-        spacing = 80
-        BUTTON_SCALE = 0.2
-
-        for i, path in enumerate(button_paths):
-            try:
-                img = load_image(path)
-            except Exception:
-                img = pygame.Surface((200, 60), pygame.SRCALPHA)
-                img.fill((50, 50, 50, 200))
-
-            w, h = img.get_size()
-            img = pygame.transform.smoothscale(
-                img,
-                (int(w * BUTTON_SCALE), int(h * BUTTON_SCALE))
-            )
-            rect = img.get_rect(
-                center=(SCREEN_WIDTH // 2, start_y + i * spacing)
-            )
-            self.buttons.append({"image": img, "rect": rect})
-
-        # Selector bellota
-        try:
-            selector_img = load_image("assets/sprites/world/acorn.png")
-        except Exception:
-            selector_img = pygame.Surface((40, 40), pygame.SRCALPHA)
-            pygame.draw.circle(selector_img, (210, 180, 140), (20, 20), 20)
-
-        SELECTOR_SCALE = 0.1
-        sw, sh = selector_img.get_size()
-        self.selector_image = pygame.transform.smoothscale(
-            selector_img,
-            (int(sw * SELECTOR_SCALE), int(sh * SELECTOR_SCALE))
-        )
-        self.selector_offset_x = 10
-
-    def handle_event(self, event):
-        if event.type == pygame.KEYDOWN:
-            if event.key in (pygame.K_UP, pygame.K_w):
-                self.selected = (self.selected - 1) % len(self.options)
-            elif event.key in (pygame.K_DOWN, pygame.K_s):
-                self.selected = (self.selected + 1) % len(self.options)
-            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                option = self.options[self.selected]
-                if option == "Jugar":
-                    return "play"
-                elif option == "Tutorial":
-                    return "tutorial"
-                elif option == "Salir":
-                    return "quit"
-        return None
-
-    def update(self, dt: float):
-        pass
-
-    def draw(self, screen):
-        screen.blit(self.bg_image, (0, 0))
-        screen.blit(self.logo_image, self.logo_rect)
-
-        for i, btn in enumerate(self.buttons):
-            img = btn["image"]
-            rect = btn["rect"]
-
-            if i == self.selected:
-                glow_rect = rect.inflate(40, 20)
-                glow_surf = pygame.Surface(glow_rect.size, pygame.SRCALPHA)
-                pygame.draw.rect(
-                    glow_surf,
-                    (255, 255, 180, 100),
-                    glow_surf.get_rect(),
-                    border_radius=25
-                )
-                screen.blit(glow_surf, glow_rect.topleft)
-
-            screen.blit(img, rect)
+        with prof.phase("draw.hud"):
+            mensajes = []
 
-            if i == self.selected:
-                selector_rect = self.selector_image.get_rect(
-                    midright=(rect.left - self.selector_offset_x, rect.centery)
-                )
-                screen.blit(self.selector_image, selector_rect)
+            if getattr(self.squirrel, "is_powered", False) and hasattr(self.squirrel, "acorn_power"):
+                remaining = self.squirrel.acorn_power.remaining
+                if remaining > 0:
+                    seconds_left = int(remaining) + 1
+                    textos = f"¡Te quedan {seconds_left} segundos de protección!"
+                    mensajes.append(("powerup", textos))
 
+            ghost_on_screen = len(self.enemies.visible(None, 0, SCREEN_WIDTH)) > 0
 
-class GameOverState:
-    """
-    Pantalla de GAME OVER:
-    - Jugar
-    - Salir
-    Usa el sprite gameover.png como título.
-    """
+            if ghost_on_screen:
+                mensajes.append(("ghost", "¡Cuidado con el fantasma!"))
 
-    def __init__(self):
-        self.options = ["Jugar", "Salir"]
-        self.selected = 0
+            if mensajes:
+                base_y = draw_rect.top - 10
+                gap = 6
+                current_bottom = base_y
 
-        self.font_opt = pygame.font.SysFont(None, 48)
-        self.text_color = (230, 230, 230)
-        self.text_selected_color = (255, 255, 120)
-
-        # Fondo (reutilizamos el del menú principal)
-        try:
-            bg = load_image("assets/sprites/menu/menu.png")
-            self.bg_image = pygame.transform.scale(bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        except Exception:
-            self.bg_image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            self.bg_image.fill((20, 0, 0))
-
-        # Título GAMEOVER usando el sprite
-        try:
-            raw = load_image("assets/sprites/menu/gameover.png")
-            # Escalamos un poco para que encaje en pantalla
-            scale = 0.4
-            w, h = raw.get_size()
-            self.gameover_img = pygame.transform.smoothscale(
-                raw,
-                (int(w * scale), int(h * scale))
-            )
-        except Exception:
-            title_font = pygame.font.SysFont(None, 96)
-            self.gameover_img = title_font.render("GAME OVER", True, (255, 255, 255))
+                for tipo, texto in mensajes:
+                    padding_x = 10
+                    padding_y = 6
 
-        self.gameover_rect = self.gameover_img.get_rect(
-            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3.5)
-        )
+                    if tipo == "ghost":
+                        bg_color = (80, 0, 120, 200)
+                    else:
+                        bg_color = (0, 0, 0, 160)
 
-        # Botones: JUGAR y SALIR, reutilizando los sprites del menú
-        button_paths = [
-            "assets/sprites/menu/play.png",
-            "assets/sprites/menu/salir.png",
-        ]
+                    # Texto + fondo ya compuestos; solo se renderiza si cambia el mensaje
+                    msg_surf = render_text(
+                        self.ui_font_spec, texto, (255, 255, 255),
+                        background=(bg_color, padding_x, padding_y),
+                    )
+                    bg_rect = msg_surf.get_rect(midbottom=(draw_rect.centerx, current_bottom))
+                    screen.blit(msg_surf, bg_rect)
 
-        self.buttons = []
-        start_y = int(SCREEN_HEIGHT * 0.6)
-        spacing = 80
-        BUTTON_SCALE = 0.2
+                    current_bottom = bg_rect.top - gap
 
-        for i, path in enumerate(button_paths):
-            try:
-                img = load_image(path)
-            except Exception:
-                img = pygame.Surface((200, 60), pygame.SRCALPHA)
-                img.fill((50, 50, 50, 200))
+            # --- 8) HUD de VIDAS arriba izquierda ---
+            vidas_x = 20
+            vidas_y = 10
+            page, area = self.vidas_sprite
+            screen.blit(page, (vidas_x, vidas_y), area)
 
-            w, h = img.get_size()
-            img = pygame.transform.smoothscale(
-                img,
-                (int(w * BUTTON_SCALE), int(h * BUTTON_SCALE))
-            )
-            rect = img.get_rect(
-                center=(SCREEN_WIDTH // 2, start_y + i * spacing)
-            )
-            self.buttons.append({"image": img, "rect": rect})
+            acorn_x = vidas_x + area.width + 10
+            acorn_y = vidas_y + 35
+            page, area = self.life_icon_sprite
+            for i in range(self.lives):
+                screen.blit(page, (acorn_x + i * 40, acorn_y), area)
 
-        # Selector bellota
-        try:
-            selector_img = load_image("assets/sprites/world/acorn.png")
-        except Exception:
-            selector_img = pygame.Surface((40, 40), pygame.SRCALPHA)
-            pygame.draw.circle(selector_img, (210, 180, 140), (20, 20), 20)
-
-        SELECTOR_SCALE = 0.1
-        sw, sh = selector_img.get_size()
-        self.selector_image = pygame.transform.smoothscale(
-            selector_img,
-            (int(sw * SELECTOR_SCALE), int(sh * SELECTOR_SCALE))
-        )
-        self.selector_offset_x = 10
-
-    def handle_event(self, event):
-        if event.type == pygame.KEYDOWN:
-            if event.key in (pygame.K_UP, pygame.K_w):
-                self.selected = (self.selected - 1) % len(self.options)
-            elif event.key in (pygame.K_DOWN, pygame.K_s):
-                self.selected = (self.selected + 1) % len(self.options)
-            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                option = self.options[self.selected]
-                if option == "Jugar":
-                    return "play"
-                elif option == "Salir":
-                    return "quit"
+        # --- 9) Cuenta atrás inicial con START + 3-2-1 animado ---
+        if self.countdown > 0:
+            with prof.phase("draw.countdown"):
+                screen.blit(self.countdown_overlay, (0, 0))
+                page, area = self.start_sprite
+                screen.blit(page, self.start_rect, area)
+
+                n = int(self.countdown) + 1
+                if n < 1:
+                    n = 1
+                elif n > 3:
+                    n = 3
+
+                frames = self.countdown_table.get(n)
+                if frames:
+                    t_segment = n - self.countdown
+                    t_segment = max(0.0, min(1.0, t_segment))
+
+                    # Frame precalculado más cercano (solo un blit)
+                    i = min(int(t_segment * self.COUNTDOWN_TABLE_FPS), self.COUNTDOWN_TABLE_FPS - 1)
+                    page, area, topleft = frames[i]
+                    screen.blit(page, topleft, area)
+
+        # Todo el mundo hace scroll: se presenta la pantalla completa
         return None
-
-    def update(self, dt: float):
-        pass
-
-    def draw(self, screen):
-        screen.blit(self.bg_image, (0, 0))
-
-        # Pequeño overlay oscuro para dramatismo
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 140))
-        screen.blit(overlay, (0, 0))
-
-        # Título GAMEOVER
-        screen.blit(self.gameover_img, self.gameover_rect)
-
-        # Botones
-        for i, btn in enumerate(self.buttons):
-            img = btn["image"]
-            rect = btn["rect"]
-
-            if i == self.selected:
-                glow_rect = rect.inflate(40, 20)
-                glow_surf = pygame.Surface(glow_rect.size, pygame.SRCALPHA)
-                pygame.draw.rect(
-                    glow_surf,
-                    (255, 255, 180, 100),
-                    glow_surf.get_rect(),
-                    border_radius=25
-                )
-                screen.blit(glow_surf, glow_rect.topleft)
-
-            screen.blit(img, rect)
-
-            if i == self.selected:
-                selector_rect = self.selector_image.get_rect(
-                    midright=(rect.left - self.selector_offset_x, rect.centery)
-                )
-                screen.blit(self.selector_image, selector_rect)
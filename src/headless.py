@@ -0,0 +1,252 @@
+# headless.py
+"""
+Modo headless: simula partidas de GameState sin ventana ni teclado.
+
+- Usa los drivers "dummy" de SDL (vídeo y audio).
+- Avanza GameState.update con un dt fijo.
+- La entrada viene de una ScriptedInput en lugar del teclado.
+- draw() es opcional (--no-draw para simular solo la lógica).
+
+Con `--seed` fija sirve de prueba de dificultad: `--output` guarda la
+supervivencia (media y mediana) y `--baseline` la compara con una guardada
+antes; falla (código de salida 1) si la media baja más de `--tolerance` o
+de `--min-survival` segundos. Así un cambio en colisiones o en el mundo que
+vuelva el juego más difícil no pasa desapercibido.
+
+Uso (desde la raíz del repo, por las rutas de assets):
+    python src/headless.py --runs 100 --ticks 3600 --no-draw
+    python src/headless.py --runs 200 --seed 0 --no-draw --output survival.json
+    python src/headless.py --runs 200 --seed 0 --no-draw --baseline survival.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import time
+
+import pygame
+
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+from input_sources import ScriptedInput, ReplayInput
+
+
+def init_headless() -> pygame.Surface:
+    """
+    Inicializa pygame con los drivers dummy y devuelve la superficie de pantalla.
+    Hace falta un display (aunque sea dummy) para que convert_alpha funcione.
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+    return pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+
+def default_script(tick: int):
+    """
+    Guion sencillo de prueba: corre hacia la derecha, salta cada ~0.75 s
+    y cambia de plano de vez en cuando (arriba/abajo alternando).
+    """
+    pressed = [pygame.K_RIGHT]
+    if tick % 45 == 0:
+        pressed.append(pygame.K_SPACE)
+    if tick % 240 == 120:
+        pressed.append(pygame.K_a if (tick // 240) % 2 == 0 else pygame.K_s)
+    return pressed
+
+
+def run_headless(
+    ticks: int,
+    dt: float = 1.0 / FPS,
+    script=default_script,
+    draw: bool = True,
+    screen: pygame.Surface = None,
+    seed: int = None,
+) -> dict:
+    """
+    Simula UNA vida de GameState durante como mucho `ticks` ticks de `dt` segundos.
+    Termina antes si el estado pide reinicio (la ardilla ha muerto).
+    Con la misma `seed` y el mismo guion, la partida es idéntica.
+    """
+    # Import tardío: GameState carga assets y necesita el display ya creado
+    from game_states import GameState
+
+    if screen is None:
+        screen = pygame.display.get_surface() or init_headless()
+
+    state = GameState(input_source=ScriptedInput(script), seed=seed, dt=dt)
+    tick = 0
+    while tick < ticks:
+        state.update(dt)
+        if draw:
+            state.draw(screen)
+        tick += 1
+        if state.restart_requested:
+            break
+
+    return {
+        "seed": state.seed,
+        "ticks": tick,
+        "sim_time": tick * dt,
+        "died": state.restart_requested,
+    }
+
+
+def run_replay(path: str, draw: bool = True, screen: pygame.Surface = None, lives: int = 3) -> dict:
+    """
+    Reproduce una partida grabada con `main.py --record` (con sus vidas),
+    hasta que se acaba la grabación o las vidas.
+    """
+    from game_states import GameState
+
+    if screen is None:
+        screen = pygame.display.get_surface() or init_headless()
+
+    replay = ReplayInput.load(path)
+    dt = 1.0 / replay.tick_rate
+    tick = 0
+    while lives > 0 and not replay.finished:
+        state = GameState(input_source=replay, seed=replay.seed, dt=dt)
+        state.lives = lives
+        while not replay.finished:
+            state.update(dt)
+            if draw:
+                state.draw(screen)
+            tick += 1
+            if state.restart_requested:
+                lives -= 1
+                break
+
+    return {
+        "seed": replay.seed,
+        "ticks": tick,
+        "sim_time": tick * dt,
+        "died": lives == 0,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación headless de Nutty Lucky")
+    parser.add_argument("--runs", type=int, default=10, help="número de partidas simuladas")
+    parser.add_argument("--ticks", type=int, default=FPS * 60, help="ticks máximos por partida")
+    parser.add_argument("--dt", type=float, default=1.0 / FPS, help="paso fijo en segundos")
+    parser.add_argument(
+        "--seed", type=int, default=None,
+        help="semilla base (la partida i usa seed + i); sin ella, semillas aleatorias",
+    )
+    parser.add_argument(
+        "--replay", metavar="FICHERO", default=None,
+        help="en lugar del guion, reproduce una partida grabada con main.py --record",
+    )
+    parser.add_argument("--no-draw", action="store_true", help="no llamar a draw()")
+    parser.add_argument("--verbose", action="store_true", help="mostrar los prints del juego")
+    parser.add_argument(
+        "--min-survival", type=float, default=None,
+        help="supervivencia media mínima (s); por debajo, falla",
+    )
+    parser.add_argument(
+        "--baseline", metavar="FICHERO", default=None,
+        help="JSON de una simulación anterior (mismas semillas) con el que comparar",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15,
+        help="caída máxima de la supervivencia media frente a --baseline (0.15 = 15%%)",
+    )
+    parser.add_argument("--output", metavar="FICHERO", default=None, help="escribir el JSON aquí")
+    return parser.parse_args(argv)
+
+
+def survival_summary(results: list, args) -> dict:
+    """Resumen de dificultad de una tanda: muertes y supervivencia (s)."""
+    times = [r["sim_time"] for r in results]
+    return {
+        "runs": len(results),
+        "seed": args.seed,
+        "ticks": args.ticks,
+        "dt": args.dt,
+        "replay": args.replay,
+        "deaths": sum(1 for r in results if r["died"]),
+        "mean_survival": round(statistics.mean(times), 3) if times else 0.0,
+        "median_survival": round(statistics.median(times), 3) if times else 0.0,
+    }
+
+
+def check_survival(summary: dict, args) -> bool:
+    """True si la supervivencia cumple --min-survival y no empeora frente a --baseline."""
+    ok = True
+    mean = summary["mean_survival"]
+    if args.min_survival is not None and mean < args.min_survival:
+        print(f"[FAIL] Supervivencia media {mean:.2f}s por debajo de {args.min_survival:.2f}s", file=sys.stderr)
+        ok = False
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        # Solo es comparable con las mismas partidas (semillas, ticks y paso)
+        same = ("runs", "seed", "ticks", "dt", "replay")
+        if any(baseline.get(k) != summary[k] for k in same):
+            print(
+                f"[FAIL] {args.baseline} no es comparable: "
+                + ", ".join(f"{k} {baseline.get(k)} -> {summary[k]}" for k in same),
+                file=sys.stderr,
+            )
+            return False
+        limit = baseline["mean_survival"] * (1.0 - args.tolerance)
+        if mean < limit:
+            print(
+                f"[FAIL] Supervivencia media {mean:.2f}s frente a {baseline['mean_survival']:.2f}s "
+                f"de referencia (límite {limit:.2f}s)",
+                file=sys.stderr,
+            )
+            ok = False
+    return ok
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    screen = init_headless()
+
+    results = []
+    start = time.perf_counter()
+    # Los prints de depuración del juego (saltos, cambios de plano...) se
+    # descartan salvo con --verbose: con miles de partidas dominan el tiempo.
+    with open(os.devnull, "w") as devnull:
+        out = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(devnull)
+        with out:
+            for i in range(args.runs):
+                if args.replay:
+                    results.append(
+                        run_replay(args.replay, draw=not args.no_draw, screen=screen)
+                    )
+                    continue
+                seed = None if args.seed is None else args.seed + i
+                results.append(
+                    run_headless(
+                        args.ticks, args.dt, draw=not args.no_draw, screen=screen, seed=seed
+                    )
+                )
+    elapsed = time.perf_counter() - start
+
+    total_ticks = sum(r["ticks"] for r in results)
+    summary = survival_summary(results, args)
+    print(
+        f"[INFO] {len(results)} partidas, {total_ticks} ticks en {elapsed:.2f}s "
+        f"({len(results) / elapsed * 60:.0f} partidas/min, {total_ticks / elapsed:.0f} ticks/s)"
+    )
+    print(
+        f"[INFO] Muertes: {summary['deaths']}/{len(results)}, "
+        f"supervivencia media: {summary['mean_survival']:.1f}s "
+        f"(mediana {summary['median_survival']:.1f}s)"
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(json.dumps(summary, indent=2) + "\n")
+        print(f"[INFO] Supervivencia guardada en {args.output}")
+
+    pygame.quit()
+    return 0 if check_survival(summary, args) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
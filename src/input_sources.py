@@ -0,0 +1,150 @@
+# input_sources.py
+import struct
+
+import pygame
+
+
+class KeyState:
+    """
+    Estado de teclas de un tick, indexable igual que pygame.key.get_pressed():
+    keys[pygame.K_LEFT] -> True / False.
+    """
+
+    __slots__ = ("pressed",)
+
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+class KeyboardInput:
+    """Entrada real: lee el teclado con pygame.key.get_pressed()."""
+
+    def get_pressed(self):
+        return pygame.key.get_pressed()
+
+
+class ScriptedInput:
+    """
+    Entrada programada, para simular partidas sin teclado.
+
+    `script` puede ser:
+    - una función tick -> iterable de teclas pulsadas en ese tick, o
+    - una lista con un iterable de teclas por tick (se repite en bucle).
+
+    GameState llama a get_pressed() una vez por update, así que cada
+    llamada avanza un tick.
+    """
+
+    def __init__(self, script):
+        self.script = script
+        self.tick = 0
+
+    def get_pressed(self) -> KeyState:
+        if callable(self.script):
+            pressed = self.script(self.tick)
+        elif self.script:
+            pressed = self.script[self.tick % len(self.script)]
+        else:
+            pressed = ()
+        self.tick += 1
+        return KeyState(pressed)
+
+
+# ----------------- GRABACIÓN Y REPLAY -----------------
+
+# Teclas que se graban, un bit por tecla -> un byte por tick
+RECORDED_KEYS = (
+    pygame.K_LEFT,
+    pygame.K_RIGHT,
+    pygame.K_UP,
+    pygame.K_DOWN,
+    pygame.K_SPACE,
+    pygame.K_a,
+    pygame.K_s,
+)
+
+# Cabecera del fichero: magic, versión, semilla, ticks por segundo
+REPLAY_MAGIC = b"NLRP"
+# 2: el mundo se genera por chunks (la misma semilla da otro mundo que en la 1)
+REPLAY_VERSION = 2
+_REPLAY_HEADER = struct.Struct("<4sBQH")
+
+
+def pack_keys(keys) -> int:
+    """Empaqueta el estado de RECORDED_KEYS en un byte."""
+    byte = 0
+    for bit, key in enumerate(RECORDED_KEYS):
+        if keys[key]:
+            byte |= 1 << bit
+    return byte
+
+
+# Los 128 estados posibles, precalculados: desempaquetar es un índice
+_UNPACKED = [
+    KeyState(key for bit, key in enumerate(RECORDED_KEYS) if byte & (1 << bit))
+    for byte in range(1 << len(RECORDED_KEYS))
+]
+
+
+class RecordingInput:
+    """
+    Envuelve otra fuente (el teclado por defecto) y guarda un byte por tick
+    con las teclas pulsadas. save() escribe el fichero de replay.
+    """
+
+    def __init__(self, source=None):
+        self.source = source if source is not None else KeyboardInput()
+        self.ticks = bytearray()
+
+    def get_pressed(self):
+        keys = self.source.get_pressed()
+        self.ticks.append(pack_keys(keys))
+        return keys
+
+    def save(self, path: str, seed: int, tick_rate: int):
+        with open(path, "wb") as f:
+            f.write(_REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, seed, tick_rate))
+            f.write(self.ticks)
+        print(f"[INFO] Replay guardado en {path}: {len(self.ticks)} ticks, semilla {seed}")
+
+
+class ReplayInput:
+    """
+    Reproduce un fichero grabado con RecordingInput.
+    `seed` y `tick_rate` vienen de la cabecera: para reproducir la partida hay que
+    crear GameState con esa semilla y avanzar con dt = 1 / tick_rate.
+    Al acabarse la grabación devuelve "ninguna tecla" y `finished` pasa a True.
+    """
+
+    def __init__(self, ticks: bytes, seed: int, tick_rate: int):
+        self.ticks = ticks
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.tick = 0
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayInput":
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, tick_rate = _REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"Fichero de replay no válido: {path}")
+        if version != REPLAY_VERSION:
+            raise ValueError(
+                f"Replay de otra versión del juego ({version}, esta es la {REPLAY_VERSION}): {path}"
+            )
+        return cls(data[_REPLAY_HEADER.size:], seed, tick_rate)
+
+    @property
+    def finished(self) -> bool:
+        return self.tick >= len(self.ticks)
+
+    def get_pressed(self) -> KeyState:
+        if self.finished:
+            return _UNPACKED[0]
+        byte = self.ticks[self.tick]
+        self.tick += 1
+        return _UNPACKED[byte]
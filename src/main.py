@@ -1,54 +1,101 @@
 # main.py
-import pygame
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, TITLE
+import time
+
+# Inicio del proceso, antes de cualquier otro import (ver --startup-report)
+_START = time.perf_counter()
+_START_WALL = time.time()
 
-# Intentamos importar también GameOverState si existe
-try:
-    from game_states import GameState, MainMenuState, GameOverState
-except ImportError:
-    from game_states import GameState, MainMenuState
-    GameOverState = None
+import argparse
+import json
+import random
 
-from tutorial_state import TutorialState
+import pygame
+from settings import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    FPS,
+    TITLE,
+    PRESENT_MODE,
+    SIM_RATE,
+    MAX_FRAME_TIME,
+)
+
+# Solo los menús: GameState (entidades, obstáculos, atlas, máscaras...) se
+# importa cuando hace falta, con el menú ya en pantalla (ver load_game_state)
+from menu_states import MainMenuState, GameOverState, LoadingState
+from fonts import discover_fonts
+from presentation import Presenter, PRESENT_MODES
+from input_sources import RecordingInput, ReplayInput
+from preloader import AssetPreloader
+from profiling import StartupTimer
+from utils import disk_cache
 
 # Paso del volumen al pulsar ↑/↓
 VOLUME_STEP = 0.05   # 5% cada vez
 
 
-class SimpleGameOverState:
-    """
-    Estado de GAME OVER de respaldo por si no existe GameOverState en game_states.py.
-    Pulsa ENTER/ESPACIO para jugar de nuevo, ESC para salir.
-    """
-    def __init__(self):
-        self.font = pygame.font.SysFont(None, 72)
-        self.small_font = pygame.font.SysFont(None, 36)
-
-    def handle_event(self, event):
-        if event.type == pygame.KEYDOWN:
-            if event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                return "play"
-            elif event.key == pygame.K_ESCAPE:
-                return "quit"
-        return None
-
-    def update(self, dt: float):
-        pass
+def load_game_state():
+    """Import tardío de GameState: no hace falta para el primer frame del menú."""
+    from game_states import GameState
+    return GameState
 
-    def draw(self, screen):
-        screen.fill((0, 0, 0))
-        txt = self.font.render("GAME OVER", True, (255, 0, 0))
-        sub = self.small_font.render(
-            "ENTER para jugar, ESC para salir", True, (255, 255, 255)
-        )
-        rect = txt.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 40))
-        rect2 = sub.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40))
-        screen.blit(txt, rect)
-        screen.blit(sub, rect2)
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument(
+        "--present",
+        choices=PRESENT_MODES,
+        default=PRESENT_MODE,
+        help="flip: pantalla completa cada frame; dirty: solo los rectángulos cambiados",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="semilla del mundo (misma semilla + mismas teclas = misma partida)",
+    )
+    parser.add_argument(
+        "--sim-rate",
+        type=int,
+        default=SIM_RATE,
+        help="ticks de simulación por segundo (paso fijo)",
+    )
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=FPS,
+        help="límite de frames dibujados por segundo (independiente de la simulación)",
+    )
+    replay_group = parser.add_mutually_exclusive_group()
+    replay_group.add_argument(
+        "--record", metavar="FICHERO", help="graba las teclas de la partida en FICHERO"
+    )
+    replay_group.add_argument(
+        "--replay", metavar="FICHERO", help="reproduce una partida grabada con --record"
+    )
+    parser.add_argument(
+        "--startup-report",
+        metavar="FICHERO",
+        default=None,
+        help="escribe en FICHERO (JSON) el tiempo hasta el primer frame por fases y sale",
+    )
+    parser.add_argument(
+        "--no-disk-cache",
+        action="store_true",
+        help="no leer ni escribir la caché de sprites en disco (arranque en frío)",
+    )
+    return parser.parse_args(argv)
 
-def main():
+
+def main(argv=None):
+    # Tiempo hasta el primer frame, por fases (la primera: los imports del módulo)
+    startup = StartupTimer(_START)
+    startup.mark("imports")
+
+    args = parse_args(argv)
+    disk_cache.enabled = not args.no_disk_cache
     pygame.init()
+    startup.mark("pygame.init")
 
     # ----- AUDIO DE FONDO -----
     try:
@@ -58,26 +105,99 @@ def main():
         pygame.mixer.music.play(-1)         # -1 = bucle infinito
     except Exception as e:
         print(f"[WARN] No se pudo iniciar la música de fondo: {e}")
+    startup.mark("mixer")
 
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption(TITLE)
     clock = pygame.time.Clock()
+    presenter = Presenter(args.present)
+    print(f"[INFO] Modo de presentación: {args.present}")
+    startup.mark("display")
+
+    discover_fonts()
+    startup.mark("fonts")
+
+    # ----- GRABACIÓN / REPLAY DE ENTRADA -----
+    recorder = None
+    replay = None
+    game_seed = args.seed
+    sim_rate = args.sim_rate
+    if args.replay:
+        replay = ReplayInput.load(args.replay)
+        game_seed = replay.seed
+        # El replay se simula a la misma frecuencia con la que se grabó
+        sim_rate = replay.tick_rate
+        print(f"[INFO] Reproduciendo {args.replay}: {len(replay.ticks)} ticks, semilla {game_seed}")
+    elif args.record:
+        recorder = RecordingInput()
+        if game_seed is None:
+            game_seed = random.randrange(2**32)
+    input_source = replay if replay is not None else recorder
 
-    # Estado inicial: MENÚ PRINCIPAL
-    current_mode = "menu"        # "menu", "game", "tutorial", "gameover"
-    state = MainMenuState()
+    def new_game():
+        GameState = load_game_state()
+        return GameState(input_source=input_source, seed=game_seed, dt=1.0 / sim_rate)
 
     # Vidas del jugador (se muestran con las bellotas de HUD)
     lives = 3
 
+    # ----- PRECARGA DE ASSETS -----
+    # Mientras se ve el menú, un hilo decodifica y escala los assets de la
+    # partida: al pulsar "Jugar" solo queda crear el estado (todo en caché).
+    # Se crea tras el primer frame (o al pulsar "Jugar"), junto con el import
+    # de game_states.
+    preloader = None
+
+    def start_preload():
+        nonlocal preloader
+        if preloader is None:
+            preloader = AssetPreloader(load_game_state().preload_tasks())
+        return preloader.start()
+
+    def play():
+        """Estado y modo al empezar partida: el juego, o la pantalla de carga si aún no está."""
+        start_preload()
+        if not preloader.done:
+            return LoadingState(preloader), "loading"
+        game = new_game()
+        # pasamos el número de vidas al HUD del GameState
+        if hasattr(game, "lives"):
+            game.lives = lives
+        return game, "game"
+
+    # Estado inicial: MENÚ PRINCIPAL (o directamente el juego si es un replay)
+    if replay is not None:
+        current_mode = "game"
+        state = new_game()
+        state.lives = lives
+    else:
+        current_mode = "menu"        # "menu", "loading", "game", "tutorial", "gameover"
+        state = MainMenuState()
+    startup.mark("assets")
+    first_frame = True
+
+    # ----- PASO FIJO -----
+    # La simulación avanza siempre en ticks de sim_dt; el tiempo real de cada
+    # frame se acumula y se consume en ticks. Un frame lento cuesta ticks de
+    # recuperación (hasta MAX_FRAME_TIME), no una física distinta.
+    sim_dt = 1.0 / sim_rate
+    accumulator = 0.0
+    print(f"[INFO] Simulación a {sim_rate} ticks/s, dibujado hasta {args.fps} FPS")
+
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000.0  # Delta time en segundos
+        frame_time = clock.tick(args.fps) / 1000.0  # Tiempo real del frame en segundos
+        accumulator += min(frame_time, MAX_FRAME_TIME)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
 
+            # Si la ventana se ha tapado/restaurado, los menús deben presentarse de nuevo
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                if hasattr(state, "invalidate"):
+                    state.invalidate()
+
             # ----- CONTROLES GLOBALES DE VOLUMEN -----
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_UP:
@@ -105,12 +225,10 @@ def main():
                 action = state.handle_event(event)
                 if action == "play":
                     lives = 3  # empezamos siempre con 3 vidas nuevas
-                    state = GameState()
-                    # pasamos el número de vidas al HUD del GameState
-                    if hasattr(state, "lives"):
-                        state.lives = lives
-                    current_mode = "game"
+                    state, current_mode = play()
                 elif action == "tutorial":
+                    # Import tardío: el tutorial no hace falta para el primer frame
+                    from tutorial_state import TutorialState
                     state = TutorialState()
                     current_mode = "tutorial"
                 elif action == "quit":
@@ -132,40 +250,76 @@ def main():
                 action = state.handle_event(event)
                 if action == "play":
                     lives = 3
-                    state = GameState()
-                    if hasattr(state, "lives"):
-                        state.lives = lives
-                    current_mode = "game"
+                    state, current_mode = play()
                 elif action == "quit":
                     running = False
 
-        # Actualizar lógica del estado actual
-        state.update(dt)
-
-        # 🔁 ¿Ha pedido reinicio el estado de juego?
-        if current_mode == "game" and getattr(state, "restart_requested", False):
-            # Limpiamos el flag de reinicio en el estado actual
-            state.restart_requested = False
-            # Restamos una vida
-            lives -= 1
-            print(f"[DEBUG] Vida perdida. Vidas restantes: {lives}")
-
-            if lives > 0:
-                # Reiniciar nivel con las vidas restantes
-                state = GameState()
-                if hasattr(state, "lives"):
-                    state.lives = lives
-            else:
-                # Sin vidas -> pasamos a GAME OVER
-                current_mode = "gameover"
-                if GameOverState is not None:
-                    state = GameOverState()
+        # ------- CARGA -------
+        if current_mode == "loading" and preloader.done:
+            print(f"[INFO] Precarga terminada en {preloader.elapsed:.2f}s")
+            state, current_mode = play()
+
+        # Actualizar lógica del estado actual (los ticks que toquen)
+        while running and accumulator >= sim_dt:
+            accumulator -= sim_dt
+            state.update(sim_dt)
+
+            # 🔁 ¿Ha pedido reinicio el estado de juego?
+            if current_mode == "game" and getattr(state, "restart_requested", False):
+                # Limpiamos el flag de reinicio en el estado actual
+                state.restart_requested = False
+                # Restamos una vida
+                lives -= 1
+                print(f"[DEBUG] Vida perdida. Vidas restantes: {lives}")
+
+                if lives > 0:
+                    # Reiniciar nivel con las vidas restantes
+                    state = new_game()
+                    if hasattr(state, "lives"):
+                        state.lives = lives
                 else:
-                    state = SimpleGameOverState()
+                    # Sin vidas -> pasamos a GAME OVER
+                    current_mode = "gameover"
+                    state = GameOverState()
+
+            # El replay termina al acabarse la grabación o al llegar a GAME OVER
+            if replay is not None and (replay.finished or current_mode == "gameover"):
+                running = False
+
+        # Dibujar, interpolando entre los dos últimos ticks si el estado lo admite
+        if hasattr(state, "render_alpha"):
+            state.render_alpha = accumulator / sim_dt
+
+        # draw() devuelve None (pantalla completa), [] (nada ha cambiado)
+        # o la lista de rectángulos cambiados.
+        dirty = state.draw(screen)
+        presenter.present(dirty)
+
+        if first_frame:
+            first_frame = False
+            startup.mark("first frame")
+            print(f"[PERF] Primer frame a los {startup.total * 1000:.0f} ms")
+            if args.startup_report:
+                report = startup.summary()
+                report["start_wall"] = _START_WALL
+                report["first_frame_wall"] = time.time()
+                report["disk_cache"] = disk_cache.stats()
+                with open(args.startup_report, "w") as f:
+                    json.dump(report, f, indent=2)
+                running = False
+            elif current_mode == "menu":
+                # Con el menú ya en pantalla, el resto de assets se cargan en segundo plano
+                start_preload()
+                print("[INFO] Precargando assets de la partida en segundo plano")
+
+    presenter.summary()
+
+    # Si se sale durante la precarga, que el hilo no siga usando pygame tras quit()
+    if preloader is not None:
+        preloader.cancel()
 
-        # Dibujar
-        state.draw(screen)
-        pygame.display.flip()
+    if recorder is not None:
+        recorder.save(args.record, game_seed, sim_rate)
 
     # Parar música y cerrar
     try:
@@ -0,0 +1,373 @@
+# menu_states.py
+import pygame
+
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from utils import load_image
+from fonts import get_font, render_text
+
+
+class LoadingState:
+    """
+    Pantalla de carga con barra de progreso, mientras termina la precarga de
+    assets (solo se ve si se pulsa "Jugar" antes de que acabe).
+    draw() devuelve solo la zona de la barra cuando cambia el progreso.
+    """
+
+    BAR_SIZE = (500, 24)
+
+    def __init__(self, preloader):
+        self.preloader = preloader
+        self.font_spec = (None, 48)
+        self.bar_rect = pygame.Rect((0, 0), self.BAR_SIZE)
+        self.bar_rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 40)
+        self._drawn_progress = None
+
+    def invalidate(self):
+        self._drawn_progress = None
+
+    def handle_event(self, event):
+        return None
+
+    def update(self, dt: float):
+        pass
+
+    def draw(self, screen):
+        progress = self.preloader.progress
+        if progress == self._drawn_progress:
+            return []
+
+        full = self._drawn_progress is None
+        self._drawn_progress = progress
+        if full:
+            screen.fill((10, 20, 40))
+            txt = render_text(self.font_spec, "Cargando...", (255, 255, 255))
+            screen.blit(txt, txt.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 30)))
+
+        pygame.draw.rect(screen, (40, 50, 70), self.bar_rect)
+        filled = self.bar_rect.copy()
+        filled.width = int(self.bar_rect.width * progress)
+        pygame.draw.rect(screen, (255, 255, 120), filled)
+        pygame.draw.rect(screen, (230, 230, 230), self.bar_rect, 2)
+        return None if full else [self.bar_rect]
+
+
+class RetainedMenuState:
+    """
+    Base para pantallas de menú en modo retenido.
+
+    - La parte fija (fondo, logo/título...) se compone una vez en `_build_background`.
+    - El frame completo se recompone solo cuando cambia `selected`.
+    - draw() devuelve [] cuando no hay nada nuevo que presentar, la lista de
+      rectángulos cambiados (botón anterior y nuevo) al mover la selección,
+      o None cuando hay que presentar la pantalla entera.
+    """
+
+    def _init_retained(self):
+        self._background_layer = None
+        self._frame = None
+        self._frame_selected = None
+        self._needs_full_present = True
+        self._dirty_rects = []
+
+        # Resplandor del botón seleccionado (uno por botón, creado una vez)
+        for btn in self.buttons:
+            glow_rect = btn["rect"].inflate(40, 20)
+            glow_surf = pygame.Surface(glow_rect.size, pygame.SRCALPHA)
+            pygame.draw.rect(
+                glow_surf,
+                (255, 255, 180, 100),
+                glow_surf.get_rect(),
+                border_radius=25
+            )
+            btn["glow"] = glow_surf
+            btn["glow_rect"] = glow_rect
+
+    def invalidate(self):
+        """Fuerza a presentar de nuevo el frame (p. ej. si la ventana se ha tapado)."""
+        self._needs_full_present = True
+
+    def _selection_rect(self, index: int) -> pygame.Rect:
+        """Zona que cambia al (de)seleccionar un botón: resplandor + selector bellota."""
+        btn = self.buttons[index]
+        selector_rect = self.selector_image.get_rect(
+            midright=(btn["rect"].left - self.selector_offset_x, btn["rect"].centery)
+        )
+        return btn["glow_rect"].union(selector_rect)
+
+    def _build_background(self, layer: pygame.Surface):
+        """Fondo fijo de la pantalla; por defecto, negro (las subclases lo sustituyen)."""
+        layer.fill((0, 0, 0))
+
+    def _render_frame(self):
+        if self._background_layer is None:
+            self._background_layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+            self._build_background(self._background_layer)
+            self._frame = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+
+        self._frame.blit(self._background_layer, (0, 0))
+
+        for i, btn in enumerate(self.buttons):
+            img = btn["image"]
+            rect = btn["rect"]
+
+            if i == self.selected:
+                self._frame.blit(btn["glow"], btn["glow_rect"])
+
+            self._frame.blit(img, rect)
+
+            if i == self.selected:
+                selector_rect = self.selector_image.get_rect(
+                    midright=(rect.left - self.selector_offset_x, rect.centery)
+                )
+                self._frame.blit(self.selector_image, selector_rect)
+
+        self._frame_selected = self.selected
+
+    def draw(self, screen):
+        if self._frame_selected != self.selected:
+            previous = self._frame_selected
+            self._render_frame()
+            if previous is not None:
+                self._dirty_rects = [
+                    self._selection_rect(previous),
+                    self._selection_rect(self.selected),
+                ]
+
+        if self._needs_full_present:
+            screen.blit(self._frame, (0, 0))
+            self._needs_full_present = False
+            self._dirty_rects = []
+            return None
+
+        if not self._dirty_rects:
+            return []
+
+        rects = self._dirty_rects
+        self._dirty_rects = []
+        for r in rects:
+            screen.blit(self._frame, r, r)
+        return rects
+
+
+class MainMenuState(RetainedMenuState):
+    """
+    Pantalla de inicio:
+    - Jugar
+    - Tutorial
+    - Salir
+    """
+
+    def __init__(self):
+        self.options = ["Jugar", "Tutorial", "Salir"]
+        self.selected = 0
+
+        self.font_opt = get_font(None, 48)
+        self.text_color = (230, 230, 230)
+        self.text_selected_color = (255, 255, 120)
+
+        # Fondo
+        try:
+            self.bg_image = load_image(
+                "assets/sprites/menu/menu.png", size=(SCREEN_WIDTH, SCREEN_HEIGHT)
+            )
+        except Exception:
+            self.bg_image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.bg_image.fill((10, 20, 40))
+
+        # Logo
+        try:
+            LOGO_SCALE = 0.4
+            self.logo_image = load_image(
+                "assets/sprites/menu/logo.png", scale=LOGO_SCALE, smooth=True
+            )
+        except Exception:
+            self.logo_image = pygame.Surface((400, 120), pygame.SRCALPHA)
+            self.logo_image.fill((0, 0, 0, 0))
+            txt = render_text((None, 96), "Nutty Lucky", (255, 255, 255))
+            rect = txt.get_rect(center=self.logo_image.get_rect().center)
+            self.logo_image.blit(txt, rect)
+
+        self.logo_rect = self.logo_image.get_rect(
+            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3.5)
+        )
+
+        # Botones
+        button_paths = [
+            "assets/sprites/menu/play.png",
+            "assets/sprites/menu/tutorial.png",
+            "assets/sprites/menu/salir.png",
+        ]
+
+        self.buttons = []
+        start_y = int(SCREEN_HEIGHT * 0.63)
+        spacing = 80
+        BUTTON_SCALE = 0.2
+
+        for i, path in enumerate(button_paths):
+            try:
+                img = load_image(path, scale=BUTTON_SCALE, smooth=True)
+            except Exception:
+                img = pygame.Surface((200, 60), pygame.SRCALPHA)
+                img.fill((50, 50, 50, 200))
+                w, h = img.get_size()
+                img = pygame.transform.smoothscale(
+                    img,
+                    (int(w * BUTTON_SCALE), int(h * BUTTON_SCALE))
+                )
+            rect = img.get_rect(
+                center=(SCREEN_WIDTH // 2, start_y + i * spacing)
+            )
+            self.buttons.append({"image": img, "rect": rect})
+
+        # Selector bellota
+        SELECTOR_SCALE = 0.1
+        try:
+            self.selector_image = load_image(
+                "assets/sprites/world/acorn.png", scale=SELECTOR_SCALE, smooth=True
+            )
+        except Exception:
+            selector_img = pygame.Surface((40, 40), pygame.SRCALPHA)
+            pygame.draw.circle(selector_img, (210, 180, 140), (20, 20), 20)
+            sw, sh = selector_img.get_size()
+            self.selector_image = pygame.transform.smoothscale(
+                selector_img,
+                (int(sw * SELECTOR_SCALE), int(sh * SELECTOR_SCALE))
+            )
+        self.selector_offset_x = 10
+
+        self._init_retained()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_UP, pygame.K_w):
+                self.selected = (self.selected - 1) % len(self.options)
+            elif event.key in (pygame.K_DOWN, pygame.K_s):
+                self.selected = (self.selected + 1) % len(self.options)
+            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                option = self.options[self.selected]
+                if option == "Jugar":
+                    return "play"
+                elif option == "Tutorial":
+                    return "tutorial"
+                elif option == "Salir":
+                    return "quit"
+        return None
+
+    def update(self, dt: float):
+        pass
+
+    def _build_background(self, layer):
+        layer.blit(self.bg_image, (0, 0))
+        layer.blit(self.logo_image, self.logo_rect)
+
+
+class GameOverState(RetainedMenuState):
+    """
+    Pantalla de GAME OVER:
+    - Jugar
+    - Salir
+    Usa el sprite gameover.png como título.
+    """
+
+    def __init__(self):
+        self.options = ["Jugar", "Salir"]
+        self.selected = 0
+
+        self.font_opt = get_font(None, 48)
+        self.text_color = (230, 230, 230)
+        self.text_selected_color = (255, 255, 120)
+
+        # Fondo (reutilizamos el del menú principal)
+        try:
+            self.bg_image = load_image(
+                "assets/sprites/menu/menu.png", size=(SCREEN_WIDTH, SCREEN_HEIGHT)
+            )
+        except Exception:
+            self.bg_image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.bg_image.fill((20, 0, 0))
+
+        # Título GAMEOVER usando el sprite
+        try:
+            # Escalamos un poco para que encaje en pantalla
+            self.gameover_img = load_image(
+                "assets/sprites/menu/gameover.png", scale=0.4, smooth=True
+            )
+        except Exception:
+            self.gameover_img = render_text((None, 96), "GAME OVER", (255, 255, 255))
+
+        self.gameover_rect = self.gameover_img.get_rect(
+            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3.5)
+        )
+
+        # Botones: JUGAR y SALIR, reutilizando los sprites del menú
+        button_paths = [
+            "assets/sprites/menu/play.png",
+            "assets/sprites/menu/salir.png",
+        ]
+
+        self.buttons = []
+        start_y = int(SCREEN_HEIGHT * 0.6)
+        spacing = 80
+        BUTTON_SCALE = 0.2
+
+        for i, path in enumerate(button_paths):
+            try:
+                img = load_image(path, scale=BUTTON_SCALE, smooth=True)
+            except Exception:
+                img = pygame.Surface((200, 60), pygame.SRCALPHA)
+                img.fill((50, 50, 50, 200))
+                w, h = img.get_size()
+                img = pygame.transform.smoothscale(
+                    img,
+                    (int(w * BUTTON_SCALE), int(h * BUTTON_SCALE))
+                )
+            rect = img.get_rect(
+                center=(SCREEN_WIDTH // 2, start_y + i * spacing)
+            )
+            self.buttons.append({"image": img, "rect": rect})
+
+        # Selector bellota
+        SELECTOR_SCALE = 0.1
+        try:
+            self.selector_image = load_image(
+                "assets/sprites/world/acorn.png", scale=SELECTOR_SCALE, smooth=True
+            )
+        except Exception:
+            selector_img = pygame.Surface((40, 40), pygame.SRCALPHA)
+            pygame.draw.circle(selector_img, (210, 180, 140), (20, 20), 20)
+            sw, sh = selector_img.get_size()
+            self.selector_image = pygame.transform.smoothscale(
+                selector_img,
+                (int(sw * SELECTOR_SCALE), int(sh * SELECTOR_SCALE))
+            )
+        self.selector_offset_x = 10
+
+        self._init_retained()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_UP, pygame.K_w):
+                self.selected = (self.selected - 1) % len(self.options)
+            elif event.key in (pygame.K_DOWN, pygame.K_s):
+                self.selected = (self.selected + 1) % len(self.options)
+            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                option = self.options[self.selected]
+                if option == "Jugar":
+                    return "play"
+                elif option == "Salir":
+                    return "quit"
+        return None
+
+    def update(self, dt: float):
+        pass
+
+    def _build_background(self, layer):
+        layer.blit(self.bg_image, (0, 0))
+
+        # Pequeño overlay oscuro para dramatismo
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 140))
+        layer.blit(overlay, (0, 0))
+
+        # Título GAMEOVER
+        layer.blit(self.gameover_img, self.gameover_rect)
@@ -0,0 +1,375 @@
+# obstacles.py
+import heapq
+
+import numpy as np
+import pygame
+
+
+class ObstacleArrays:
+    """
+    Pool de obstáculos de un mismo tipo (árboles, bellotas, fantasmas) guardado
+    como estructura de arrays (SoA) de NumPy en lugar de una lista de dicts con Rects.
+
+    Capacidad fija por plano: al crearlo se reservan `capacity[plane]` filas para
+    cada plano (el plano de una fila no cambia nunca). `spawn` activa la fila libre
+    más baja del plano y rellena sus campos; `despawn` solo la marca como libre.
+    Si el plano está lleno, `spawn` devuelve None y cuenta un desbordamiento
+    (ver `stats()`). Nada se crea ni se borra durante la partida.
+
+    Columnas (una fila por hueco del pool):
+    - active: si la fila está en uso (las inactivas no se ven ni chocan).
+    - x, y, w, h: rectángulo en pantalla (enteros, igual que pygame.Rect).
+    - kind, plane: tipo de sprite y plano.
+    - hit_w, hit_h: hitbox centrada abajo del rectángulo (p. ej. el tronco);
+      hit_dx, hit_dy: su desplazamiento respecto a (x, y), calculado al colocar.
+    - base_y, phase: centro y fase del vaivén vertical.
+    - chunk: chunk del mundo que lo generó (-1 si ninguno), para `despawn_chunk`.
+
+    Todos los obstáculos de un plano avanzan lo mismo por tick (`speed` es
+    común a todo el tipo), así que scroll, reciclaje, vaivén y colisión AABB son
+    una operación vectorizada cada una.
+
+    Broadphase: por plano, un índice ordenado por x "de mundo"
+    (x + lo que ha avanzado el scroll de ese plano). Como el scroll mueve a
+    todos por igual, el orden no cambia al avanzar: el índice solo se toca al
+    colocar un obstáculo (los planos tocados se reordenan de una vez en la
+    siguiente consulta). Las consultas (colisión, visibles) buscan con
+    searchsorted la ventana de x que les interesa y solo miran esos candidatos.
+    """
+
+    def __init__(self, capacity=16, speed: float = 1.0, planes: int = 3):
+        # `capacity`: filas por plano (un int para todos, o un dict plane -> filas)
+        if isinstance(capacity, dict):
+            self.capacity = [capacity.get(p, 0) for p in range(planes)]
+        else:
+            self.capacity = [capacity] * planes
+        self.size = sum(self.capacity)
+        self.speed = speed
+        self._allocate(self.size)
+
+        # Bloque de filas de cada plano y sus huecos libres (heap: se usa el más bajo)
+        self._start = []
+        self._free = []
+        start = 0
+        for plane, n in enumerate(self.capacity):
+            self.plane[start:start + n] = plane
+            self._start.append(start)
+            self._free.append(list(range(start, start + n)))
+            start += n
+
+        # Estadísticas del pool por plano
+        self.active_count = [0] * planes
+        self.peak = [0] * planes
+        self.overflows = [0] * planes
+
+        # Broadphase por plano
+        self.scroll_x = np.zeros(planes, dtype=np.int64)  # avance acumulado
+        self._keys = [np.empty(0, dtype=np.int64) for _ in range(planes)]
+        self._order = [np.empty(0, dtype=np.intp) for _ in range(planes)]
+        self._rows = [np.empty(0, dtype=np.intp) for _ in range(planes)]
+        self._dirty = set()          # planos con filas colocadas sin reordenar
+        self._rows_dirty = set()     # planos con filas activadas/liberadas
+        # Cotas (solo crecen) para convertir consultas de hitbox/rect en ventanas de x
+        self._max_w = [0] * planes
+        self._max_reach = [0] * planes      # max(hit_dx + hit_w)
+        self._min_hit_dx = [0] * planes
+
+    def _allocate(self, size: int):
+        columns = {
+            "active": np.bool_,
+            "x": np.int64, "y": np.int64, "w": np.int64, "h": np.int64,
+            "kind": np.int8, "plane": np.int8,
+            "hit_w": np.int64, "hit_h": np.int64, "hit_dx": np.int64, "hit_dy": np.int64,
+            "base_y": np.float64, "phase": np.float64,
+            "chunk": np.int64,
+        }
+        for name, dtype in columns.items():
+            setattr(self, name, np.zeros(size, dtype=dtype))
+
+    def __len__(self):
+        """Obstáculos activos (no la capacidad)."""
+        return sum(self.active_count)
+
+    # ----------------- SPAWN / DESPAWN -----------------
+
+    def spawn(self, rect: pygame.Rect, plane: int = 0, kind: int = 0, hit_size=None,
+              base_y: float = 0.0, phase: float = 0.0, chunk: int = -1):
+        """
+        Activa un hueco libre de `plane` con estos datos y devuelve su índice,
+        o None si el plano está lleno (se cuenta en `overflows`).
+        """
+        free = self._free[plane]
+        if not free:
+            self.overflows[plane] += 1
+            return None
+        i = heapq.heappop(free)
+        self.active[i] = True
+        count = self.active_count[plane] = self.active_count[plane] + 1
+        if count > self.peak[plane]:
+            self.peak[plane] = count
+        self._rows_dirty.add(plane)
+        self.chunk[i] = chunk
+        self._write(i, rect, kind, hit_size, base_y, phase)
+        return i
+
+    def despawn(self, i: int):
+        """Libera la fila `i` (solo cambia el flag; sus datos se pisan al reutilizarla)."""
+        if not self.active[i]:
+            return
+        plane = int(self.plane[i])
+        self.active[i] = False
+        self.active_count[plane] -= 1
+        heapq.heappush(self._free[plane], i)
+        self._rows_dirty.add(plane)
+        self._dirty.add(plane)
+
+    def despawn_chunk(self, chunk: int) -> int:
+        """Libera las filas activas del chunk `chunk`. Devuelve cuántas."""
+        rows = np.flatnonzero(self.active & (self.chunk == chunk)).tolist()
+        for i in rows:
+            self.despawn(i)
+        return len(rows)
+
+    def _write(self, i, rect, kind, hit_size, base_y, phase):
+        self.x[i] = rect.x
+        self.y[i] = rect.y
+        self.w[i] = rect.width
+        self.h[i] = rect.height
+        self.kind[i] = kind
+        hit_w, hit_h = hit_size if hit_size is not None else rect.size
+        self.hit_w[i] = hit_w
+        self.hit_h[i] = hit_h
+        # Hitbox con el mismo midbottom que el rectángulo (como Rect.midbottom)
+        self.hit_dx[i] = rect.width // 2 - hit_w // 2
+        self.hit_dy[i] = rect.height - hit_h
+        self.base_y[i] = base_y
+        self.phase[i] = phase
+
+        plane = int(self.plane[i])
+        self._dirty.add(plane)
+        hit_dx = int(self.hit_dx[i])
+        self._max_w[plane] = max(self._max_w[plane], rect.width)
+        self._max_reach[plane] = max(self._max_reach[plane], hit_dx + hit_w)
+        self._min_hit_dx[plane] = min(self._min_hit_dx[plane], hit_dx)
+
+    def rect(self, i: int) -> pygame.Rect:
+        return pygame.Rect(int(self.x[i]), int(self.y[i]), int(self.w[i]), int(self.h[i]))
+
+    def stats(self) -> dict:
+        """Ocupación del pool por plano: activos, capacidad, pico y desbordamientos."""
+        return {
+            plane: {
+                "active": self.active_count[plane],
+                "capacity": capacity,
+                "peak": self.peak[plane],
+                "overflows": self.overflows[plane],
+            }
+            for plane, capacity in enumerate(self.capacity)
+            if capacity or self.overflows[plane]
+        }
+
+    # ----------------- BROADPHASE (índice ordenado por plano) -----------------
+
+    def _flush_index(self):
+        """Reordena el índice de los planos con filas añadidas/liberadas."""
+        for p in self._rows_dirty:
+            start = self._start[p]
+            active = self.active[start:start + self.capacity[p]]
+            self._rows[p] = start + np.flatnonzero(active)
+        self._rows_dirty.clear()
+        for p in self._dirty:
+            rows = self._rows[p]
+            keys = self.x[rows] + self.scroll_x[p]
+            # Casi ordenado (solo cambian unas pocas filas): argsort estable es barato
+            by_key = np.argsort(keys, kind="stable")
+            self._keys[p] = keys[by_key]
+            self._order[p] = rows[by_key]
+        self._dirty.clear()
+
+    def _candidates(self, plane: int, x_min: float, x_max: float) -> np.ndarray:
+        """Índices del plano con x (de pantalla) estrictamente entre x_min y x_max."""
+        if self._dirty:
+            self._flush_index()
+        keys = self._keys[plane]
+        offset = self.scroll_x[plane]
+        lo = np.searchsorted(keys, x_min + offset, side="right")
+        hi = np.searchsorted(keys, x_max + offset, side="left")
+        return self._order[plane][lo:hi]
+
+    # ----------------- KERNELS VECTORIZADOS -----------------
+
+    def scroll(self, dx_by_plane):
+        """
+        Desplaza todos los obstáculos a la izquierda. `dx_by_plane[plane]` es el
+        avance (float) de cada plano; se trunca como `int(dx * speed)`.
+        """
+        step = (np.asarray(dx_by_plane, dtype=np.float64) * self.speed).astype(np.int64)
+        self.scroll_x += step
+        self.x -= step[self.plane]
+
+    def offscreen_left(self) -> np.ndarray:
+        """Índices (ordenados) de los obstáculos activos que ya han salido por la izquierda."""
+        return np.flatnonzero((self.x + self.w < 0) & self.active)
+
+    def bob(self, dt: float, angular_speed: float, amplitude: float):
+        """Vaivén vertical: centery = int(base_y + sin(phase) * amplitude)."""
+        self.phase += angular_speed * dt
+        centery = (self.base_y + np.sin(self.phase) * amplitude).astype(np.int64)
+        self.y[:] = centery - self.h // 2
+
+    def collide(self, rect: pygame.Rect, plane: int) -> np.ndarray:
+        """
+        Índices (ordenados) de los obstáculos de `plane` cuya hitbox toca `rect`.
+        Mismo criterio que Rect.colliderect (bordes que solo se tocan no chocan;
+        una hitbox vacía no choca nunca). Solo se comprueban los candidatos
+        cercanos en x según el índice del plano.
+        """
+        if not len(self) or rect.width <= 0 or rect.height <= 0:
+            return np.empty(0, dtype=np.intp)
+        idx = self._candidates(
+            plane,
+            rect.x - self._max_reach[plane],
+            rect.right - self._min_hit_dx[plane],
+        )
+        if not len(idx):
+            return idx
+        hx = self.x[idx] + self.hit_dx[idx]
+        hy = self.y[idx] + self.hit_dy[idx]
+        hw = self.hit_w[idx]
+        hh = self.hit_h[idx]
+        hits = (
+            (hx < rect.right) & (hx + hw > rect.x) & (hw > 0)
+            & (hy < rect.bottom) & (hy + hh > rect.y) & (hh > 0)
+        )
+        return np.sort(idx[hits])
+
+    def collide_mask(self, rect: pygame.Rect, plane: int, mask, origin: tuple, masks) -> np.ndarray:
+        """
+        Como `collide`, pero con colisión píxel a píxel: `rect` es el prefiltro
+        (AABB contra las hitboxes) y solo los que pasan se comparan con
+        `Mask.overlap`. `mask` está colocada en `origin` (esquina superior
+        izquierda) y la de cada obstáculo, `masks[(kind, plane)][0]`, en su (x, y).
+        """
+        idx = self.collide(rect, plane)
+        if not len(idx):
+            return idx
+        ox, oy = origin
+        hits = [
+            i for i, kind, x, y in zip(
+                idx.tolist(), self.kind[idx].tolist(), self.x[idx].tolist(), self.y[idx].tolist()
+            )
+            if mask.overlap(masks[(kind, plane)][0], (x - ox, y - oy))
+        ]
+        return np.array(hits, dtype=np.intp)
+
+    def visible(self, plane, left: int, right: int) -> np.ndarray:
+        """
+        Índices (ordenados) de los obstáculos que se ven entre `left` y `right`
+        (en x), solo de `plane` o de todos los planos si `plane` es None.
+        """
+        planes = range(len(self._keys)) if plane is None else (plane,)
+        found = []
+        for p in planes:
+            idx = self._candidates(p, left - self._max_w[p], right)
+            found.append(idx[self.x[idx] + self.w[idx] > left])
+        result = found[0] if len(found) == 1 else np.concatenate(found)
+        return np.sort(result)
+
+
+class TileRow:
+    """
+    Fila de tiles que hacen scroll en bucle (suelo de un plano, cielo).
+    Las x van en un array; al salir un tile por la izquierda se coloca detrás
+    del que está más a la derecha (+ `gap`), todo vectorizado.
+    """
+
+    def __init__(self, xs, widths, y: int, gap: int = 0):
+        self.x = np.asarray(xs, dtype=np.int64)
+        self.w = np.asarray(widths, dtype=np.int64)
+        self.y = y
+        self.gap = gap
+
+    def __len__(self):
+        return len(self.x)
+
+    def scroll(self, dx: int):
+        self.x -= dx
+        out = self.x + self.w < 0
+        if not out.any():
+            return
+        # Los que salen se encadenan, en orden, detrás del tile más a la derecha
+        anchor = (self.x + self.w).max() + self.gap
+        step = self.w[out] + self.gap
+        self.x[out] = anchor + np.cumsum(step) - step
+
+
+def bake_ground_strip(tile: pygame.Surface, period: int, y: int, start_x: int = 0,
+                      view_width: int = 0, view_height: int = 0) -> tuple:
+    """
+    Compone el suelo de un plano en una tira sin costuras para `GroundStrip`.
+
+    El suelo son copias de `tile` cada `period` px (period < ancho del tile:
+    se solapan, y la de la derecha queda por encima). El patrón se compone
+    una vez en una tira de ancho múltiplo de `period` (y al menos
+    `view_width`), recortada a las filas que caben en pantalla y tienen algún
+    píxel visible. Como el patrón se repite justo en ese ancho, la tira
+    empalma consigo misma.
+
+    `start_x` es la x de pantalla de una de las copias al empezar.
+    Devuelve (tira, y de pantalla de su primera fila): no depende de la
+    partida, así que se puede guardar en las cachés de assets.
+    """
+    tile_w, tile_h = tile.get_size()
+    view_width = view_width or tile_w
+    top = max(y, 0)
+    bottom = min(y + tile_h, view_height) if view_height else y + tile_h
+    width = period * -(-view_width // period)
+    surface = pygame.Surface((width, max(bottom - top, 0)), pygame.SRCALPHA, tile)
+
+    # Copias de izquierda a derecha, empezando por las que asoman por la
+    # izquierda (son las que cubren el empalme del final de la tira)
+    x = start_x % period - (tile_w // period + 2) * period
+    while x < width:
+        surface.blit(tile, (x, y - top))
+        x += period
+
+    # Las filas del todo transparentes (cielo por encima del suelo) no se dibujan
+    bounds = surface.get_bounding_rect()
+    if bounds.height < surface.get_height():
+        surface = surface.subsurface((0, bounds.top, width, bounds.height)).copy()
+        top += bounds.top
+    return surface, top
+
+
+class GroundStrip:
+    """
+    Suelo de un plano que hace scroll en bucle, a partir de una tira ya
+    compuesta con `bake_ground_strip` (compartida entre partidas: cada
+    GroundStrip solo guarda su desplazamiento).
+
+    Cada frame son como mucho dos blits recortados (`area`) y cada píxel de
+    pantalla se pinta una sola vez.
+    """
+
+    def __init__(self, surface: pygame.Surface, y: int, view_width: int = 0):
+        self.surface = surface
+        self.y = y
+        self.width = surface.get_width()
+        self.view_width = view_width or self.width
+        # Desplazamiento de la tira: x de la tira que está en la x=0 de pantalla
+        self.offset = 0
+
+    def scroll(self, dx: int):
+        self.offset = (self.offset + dx) % self.width
+
+    def draw(self, screen: pygame.Surface, dx: int = 0):
+        """Dibuja el suelo desplazado `dx` px (interpolación) con uno o dos blits."""
+        height = self.surface.get_height()
+        start = (self.offset - dx) % self.width
+        first = min(self.width - start, self.view_width)
+        screen.blit(self.surface, (0, self.y), (start, 0, first, height))
+        if first < self.view_width:
+            screen.blit(self.surface, (first, self.y), (0, 0, self.view_width - first, height))
+
+    def nbytes(self) -> int:
+        return self.surface.get_pitch() * self.surface.get_height()
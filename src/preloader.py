@@ -0,0 +1,73 @@
+# preloader.py
+import threading
+import time
+
+
+class AssetPreloader:
+    """
+    Precarga assets en un hilo mientras se muestra el menú.
+
+    Recibe una lista de pasos (nombre, función) que calientan la caché de
+    assets (decodificar GIFs, escalar sprites, cargar sonidos...). Cuando el
+    jugador pulsa "Jugar", crear la partida ya solo encuentra aciertos de caché.
+
+    - `start()` lanza el hilo; `wait()` espera a que acabe (o lo hace todo en
+      el hilo actual si no se había lanzado).
+    - `progress` (0..1) y `current` sirven para una pantalla de carga.
+    - Un paso que falla no para la precarga: se apunta en `errors` y la
+      partida lo volverá a intentar al crearse (con sus propios fallbacks).
+    """
+
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        self.completed = 0
+        self.current = None      # nombre del paso en curso
+        self.errors = []         # (nombre, excepción)
+        self.elapsed = None      # segundos que tardó la precarga completa
+        self._done = threading.Event()
+        self._cancelled = False
+        self._thread = None
+
+    def start(self) -> "AssetPreloader":
+        if self._thread is None and not self._done.is_set():
+            self._thread = threading.Thread(target=self._run, name="asset-preloader", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        start = time.perf_counter()
+        for name, task in self.tasks:
+            if self._cancelled:
+                break
+            self.current = name
+            try:
+                task()
+            except Exception as e:
+                self.errors.append((name, e))
+                print(f"[WARN] Precarga '{name}' falló: {e}")
+            self.completed += 1
+        self.current = None
+        self.elapsed = time.perf_counter() - start
+        self._done.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def progress(self) -> float:
+        if not self.tasks:
+            return 1.0
+        return self.completed / len(self.tasks)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Espera a que termine la precarga. Devuelve True si ya ha terminado."""
+        if self._thread is None and not self._done.is_set():
+            self._run()
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        """Salta los pasos que falten y espera a que acabe el que esté en curso."""
+        self._cancelled = True
+        if self._thread is not None:
+            self._thread.join()
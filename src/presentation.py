@@ -0,0 +1,84 @@
+# presentation.py
+import pygame
+
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+PRESENT_FLIP = "flip"    # siempre la pantalla completa
+PRESENT_DIRTY = "dirty"  # solo los rectángulos que ha cambiado el estado
+PRESENT_MODES = (PRESENT_FLIP, PRESENT_DIRTY)
+
+
+class Presenter:
+    """
+    Presenta en pantalla lo que ha dibujado el estado actual.
+
+    El estado devuelve desde draw():
+    - None  -> ha cambiado toda la pantalla (flip completo).
+    - []    -> no ha cambiado nada (no se presenta).
+    - [Rect, ...] -> solo esas zonas han cambiado.
+
+    En modo "dirty" se llama a pygame.display.update(rects); en modo "flip"
+    cualquier cambio presenta la pantalla entera. En ambos modos se mide la
+    fracción de pantalla redibujada por frame y se informa cada `report_every` frames.
+    """
+
+    def __init__(self, mode: str = PRESENT_FLIP, report_every: int = 600):
+        if mode not in PRESENT_MODES:
+            raise ValueError(f"Modo de presentación desconocido: {mode}")
+        self.mode = mode
+        self.report_every = report_every
+        self.screen_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.screen_area = SCREEN_WIDTH * SCREEN_HEIGHT
+
+        # Estadísticas (desde el último informe y totales)
+        self.frames = 0
+        self.fraction_sum = 0.0
+        self.total_frames = 0
+        self.total_fraction_sum = 0.0
+
+    def _redrawn_fraction(self, rects) -> float:
+        """Fracción (aprox.) de la pantalla cubierta por `rects`; los solapes cuentan doble."""
+        area = 0
+        for r in rects:
+            clipped = self.screen_rect.clip(r)
+            area += clipped.width * clipped.height
+        return min(1.0, area / self.screen_area)
+
+    def present(self, dirty):
+        if dirty is None:
+            pygame.display.flip()
+            fraction = 1.0
+        elif not dirty:
+            fraction = 0.0
+        elif self.mode == PRESENT_DIRTY:
+            pygame.display.update(dirty)
+            fraction = self._redrawn_fraction(dirty)
+        else:
+            pygame.display.flip()
+            fraction = 1.0
+
+        self.frames += 1
+        self.fraction_sum += fraction
+        if self.report_every and self.frames >= self.report_every:
+            self.report()
+
+    def report(self):
+        if self.frames:
+            mean = self.fraction_sum / self.frames
+            print(
+                f"[PERF] Presentación '{self.mode}': {mean * 100:.1f}% de pantalla "
+                f"redibujada por frame (últimos {self.frames} frames)"
+            )
+        self.total_frames += self.frames
+        self.total_fraction_sum += self.fraction_sum
+        self.frames = 0
+        self.fraction_sum = 0.0
+
+    def summary(self):
+        self.report()
+        if self.total_frames:
+            mean = self.total_fraction_sum / self.total_frames
+            print(
+                f"[PERF] Total '{self.mode}': {mean * 100:.1f}% de pantalla "
+                f"redibujada por frame ({self.total_frames} frames)"
+            )
@@ -0,0 +1,111 @@
+# profiling.py
+import contextlib
+import time
+
+
+class _Phase:
+    """Context manager que mide una fase y guarda la muestra en el profiler."""
+
+    __slots__ = ("samples", "start")
+
+    def __init__(self, samples: list):
+        self.samples = samples
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.samples.append(time.perf_counter() - self.start)
+        return False
+
+
+class PhaseProfiler:
+    """
+    Profiler ligero por fases: `with profiler.phase("update.scroll"): ...`
+    guarda una muestra (segundos) por cada vez que se ejecuta la fase.
+    Las fases con el mismo nombre no deben anidarse.
+    """
+
+    def __init__(self):
+        self.samples = {}   # nombre -> [segundos, ...]
+        self._phases = {}   # nombre -> _Phase (reutilizado)
+
+    def phase(self, name: str) -> _Phase:
+        phase = self._phases.get(name)
+        if phase is None:
+            samples = self.samples.setdefault(name, [])
+            phase = self._phases[name] = _Phase(samples)
+        return phase
+
+    def record(self, name: str, seconds: float):
+        self.samples.setdefault(name, []).append(seconds)
+
+    def summary(self) -> dict:
+        """Estadísticas por fase en milisegundos: mean, p50, p95, p99, max."""
+        return {name: phase_stats(samples) for name, samples in sorted(self.samples.items())}
+
+
+class NullProfiler:
+    """Profiler desactivado (por defecto en GameState): no mide nada."""
+
+    _null = contextlib.nullcontext()
+
+    def phase(self, name: str):
+        return self._null
+
+    def record(self, name: str, seconds: float):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class StartupTimer:
+    """
+    Tiempo hasta el primer frame, por fases: cada `mark(nombre)` cierra la
+    fase que va desde la marca anterior (o desde `start`) hasta ahora.
+    """
+
+    def __init__(self, start: float = None):
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.phases = []    # [(nombre, segundos), ...] en orden
+
+    def mark(self, name: str) -> float:
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last))
+        self._last = now
+        return now - self.start
+
+    @property
+    def total(self) -> float:
+        return self._last - self.start
+
+    def summary(self) -> dict:
+        return {
+            "total_ms": round(self.total * 1000.0, 2),
+            "phases": {name: round(s * 1000.0, 2) for name, s in self.phases},
+        }
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def phase_stats(samples: list) -> dict:
+    values = sorted(s * 1000.0 for s in samples)
+    count = len(values)
+    return {
+        "count": count,
+        "mean_ms": round(sum(values) / count, 4) if count else 0.0,
+        "p50_ms": round(percentile(values, 50), 4),
+        "p95_ms": round(percentile(values, 95), 4),
+        "p99_ms": round(percentile(values, 99), 4),
+        "max_ms": round(values[-1], 4) if count else 0.0,
+    }
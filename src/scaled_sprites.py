@@ -0,0 +1,109 @@
+# scaled_sprites.py
+import bisect
+import math
+
+import pygame
+
+
+class ScaleLadder:
+    """
+    Escalera cuantizada de escalas entre `min_scale` y `max_scale`.
+
+    Los niveles siguen una progresión geométrica (como una cadena de mipmaps),
+    así el salto visual entre niveles es parecido a cualquier tamaño.
+    Las escalas de `anchors` (p. ej. la de cada plano) se añaden exactas para
+    que el estado estable nunca se vea cuantizado.
+
+    `steps` es el ajuste de calidad: más pasos = transición más suave
+    y algo más de memoria.
+    """
+
+    def __init__(self, min_scale: float, max_scale: float, steps: int, anchors=()):
+        levels = set(round(a, 4) for a in anchors)
+        levels.add(round(min_scale, 4))
+        levels.add(round(max_scale, 4))
+        if steps > 1:
+            ratio = (max_scale / min_scale) ** (1.0 / (steps - 1))
+            for i in range(steps):
+                levels.add(round(min_scale * ratio ** i, 4))
+
+        self.levels = sorted(levels)
+        self._log_levels = [math.log(level) for level in self.levels]
+
+    def __len__(self):
+        return len(self.levels)
+
+    def nearest(self, scale: float) -> int:
+        """Índice del nivel más cercano a `scale` (distancia en escala logarítmica)."""
+        if scale <= self.levels[0]:
+            return 0
+        if scale >= self.levels[-1]:
+            return len(self.levels) - 1
+
+        log_scale = math.log(scale)
+        i = bisect.bisect_left(self._log_levels, log_scale)
+        if log_scale - self._log_levels[i - 1] < self._log_levels[i] - log_scale:
+            return i - 1
+        return i
+
+
+class ScaledSprite:
+    """
+    Una Surface estática (p. ej. el resplandor del power-up) precalculada
+    en cada nivel de la escalera. Pedir una escala es solo una búsqueda.
+    """
+
+    def __init__(self, surface: pygame.Surface, ladder: ScaleLadder):
+        self.ladder = ladder
+        w, h = surface.get_size()
+        self.surfaces = []
+        for level in ladder.levels:
+            if level == 1.0:
+                self.surfaces.append(surface)
+            else:
+                size = (max(1, int(w * level)), max(1, int(h * level)))
+                self.surfaces.append(pygame.transform.scale(surface, size))
+
+    def get(self, scale: float) -> pygame.Surface:
+        return self.surfaces[self.ladder.nearest(scale)]
+
+    def nbytes(self) -> int:
+        return sum(s.get_pitch() * s.get_height() for s in self.surfaces)
+
+
+class ScaledFrameTarget:
+    """
+    Para frames animados (la ardilla): en lugar de guardar cada frame en cada
+    nivel, se reserva una Surface destino por nivel y el frame actual se escala
+    dentro de ella. Dibujar durante una transición cuesta lo mismo que en
+    estado estable: un escalado a un destino ya reservado, sin crear superficies.
+
+    Cada destino recuerda qué frame tiene dentro: si se pide el mismo frame
+    en el mismo nivel (lo normal entre dos cambios de frame de la animación),
+    no se vuelve a escalar. Los frames deben ser Surfaces que no cambian
+    (p. ej. las del banco de frames de la ardilla).
+    """
+
+    def __init__(self, base_size: tuple, ladder: ScaleLadder, template: pygame.Surface):
+        self.ladder = ladder
+        w, h = base_size
+        self.targets = []
+        for level in ladder.levels:
+            if level == 1.0:
+                self.targets.append(None)  # escala 1: se usa el frame tal cual
+            else:
+                size = (max(1, int(w * level)), max(1, int(h * level)))
+                self.targets.append(pygame.Surface(size, pygame.SRCALPHA, template))
+        # Frame escalado ahora mismo en cada destino (None = vacío)
+        self.contents = [None] * len(self.targets)
+
+    def render(self, frame: pygame.Surface, scale: float) -> pygame.Surface:
+        step = self.ladder.nearest(scale)
+        target = self.targets[step]
+        if target is None:
+            return frame
+        if self.contents[step] is not frame:
+            pygame.transform.scale(frame, target.get_size(), target)
+            target.set_alpha(frame.get_alpha())
+            self.contents[step] = frame
+        return target
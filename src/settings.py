@@ -4,6 +4,17 @@ SCREEN_HEIGHT = 800
 FPS = 60
 TITLE = "Nutty Lucky"
 
+# Simulación a paso fijo: ticks por segundo y tiempo máximo de un frame
+# que se recupera con ticks extra (evita la espiral de muerte si el juego se atasca)
+SIM_RATE = 60
+MAX_FRAME_TIME = 0.25
+
+# Presupuesto de arranque: tiempo máximo hasta el primer frame del menú (startup_benchmark.py)
+STARTUP_BUDGET_MS = 1500
+
+# Presentación por defecto: "flip" (pantalla completa) o "dirty" (rectángulos cambiados)
+PRESENT_MODE = "flip"
+
 # Planos
 PLANE_FOREGROUND = 0   # Primer plano, más cercano (oscuro, silueta)
 PLANE_MID = 1          # Plano normal
@@ -16,6 +27,32 @@ SPECIAL_JUMP_COOLDOWN = 0.4
 WORLD_WIDTH = 3000  # ANCHO DEL MUNDO
 GROUND_Y = 700      # Altura del suelo para colocar detalles
 
+# Mundo por chunks (world_chunks.py): tramos de CHUNK_WIDTH px del plano medio,
+# generados por delante de la cámara y repartidos entre ticks
+CHUNK_WIDTH = WORLD_WIDTH
+CHUNKS_AHEAD = 1          # chunks extra generados por delante de lo visible
+CHUNK_SPAWN_BUDGET = 4    # máximo de altas (árbol, bellota, fantasma) por tick
+
+# Caché de assets (límite de memoria para superficies ya escaladas)
+ASSET_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 256 MB
+
+# Atlas de sprites (atlas.py): tamaño máximo de cada página
+ATLAS_PAGE_SIZE = 2048
+
+# Máscaras de colisión (collision_masks.py): alpha mínimo de un píxel para que choque
+COLLISION_ALPHA_THRESHOLD = 127
+
+# Caché en disco (disk_cache.py): sprites ya decodificados y transformados,
+# en RGBA crudo, para no decodificar ni reescalar nada en los siguientes arranques
+DISK_CACHE_DIR = ".cache/sprites"
+
+# Caché de textos renderizados (HUD, tutorial, menús)
+TEXT_CACHE_MAX_BYTES = 16 * 1024 * 1024  # 16 MB
+
+# Calidad del escalado de la ardilla en transiciones de plano
+# (nº de niveles precalculados entre la escala de fondo y la de primer plano)
+SCALE_LADDER_STEPS = 16
+
 # powerup
 POWERUP_DURATION_MS = 10000  # 10 SEGUNDOS DE PODER
 
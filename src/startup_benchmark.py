@@ -0,0 +1,125 @@
+# startup_benchmark.py
+"""
+Benchmark de arranque: tiempo desde que se lanza el proceso hasta el primer
+frame del menú principal (time-to-first-frame).
+
+Lanza `main.py --startup-report` N veces (drivers dummy de SDL), junta el
+desglose por fases (python, imports, pygame.init, mixer, display, fonts,
+assets, first frame) y saca la mediana de cada una.
+
+Con `--cold` el juego arranca sin la caché de sprites en disco (como la
+primera vez): decodifica y reescala todo.
+
+Falla (código de salida 1) si la mediana supera el presupuesto
+(`--max-ms`, por defecto STARTUP_BUDGET_MS) o, con `--baseline`, si empeora
+más de `--tolerance` respecto a un resultado guardado antes.
+
+Uso (desde la raíz del repo):
+    python src/startup_benchmark.py --runs 5 --output startup.json
+    python src/startup_benchmark.py --baseline startup.json
+    python src/startup_benchmark.py --cold
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from settings import STARTUP_BUDGET_MS
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+def measure_startup(runs: int = 5, cold: bool = False) -> dict:
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    extra = ["--no-disk-cache"] if cold else []
+    samples = []
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = os.path.join(tmp, "startup.json")
+        for _ in range(runs):
+            spawn_wall = time.time()
+            subprocess.run(
+                [sys.executable, MAIN, "--startup-report", report_path] + extra,
+                env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            with open(report_path) as f:
+                report = json.load(f)
+            # Arranque del intérprete: desde lanzar el proceso hasta la primera línea de main.py
+            phases = {"python": (report["start_wall"] - spawn_wall) * 1000.0}
+            phases.update(report["phases"])
+            phases["total"] = (report["first_frame_wall"] - spawn_wall) * 1000.0
+            samples.append(phases)
+
+    names = list(samples[0])
+    return {
+        "runs": runs,
+        "cold": cold,
+        "median_ms": {n: round(statistics.median(s[n] for s in samples), 2) for n in names},
+        "max_ms": {n: round(max(s[n] for s in samples), 2) for n in names},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del tiempo hasta el primer frame")
+    parser.add_argument("--runs", type=int, default=5, help="arranques a medir")
+    parser.add_argument(
+        "--cold", action="store_true", help="arrancar sin la caché de sprites en disco"
+    )
+    parser.add_argument(
+        "--max-ms", type=float, default=STARTUP_BUDGET_MS,
+        help="presupuesto para la mediana del total (ms)",
+    )
+    parser.add_argument(
+        "--baseline", metavar="FICHERO", default=None,
+        help="JSON de una medición anterior con el que comparar",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="empeoramiento máximo respecto a --baseline (0.25 = 25%%)",
+    )
+    parser.add_argument("--output", metavar="FICHERO", default=None, help="escribir el JSON aquí")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    result = measure_startup(args.runs, args.cold)
+
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"[INFO] Benchmark de arranque guardado en {args.output}")
+    else:
+        print(text)
+
+    median = result["median_ms"]
+    breakdown = ", ".join(f"{n} {ms:.0f}" for n, ms in median.items() if n != "total")
+    print(f"[PERF] Primer frame: {median['total']:.0f} ms (mediana) -> {breakdown}", file=sys.stderr)
+
+    failed = False
+    if median["total"] > args.max_ms:
+        print(
+            f"[FAIL] {median['total']:.0f} ms supera el presupuesto de {args.max_ms:.0f} ms",
+            file=sys.stderr,
+        )
+        failed = True
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["median_ms"]["total"]
+        limit = baseline * (1.0 + args.tolerance)
+        if median["total"] > limit:
+            print(
+                f"[FAIL] {median['total']:.0f} ms frente a {baseline:.0f} ms de referencia "
+                f"(límite {limit:.0f} ms)",
+                file=sys.stderr,
+            )
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 import pygame
 
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT
-from utils import load_gif_frames, load_image
+from utils import load_gif_frames, load_image, asset_cache
+from fonts import get_font, render_text
 
 
 def round_corners(surface: pygame.Surface, radius: int) -> pygame.Surface:
@@ -40,8 +41,10 @@ class TutorialState:
 
     def __init__(self):
         # Fuentes
-        self.font_title = pygame.font.SysFont(None, 64)
-        self.font_body = pygame.font.SysFont(None, 28)
+        self.font_title_spec = (None, 64)
+        self.font_body_spec = (None, 28)
+        self.font_title = get_font(*self.font_title_spec)
+        self.font_body = get_font(*self.font_body_spec)
 
         # Colores base
         self.text_color = (230, 230, 230)
@@ -49,8 +52,9 @@ class TutorialState:
 
         # Fondo: usamos menu.png
         try:
-            bg = load_image("assets/sprites/menu/menu.png")
-            self.bg_image = pygame.transform.scale(bg, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.bg_image = load_image(
+                "assets/sprites/menu/menu.png", size=(SCREEN_WIDTH, SCREEN_HEIGHT)
+            )
         except Exception:
             self.bg_image = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
             self.bg_image.fill((15, 25, 60))
@@ -76,21 +80,15 @@ class TutorialState:
         self.gif_pages = []  # lista de listas de frames
 
         for path in gif_paths:
-            frames = load_gif_frames(path, size=self.GIF_TARGET_SIZE)
-
-            if not frames:
-                print(f"[WARN] No se pudo cargar GIF: {path}")
-                placeholder = pygame.Surface(self.GIF_TARGET_SIZE, pygame.SRCALPHA)
-                placeholder.fill((30, 30, 60, 255))
-                pygame.draw.circle(
-                    placeholder,
-                    (200, 180, 120),
-                    (self.GIF_TARGET_SIZE[0] // 2, self.GIF_TARGET_SIZE[1] // 2),
-                    min(self.GIF_TARGET_SIZE) // 3,
-                )
-                frames = [placeholder]
-
-            rounded_frames = [round_corners(f, self.GIF_CORNER_RADIUS) for f in frames]
+            # Los frames redondeados salen de la caché (memoria o disco) sin
+            # volver a cargar el GIF: solo se decodifica si no están
+            rounded_frames = asset_cache.get_or_create(
+                (path, self.GIF_TARGET_SIZE, ("rounded", self.GIF_CORNER_RADIUS)),
+                lambda: [
+                    round_corners(f, self.GIF_CORNER_RADIUS) for f in self._load_gif_page(path)
+                ],
+                sources=(path,),
+            )
             self.gif_pages.append(rounded_frames)
 
         # ---------- Páginas del tutorial ----------
@@ -164,6 +162,31 @@ class TutorialState:
         # Layout
         self._init_layout()
 
+        # Capa estática de la página actual
+        self.page_layer = None
+        self._needs_full_present = True
+        self._presented_gif_frame = None
+        self._enter_page()
+
+    # ----------------- CARGA DE GIFS -----------------
+
+    def _load_gif_page(self, path):
+        """Frames del GIF a GIF_TARGET_SIZE, o un marcador si no se puede cargar."""
+        frames = load_gif_frames(path, size=self.GIF_TARGET_SIZE)
+        if frames:
+            return frames
+
+        print(f"[WARN] No se pudo cargar GIF: {path}")
+        placeholder = pygame.Surface(self.GIF_TARGET_SIZE, pygame.SRCALPHA)
+        placeholder.fill((30, 30, 60, 255))
+        pygame.draw.circle(
+            placeholder,
+            (200, 180, 120),
+            (self.GIF_TARGET_SIZE[0] // 2, self.GIF_TARGET_SIZE[1] // 2),
+            min(self.GIF_TARGET_SIZE) // 3,
+        )
+        return [placeholder]
+
     # ----------------- LAYOUT -----------------
 
     def _init_layout(self):
@@ -194,11 +217,13 @@ class TutorialState:
                 if self.current_page > 0:
                     self.current_page -= 1
                     self._reset_gif_animation()
+                    self._enter_page()
 
             if event.key in (pygame.K_RIGHT, pygame.K_d):
                 if self.current_page < self.page_count - 1:
                     self.current_page += 1
                     self._reset_gif_animation()
+                    self._enter_page()
 
         return None
 
@@ -255,36 +280,32 @@ class TutorialState:
 
         screen.blit(card_surf, rect.topleft)
 
-    # ----------------- DRAW -----------------
+    # ----------------- CAPA ESTÁTICA POR PÁGINA -----------------
+
+    def _build_page_layer(self, page_index: int) -> pygame.Surface:
+        """
+        Compone una sola vez todo lo que no cambia en una página: fondo, capa
+        oscura, sombras, panel glass, título, texto e indicador de página.
+        En cada frame solo queda encima el frame actual del GIF.
+        """
+        layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
 
-    def draw(self, screen):
         # Fondo: menu.png
-        screen.blit(self.bg_image, (0, 0))
+        layer.blit(self.bg_image, (0, 0))
 
         # Capa oscura para mejorar legibilidad
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 100))
-        screen.blit(overlay, (0, 0))
-
-        # ---------- GIF con sombra abajo-derecha ----------
-        frames = self.gif_pages[self.current_page]
-        frame = frames[self.gif_frame_index] if frames else None
-
-        if frame is not None:
-            # El frame ya está escalado y con esquinas redondeadas
-            frame_rect = frame.get_rect(center=self.gif_rect.center)
+        layer.blit(overlay, (0, 0))
 
-            # Sombra del GIF (abajo-derecha)
-            self._draw_shadow(screen, frame_rect, radius=self.GIF_CORNER_RADIUS)
-
-            # GIF encima de su sombra
-            screen.blit(frame, frame_rect)
+        # Sombra del GIF (abajo-derecha); el GIF se dibuja encima en draw()
+        self._draw_shadow(layer, self.gif_rect, radius=self.GIF_CORNER_RADIUS)
 
         # ---------- Panel de texto (glass) con sombra abajo-derecha ----------
-        self._draw_shadow(screen, self.panel_rect, radius=20)
+        self._draw_shadow(layer, self.panel_rect, radius=20)
 
         self._draw_glass_card(
-            screen,
+            layer,
             self.panel_rect,
             bg_color=(255, 255, 255),
             border_color=(255, 255, 255),
@@ -293,29 +314,73 @@ class TutorialState:
         )
 
         # Contenido del panel
-        page = self.pages[self.current_page]
+        page = self.pages[page_index]
 
         # Título
-        title_surf = self.font_title.render(page["title"], True, self.highlight_color)
+        title_surf = render_text(self.font_title_spec, page["title"], self.highlight_color)
         title_rect = title_surf.get_rect(
             midtop=(self.panel_rect.centerx, self.panel_rect.top + 60)
         )
-        screen.blit(title_surf, title_rect)
+        layer.blit(title_surf, title_rect)
 
         # Texto
         y = title_rect.bottom + 24
         for line in page["lines"]:
-            line_surf = self.font_body.render(line, True, self.text_color)
+            line_surf = render_text(self.font_body_spec, line, self.text_color)
             line_rect = line_surf.get_rect(
                 topleft=(self.panel_rect.left +60, y)
             )
-            screen.blit(line_surf, line_rect)
+            layer.blit(line_surf, line_rect)
             y += 32
 
         # Indicador página (1/4, 2/4, etc.)
-        indicator = f"{self.current_page + 1} / {self.page_count}"
-        ind_surf = self.font_body.render(indicator, True, self.highlight_color)
+        indicator = f"{page_index + 1} / {self.page_count}"
+        ind_surf = render_text(self.font_body_spec, indicator, self.highlight_color)
         ind_rect = ind_surf.get_rect(
             bottomright=(self.panel_rect.right - 20, self.panel_rect.bottom - 12)
         )
-        screen.blit(ind_surf, ind_rect)
+        layer.blit(ind_surf, ind_rect)
+
+        return layer
+
+    def _enter_page(self):
+        """Al entrar en una página, toma su capa estática (compuesta una vez y cacheada)."""
+        page_index = self.current_page
+        self.page_layer = asset_cache.get_or_create(
+            ("tutorial_page", page_index, (SCREEN_WIDTH, SCREEN_HEIGHT)),
+            lambda: self._build_page_layer(page_index),
+        )
+        self._needs_full_present = True
+
+    def invalidate(self):
+        """Fuerza a presentar de nuevo la pantalla completa."""
+        self._needs_full_present = True
+
+    # ----------------- DRAW -----------------
+
+    def draw(self, screen):
+        """
+        Devuelve None si hay que presentar toda la pantalla (página nueva),
+        [gif_rect] si solo ha avanzado el GIF, o [] si no ha cambiado nada.
+        """
+        frames = self.gif_pages[self.current_page]
+
+        if self._needs_full_present:
+            # Capa estática de la página (fondo, panel, sombras y textos)
+            screen.blit(self.page_layer, (0, 0))
+            # GIF actual encima de su sombra
+            # (el frame ya está escalado y con esquinas redondeadas)
+            if frames:
+                screen.blit(frames[self.gif_frame_index], self.gif_rect)
+            self._needs_full_present = False
+            self._presented_gif_frame = self.gif_frame_index
+            return None
+
+        if not frames or self._presented_gif_frame == self.gif_frame_index:
+            return []
+
+        # Solo cambia el GIF: se repone el fondo de su zona y se dibuja el frame nuevo
+        screen.blit(self.page_layer, self.gif_rect, self.gif_rect)
+        screen.blit(frames[self.gif_frame_index], self.gif_rect)
+        self._presented_gif_frame = self.gif_frame_index
+        return [self.gif_rect]
@@ -1,17 +1,207 @@
 import pygame
 import os
-from PIL import Image  # importante para leer GIFs opcionalmente
+import sys
+import threading
+import time
+from collections import OrderedDict
 
+from settings import ASSET_CACHE_MAX_BYTES, DISK_CACHE_DIR
+from disk_cache import DiskSpriteCache
 
-def load_image(path, size=None):
+
+# ----------------- CACHÉ DE ASSETS -----------------
+
+def asset_nbytes(value) -> int:
+    """
+    Calcula (aprox.) los bytes que ocupa un asset cacheado:
+    una Surface, una lista/tupla/dict de Surfaces, o un objeto con `nbytes()`.
     """
-    Carga una imagen con transparencia (convert_alpha).
-    Si `size` se indica, reescala la imagen a ese tamaño (width, height).
+    if isinstance(value, pygame.Surface):
+        return value.get_pitch() * value.get_height()
+    if isinstance(value, pygame.mixer.Sound):
+        freq, fmt, channels = pygame.mixer.get_init() or (0, 0, 0)
+        return int(value.get_length() * freq) * channels * (abs(fmt) // 8)
+    nbytes = getattr(value, "nbytes", None)
+    if callable(nbytes):
+        return nbytes()
+    if isinstance(value, dict):
+        return sum(asset_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(asset_nbytes(v) for v in value)
+    return 0
+
+
+class AssetCache:
+    """
+    Caché LRU de assets compartida por todo el proceso.
+
+    - Clave: (ruta, tamaño objetivo, transformación).
+    - Limitada por bytes: al superar `max_bytes` se expulsan las entradas
+      usadas hace más tiempo.
+    - Cuenta aciertos (hits) y fallos (misses) para poder medirla.
+
+    Las superficies devueltas son COMPARTIDAS: quien las use no debe
+    modificarlas en sitio (hacer .copy() antes si hace falta).
+
+    Se puede usar desde varios hilos (p. ej. el preloader mientras se ve el
+    menú): si dos hilos piden a la vez la misma clave con `get_or_create`,
+    solo uno ejecuta la factory y el otro espera su resultado.
+
+    Con `sources` (rutas de los ficheros de los que sale el asset), un fallo
+    se busca antes en la caché en disco (`disk_cache`) y solo si tampoco
+    está allí se ejecuta la factory.
     """
-    image = pygame.image.load(path).convert_alpha()
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._lock = threading.RLock()
+        self._building = {}            # key -> threading.Event (factory en curso)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        nbytes = asset_nbytes(value)
+        if nbytes > self.max_bytes:
+            # Demasiado grande para cachear: se devuelve sin guardar
+            return value
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+        return value
+
+    def get_or_create(self, key, factory, sources=None):
+        """
+        Devuelve el asset de `key` o lo crea con `factory()` y lo guarda.
+        Si `factory` lanza una excepción, no se cachea nada.
+        """
+        while True:
+            with self._lock:
+                value = self.get(key)
+                if value is not None:
+                    return value
+                building = self._building.get(key)
+                if building is None:
+                    building = self._building[key] = threading.Event()
+                    break
+            # Otro hilo la está creando: esperar y volver a mirar (si falló, se reintenta aquí)
+            building.wait()
+
+        try:
+            if sources is not None:
+                return self.put(key, disk_cache.load_or_build(key, sources, factory))
+            return self.put(key, factory())
+        finally:
+            with self._lock:
+                del self._building[key]
+            building.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Cachés globales: en memoria (una por proceso) y en disco (entre ejecuciones)
+asset_cache = AssetCache(ASSET_CACHE_MAX_BYTES)
+disk_cache = DiskSpriteCache(DISK_CACHE_DIR)
+
+
+# ----------------- CARGA DE IMÁGENES -----------------
+
+def _size_key(size=None, scale=None, height=None):
     if size is not None:
-        image = pygame.transform.scale(image, size)
-    return image
+        return tuple(size)
+    if scale is not None:
+        return ("scale", scale)
+    if height is not None:
+        return ("height", height)
+    return None
+
+
+def _target_size(image: pygame.Surface, size=None, scale=None, height=None):
+    if size is not None:
+        return tuple(size)
+    w, h = image.get_size()
+    if scale is not None:
+        return (int(w * scale), int(h * scale))
+    if height is not None:
+        return (int(w * (height / h)), height)
+    return None
+
+
+def load_image(path, size=None, scale=None, height=None, smooth=False):
+    """
+    Carga una imagen con transparencia (convert_alpha), pasando por la caché.
+
+    Reescalado opcional (solo uno de ellos):
+    - `size`: tamaño exacto (width, height).
+    - `scale`: factor sobre el tamaño original.
+    - `height`: alto objetivo manteniendo la proporción.
+    `smooth=True` usa smoothscale en lugar de scale.
+
+    Solo se cachea la variante final, no el original a resolución completa
+    (también en disco: en el siguiente arranque no se decodifica el PNG).
+    """
+    size_key = _size_key(size, scale, height)
+    transform = None
+    if size_key is not None:
+        transform = "smoothscale" if smooth else "scale"
+    key = (path, size_key, transform)
+
+    def factory():
+        image = pygame.image.load(path).convert_alpha()
+        target = _target_size(image, size, scale, height)
+        if target is None:
+            return image
+        if smooth:
+            return pygame.transform.smoothscale(image, target)
+        return pygame.transform.scale(image, target)
+
+    return asset_cache.get_or_create(key, factory, sources=(path,))
+
+
+# ----------------- CARGA DE SONIDOS -----------------
+
+def load_sound(path):
+    """
+    Carga un sonido (pygame.mixer.Sound) una sola vez por proceso, pasando por la caché.
+    El Sound es compartido: el volumen que se le ponga vale para todos.
+    """
+    return asset_cache.get_or_create((path, None, "sound"), lambda: pygame.mixer.Sound(path))
 
 
 def load_images_from_folder(folder_path, size=None):
@@ -19,6 +209,11 @@ def load_images_from_folder(folder_path, size=None):
     Carga todas las imágenes PNG de una carpeta como una lista de Surfaces.
     Útil para animaciones por frames.
     """
+    key = (folder_path, _size_key(size), "folder")
+    frames = asset_cache.get(key)
+    if frames is not None:
+        return frames
+
     frames = []
     if not os.path.isdir(folder_path):
         print(f"[WARN] Carpeta no encontrada: {folder_path}")
@@ -29,7 +224,7 @@ def load_images_from_folder(folder_path, size=None):
             full_path = os.path.join(folder_path, filename)
             img = load_image(full_path, size=size)
             frames.append(img)
-    return frames
+    return asset_cache.put(key, frames)
 
 
 def load_gif_frames(path, size=None):
@@ -40,31 +235,134 @@ def load_gif_frames(path, size=None):
     La función se mantiene por compatibilidad (por ejemplo, si alguna parte
     del código todavía la importa), aunque el tutorial ahora use Nutty.png.
     """
-    frames = []
+    key = (path, _size_key(size), "gif")
+    cached = asset_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # Con la caché en disco caliente ni siquiera se abre el GIF
+    frames = disk_cache.load_or_build(key, (path,), lambda: _decode_gif(path, size))
+    if frames:
+        asset_cache.put(key, frames)
+    return frames
+
+
+# Máscaras (R, G, B, A) de una Surface de 32 bits -> orden de sus bytes en memoria
+# (little-endian). PIL (tobytes) y pygame (frombuffer) usan los mismos nombres.
+_RAW_MODES = {
+    (0xFF0000, 0xFF00, 0xFF, 0xFF000000): "BGRA",
+    (0xFF, 0xFF00, 0xFF0000, 0xFF000000): "RGBA",
+}
+
+
+def _decode_gif(path, size=None):
+    """
+    Decodifica todos los frames de un GIF en una sola tira vertical de pygame.
+
+    La tira (ancho x alto*N) se reserva una vez, ya en el formato con alpha
+    del display, y cada frame se escala directamente en su hueco. Los frames
+    devueltos son subsurfaces de la tira.
+
+    - Frames con paleta (lo normal en un GIF): se leen los índices tal cual
+      (1 byte por píxel), se envuelven con `frombuffer` en una Surface de 8
+      bits con la paleta y el color transparente como colorkey, se escalan
+      en 8 bits y se vuelcan a la tira. Sin pasar por RGBA en PIL.
+    - Frames que PIL ya entrega en RGBA (paleta distinta a la del primero):
+      sus bytes salen en el orden de la tira y se escalan sin convertir.
+
+    El [PERF] informa de los bytes que se copian de verdad en cada paso.
+    """
+    # PIL solo hace falta para los GIFs: importarlo aquí ahorra su coste al arrancar
+    from PIL import GifImagePlugin
+
+    # Por defecto PIL pasa a RGB(A) todos los frames después del primero;
+    # así solo lo hace si el frame trae una paleta distinta. Es un ajuste
+    # global del módulo de PIL: se restaura al acabar para no cambiar cómo
+    # decodifica GIFs el resto del proceso (la tira sale igual con cualquiera
+    # de las dos estrategias; solo cambia lo que se copia)
+    previous_strategy = GifImagePlugin.LOADING_STRATEGY
+    GifImagePlugin.LOADING_STRATEGY = GifImagePlugin.LoadingStrategy.RGB_AFTER_DIFFERENT_PALETTE_ONLY
+    try:
+        return _decode_gif_strip(path, size)
+    finally:
+        GifImagePlugin.LOADING_STRATEGY = previous_strategy
+
+
+def _decode_gif_strip(path, size=None):
+    """Cuerpo de _decode_gif: abre el GIF con PIL y vuelca sus frames en la tira."""
+    from PIL import Image
+
+    start = time.perf_counter()
     try:
         pil_img = Image.open(path)
     except Exception as e:
         print(f"[WARN] No se pudo cargar GIF {path}: {e}")
-        return frames
+        return []
 
+    copied = 0
     try:
-        while True:
-            frame = pil_img.convert("RGBA")
-            mode = frame.mode
-            size_img = frame.size
-            data = frame.tobytes()
-
-            surf = pygame.image.fromstring(data, size_img, mode).convert_alpha()
-            if size is not None:
-                surf = pygame.transform.scale(surf, size)
-            frames.append(surf)
-
-            # siguiente frame del GIF
-            pil_img.seek(pil_img.tell() + 1)
-    except EOFError:
-        # Fin de los frames del GIF
-        pass
+        w, h = pil_img.size
+        tw, th = size if size is not None else (w, h)
+        count = getattr(pil_img, "n_frames", 1)
+
+        display_format = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+        raw_mode = None
+        if sys.byteorder == "little":
+            raw_mode = _RAW_MODES.get(display_format.get_masks())
+        needs_convert = raw_mode is None
+        if needs_convert:
+            # Formato raro: se rellena en RGBA y se convierte la tira entera al final
+            raw_mode = "RGBA"
+            strip = pygame.Surface(
+                (tw, th * count), pygame.SRCALPHA, 32, (0xFF, 0xFF00, 0xFF0000, 0xFF000000)
+            )
+        else:
+            strip = pygame.Surface((tw, th * count), pygame.SRCALPHA, display_format)
+        slot_bytes = tw * th * 4
+
+        # Hueco de 8 bits para escalar los frames con paleta (reutilizado)
+        indexed = pygame.Surface((tw, th), 0, 8)
+
+        for i in range(count):
+            pil_img.seek(i)
+            slot = strip.subsurface((0, i * th, tw, th))
+            if pil_img.mode == "P":
+                data = pil_img.tobytes()
+                src = pygame.image.frombuffer(data, (w, h), "P")
+                palette = pil_img.getpalette()
+                colors = [tuple(palette[k:k + 3]) for k in range(0, len(palette), 3)]
+                # El escalado copia índices: la paleta solo hace falta en el destino
+                indexed.set_palette(colors)
+                pygame.transform.scale(src, (tw, th), indexed)
+                copied += len(data) + tw * th
+
+                key = pil_img.info.get("transparency")
+                if key is not None:
+                    # Los píxeles transparentes quedan con el color de la paleta y alpha 0
+                    indexed.set_colorkey(key)
+                    slot.fill(colors[key] + (0,))
+                    copied += slot_bytes
+                else:
+                    indexed.set_colorkey(None)
+                slot.blit(indexed, (0, 0))
+                copied += slot_bytes
+            else:
+                frame = pil_img if pil_img.mode == "RGBA" else pil_img.convert("RGBA")
+                data = frame.tobytes("raw", raw_mode)
+                src = pygame.image.frombuffer(data, (w, h), raw_mode)
+                pygame.transform.scale(src, (tw, th), slot)
+                copied += (0 if frame is pil_img else w * h * 4) + len(data) + slot_bytes
     finally:
         pil_img.close()
 
+    if needs_convert:
+        strip = strip.convert_alpha()
+        copied += strip.get_pitch() * strip.get_height()
+
+    frames = [strip.subsurface((0, i * th, tw, th)) for i in range(count)]
+    elapsed = (time.perf_counter() - start) * 1000.0
+    print(
+        f"[PERF] GIF {os.path.basename(path)}: {count} frames en {elapsed:.0f} ms, "
+        f"{copied / (1024 * 1024):.1f} MB copiados"
+    )
     return frames
@@ -0,0 +1,90 @@
+# world_chunks.py
+from collections import deque
+
+from settings import CHUNK_WIDTH, CHUNK_SPAWN_BUDGET
+
+
+class ChunkStreamer:
+    """
+    Genera el mundo por chunks de ancho fijo por delante de la cámara y los
+    descarta cuando quedan atrás.
+
+    Las posiciones van en "distancia de cámara" (px recorridos por el plano
+    medio): el chunk `index` ocupa [index * chunk_width, (index + 1) * chunk_width).
+    Qué hay dentro lo decide `generate(index)`, que devuelve un generador que
+    hace `yield` después de cada alta (árbol, bellota, fantasma...). Así el
+    trabajo se reparte entre ticks: `step()` avanza como mucho `budget` altas
+    por tick y un chunk nuevo nunca provoca un tirón.
+
+    Al descartar un chunk se llama a `evict(index)` para liberar lo que quede suyo.
+    """
+
+    def __init__(self, generate, evict, chunk_width: int = CHUNK_WIDTH,
+                 budget: int = CHUNK_SPAWN_BUDGET):
+        self.generate = generate
+        self.evict = evict
+        self.chunk_width = chunk_width
+        self.budget = budget
+
+        self.next_index = 0      # siguiente chunk por encolar
+        self.live = deque()      # chunks encolados o generados y aún no descartados
+        self._pending = deque()  # (index, generador) con altas pendientes
+
+        # Estadísticas
+        self.generated = 0       # chunks terminados
+        self.evicted = 0
+        self.spawned = 0         # altas hechas en total
+        self.max_step = 0        # máximo de altas en un solo step
+
+    def request_until(self, ahead: float):
+        """Encola todos los chunks que empiezan antes de `ahead`."""
+        while self.next_index * self.chunk_width < ahead:
+            index = self.next_index
+            self._pending.append((index, self.generate(index)))
+            self.live.append(index)
+            self.next_index += 1
+
+    def evict_behind(self, behind: float):
+        """Descarta los chunks que terminan antes de `behind`."""
+        while self.live and (self.live[0] + 1) * self.chunk_width <= behind:
+            index = self.live.popleft()
+            # Un chunk que se descarta sin terminar ya no necesita el resto de altas
+            while self._pending and self._pending[0][0] <= index:
+                self._pending.popleft()[1].close()
+            self.evict(index)
+            self.evicted += 1
+
+    def step(self, budget: int = None) -> int:
+        """Avanza la generación pendiente como mucho `budget` altas. Devuelve cuántas hizo."""
+        if budget is None:
+            budget = self.budget
+        done = 0
+        while self._pending and done < budget:
+            try:
+                next(self._pending[0][1])
+                done += 1
+            except StopIteration:
+                self._pending.popleft()
+                self.generated += 1
+        self.spawned += done
+        self.max_step = max(self.max_step, done)
+        return done
+
+    def flush(self) -> int:
+        """Termina ya toda la generación pendiente (p. ej. el primer tramo visible)."""
+        return self.step(float("inf"))
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> dict:
+        return {
+            "chunk_width": self.chunk_width,
+            "live": len(self.live),
+            "pending": self.pending,
+            "generated": self.generated,
+            "evicted": self.evicted,
+            "spawned": self.spawned,
+            "max_step": self.max_step,
+        }
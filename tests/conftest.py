@@ -0,0 +1,17 @@
+# conftest.py
+"""
+Pruebas de los módulos de lógica pura (cachés, pools, chunks, atlas, replays).
+
+Se ejecutan desde la raíz del repo con `python -m pytest -q` (o `make test`).
+Los módulos del juego están en src/ y se importan por nombre, como en main.py.
+Con los drivers dummy de SDL no hace falta ventana ni tarjeta de sonido.
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
@@ -0,0 +1,115 @@
+# test_asset_cache.py
+import pygame
+import pytest
+
+from utils import AssetCache, asset_nbytes
+
+
+def surface(w, h):
+    return pygame.Surface((w, h), pygame.SRCALPHA, 32)
+
+
+def nbytes(w, h):
+    return asset_nbytes(surface(w, h))
+
+
+class Sized:
+    """Asset con nbytes() propio (como ScaledSprite o MaskBank)."""
+
+    def __init__(self, n):
+        self.n = n
+
+    def nbytes(self):
+        return self.n
+
+
+def test_asset_nbytes_counts_surfaces_and_containers():
+    assert nbytes(10, 4) == surface(10, 4).get_pitch() * 4
+    assert asset_nbytes([surface(10, 4), surface(10, 4)]) == 2 * nbytes(10, 4)
+    assert asset_nbytes({"a": surface(10, 4), "b": (surface(2, 2),)}) == nbytes(10, 4) + nbytes(2, 2)
+    assert asset_nbytes(Sized(123)) == 123
+    assert asset_nbytes(42) == 0
+
+
+def test_put_and_replace_keep_byte_count():
+    cache = AssetCache(max_bytes=10_000)
+    cache.put("a", surface(10, 10))
+    cache.put("b", surface(5, 5))
+    assert cache.current_bytes == nbytes(10, 10) + nbytes(5, 5)
+
+    # Sustituir una clave descuenta lo que ocupaba la entrada anterior
+    cache.put("a", surface(2, 2))
+    assert cache.current_bytes == nbytes(2, 2) + nbytes(5, 5)
+    assert cache.stats()["entries"] == 2
+
+    cache.clear()
+    assert cache.current_bytes == 0
+    assert cache.get("a") is None
+
+
+def test_evicts_least_recently_used_first():
+    cache = AssetCache(max_bytes=3 * 400)
+    for key in ("a", "b", "c"):
+        cache.put(key, Sized(400))
+
+    # "a" se usa: ahora la más antigua es "b"
+    assert cache.get("a") is not None
+    cache.put("d", Sized(400))
+
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+    assert cache.current_bytes == 3 * 400
+    assert cache.evictions == 1
+
+
+def test_eviction_frees_enough_for_a_large_entry():
+    cache = AssetCache(max_bytes=1000)
+    for key in ("a", "b", "c", "d"):
+        cache.put(key, Sized(250))
+    cache.put("big", Sized(900))
+
+    assert cache.stats()["entries"] == 1
+    assert cache.current_bytes == 900
+    assert cache.evictions == 4
+
+
+def test_value_larger_than_the_cache_is_returned_but_not_stored():
+    cache = AssetCache(max_bytes=100)
+    cache.put("small", Sized(50))
+    big = Sized(101)
+
+    assert cache.put("big", big) is big
+    assert cache.get("big") is None
+    assert cache.get("small") is not None
+    assert cache.current_bytes == 50
+
+
+def test_get_or_create_builds_once_and_counts_hits():
+    cache = AssetCache(max_bytes=10_000)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return surface(4, 4)
+
+    first = cache.get_or_create("k", factory)
+    second = cache.get_or_create("k", factory)
+
+    assert first is second
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_get_or_create_does_not_cache_a_failing_factory():
+    cache = AssetCache(max_bytes=10_000)
+
+    def broken():
+        raise OSError("no existe")
+
+    with pytest.raises(OSError):
+        cache.get_or_create("k", broken)
+
+    # La clave no queda bloqueada ni guardada: el siguiente intento construye
+    value = cache.get_or_create("k", lambda: surface(1, 1))
+    assert cache.get("k") is value
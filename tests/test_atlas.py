@@ -0,0 +1,99 @@
+# test_atlas.py
+import random
+
+import pygame
+import pytest
+
+from atlas import SpriteAtlas, pack_atlas, pack_shelves
+
+
+def rects(placed, sizes):
+    return {key: (page, pygame.Rect(x, y, *sizes[key])) for key, (page, x, y) in placed.items()}
+
+
+def assert_valid_packing(placed, sizes, page_size):
+    assert placed.keys() == sizes.keys()
+    by_page = {}
+    for key, (page, rect) in rects(placed, sizes).items():
+        if rect.width > page_size or rect.height > page_size:
+            assert rect.topleft == (0, 0)
+        else:
+            assert pygame.Rect(0, 0, page_size, page_size).contains(rect), key
+        by_page.setdefault(page, []).append(rect)
+    for page_rects in by_page.values():
+        for i, rect in enumerate(page_rects):
+            assert rect.collidelist(page_rects[i + 1:]) == -1
+    # Las páginas se numeran sin huecos
+    assert sorted(by_page) == list(range(len(by_page)))
+
+
+def test_random_sizes_never_overlap():
+    rng = random.Random(7)
+    for _ in range(20):
+        sizes = {i: (rng.randint(1, 200), rng.randint(1, 200)) for i in range(60)}
+        assert_valid_packing(pack_shelves(sizes, 256), sizes, 256)
+
+
+def test_shelves_fill_left_to_right_tallest_first():
+    sizes = {"a": (40, 10), "b": (30, 20), "c": (50, 20), "d": (10, 5)}
+    placed = pack_shelves(sizes, 100)
+    # c y b (20 de alto) llenan la primera estantería hasta x=80; a ya no cabe
+    # y abre otra debajo; d (más bajo) aprovecha el hueco de la primera
+    assert placed["c"] == (0, 0, 0)
+    assert placed["b"] == (0, 50, 0)
+    assert placed["a"] == (0, 0, 20)
+    assert placed["d"] == (0, 80, 0)
+
+
+def test_oversized_sprite_gets_its_own_page():
+    sizes = {"big": (300, 40), "small": (10, 10)}
+    placed = pack_shelves(sizes, 256)
+    assert placed["big"] == (0, 0, 0)
+    assert placed["small"] == (1, 0, 0)
+    assert_valid_packing(placed, sizes, 256)
+
+
+def test_full_page_opens_a_new_one():
+    sizes = {i: (60, 60) for i in range(5)}
+    placed = pack_shelves(sizes, 128)
+    pages = sorted(page for page, _, _ in placed.values())
+    assert pages == [0, 0, 0, 0, 1]
+    assert_valid_packing(placed, sizes, 128)
+
+
+def test_empty_input():
+    assert pack_shelves({}, 64) == {}
+
+
+@pytest.fixture
+def display():
+    # pack_atlas usa convert_alpha, que necesita un modo de vídeo
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+def test_pack_atlas_copies_pixels_exactly(display):
+    rng = random.Random(3)
+    sprites = {}
+    for i in range(12):
+        surf = pygame.Surface((rng.randint(1, 40), rng.randint(1, 40)), pygame.SRCALPHA, 32)
+        for x in range(surf.get_width()):
+            for y in range(surf.get_height()):
+                surf.set_at((x, y), [rng.randrange(256) for _ in range(4)])
+        sprites[i] = surf
+    sprites["opaque"] = pygame.Surface((5, 5))
+    sprites["opaque"].fill((10, 20, 30))
+
+    pages, regions = pack_atlas(sprites, page_size=64)
+    atlas = SpriteAtlas(pages, regions)
+    for key, surf in sprites.items():
+        page, rect = atlas[key]
+        assert atlas.size(key) == surf.get_size()
+        region = page.subsurface(rect)
+        expected = surf if surf.get_flags() & pygame.SRCALPHA else surf.convert_alpha()
+        assert pygame.image.tobytes(region, "RGBA") == pygame.image.tobytes(expected, "RGBA")
+    # Cada página se recorta a lo que usa
+    assert all(page.get_width() <= 64 and page.get_height() <= 64 for page in pages)
+    assert 0 < atlas.stats()["fill"] <= 1
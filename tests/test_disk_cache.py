@@ -0,0 +1,132 @@
+# test_disk_cache.py
+import json
+
+import pygame
+import pytest
+
+import disk_cache
+from disk_cache import INDEX_NAME, DiskSpriteCache, _decode, _encode
+
+
+@pytest.fixture(autouse=True)
+def display():
+    # _read usa convert_alpha, que necesita un modo de vídeo
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "tree.png"
+    path.write_bytes(b"imagen v1")
+    return path
+
+
+def sprite(w, h, color, alpha=None):
+    surf = pygame.Surface((w, h), pygame.SRCALPHA, 32)
+    surf.fill(color)
+    if alpha is not None:
+        surf.set_alpha(alpha)
+    return surf
+
+
+def same_pixels(a, b):
+    return a.get_size() == b.get_size() and (
+        pygame.image.tobytes(a, "RGBA") == pygame.image.tobytes(b, "RGBA")
+    )
+
+
+def test_encode_decode_keeps_structure_and_shares_surfaces():
+    surf = sprite(2, 2, (1, 2, 3, 4))
+    value = {"frames": [surf, surf], "size": (2, 2), 3: None, "flip": True, "scale": 0.5}
+    surfaces = []
+    layout = _encode(value, surfaces, {})
+    assert surfaces == [surf]  # la misma Surface se guarda una vez
+    # El layout tiene que sobrevivir a JSON
+    decoded = _decode(json.loads(json.dumps(layout)), surfaces)
+    assert decoded == value
+    assert isinstance(decoded["size"], tuple)
+    assert decoded["frames"][0] is decoded["frames"][1]
+
+    with pytest.raises(TypeError):
+        _encode({1, 2}, [], {})
+
+
+def test_round_trip_from_disk(tmp_path, source):
+    value = {
+        "frames": [sprite(3, 2, (255, 0, 0, 255)), sprite(1, 4, (0, 255, 0, 128))],
+        "faded": sprite(2, 2, (0, 0, 255, 255), alpha=100),
+        "offset": (4, -2),
+        "name": "tree",
+    }
+    cache = DiskSpriteCache(str(tmp_path / "cache"))
+    assert cache.load_or_build("k", [str(source)], lambda: value) is value
+    assert (cache.hits, cache.misses) == (0, 1)
+
+    # Otra instancia (otro arranque) lo lee del disco sin llamar a la factory
+    cache = DiskSpriteCache(str(tmp_path / "cache"))
+    loaded = cache.load_or_build("k", [str(source)], lambda: pytest.fail("factory llamada"))
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert loaded["offset"] == (4, -2) and loaded["name"] == "tree"
+    for a, b in zip(loaded["frames"], value["frames"]):
+        assert same_pixels(a, b)
+    assert loaded["faded"].get_alpha() == 100
+    assert cache.bytes_read == (6 + 4 + 4) * 4
+
+
+def test_changed_source_rebuilds_and_drops_old_entry(tmp_path, source):
+    directory = tmp_path / "cache"
+    cache = DiskSpriteCache(str(directory))
+    cache.load_or_build("k", [str(source)], lambda: sprite(2, 2, (255, 0, 0, 255)))
+    source.write_bytes(b"imagen v2, editada")
+
+    cache = DiskSpriteCache(str(directory))
+    rebuilt = cache.load_or_build("k", [str(source)], lambda: sprite(2, 2, (0, 255, 0, 255)))
+    assert cache.misses == 1
+    assert rebuilt.get_at((0, 0)) == (0, 255, 0, 255)
+    assert cache.stats()["entries"] == 1
+    assert len(list(directory.glob("*.rgba"))) == 1
+
+
+def test_other_index_version_invalidates_everything(tmp_path, source, monkeypatch):
+    directory = tmp_path / "cache"
+    DiskSpriteCache(str(directory)).load_or_build("k", [str(source)], lambda: sprite(1, 1, (9, 9, 9, 255)))
+    assert json.loads((directory / INDEX_NAME).read_text())["version"] == disk_cache.DISK_CACHE_VERSION
+
+    monkeypatch.setattr(disk_cache, "DISK_CACHE_VERSION", disk_cache.DISK_CACHE_VERSION + 1)
+    cache = DiskSpriteCache(str(directory))
+    cache.load_or_build("k", [str(source)], lambda: sprite(1, 1, (9, 9, 9, 255)))
+    assert (cache.hits, cache.misses) == (0, 1)
+
+
+def test_broken_cache_falls_back_to_factory(tmp_path, source):
+    directory = tmp_path / "cache"
+    cache = DiskSpriteCache(str(directory))
+    cache.load_or_build("k", [str(source)], lambda: sprite(4, 4, (1, 1, 1, 255)))
+    (rgba,) = directory.glob("*.rgba")
+    rgba.write_bytes(b"\x00" * 8)  # truncado
+
+    cache = DiskSpriteCache(str(directory))
+    value = cache.load_or_build("k", [str(source)], lambda: sprite(4, 4, (2, 2, 2, 255)))
+    assert value.get_at((0, 0)) == (2, 2, 2, 255)
+    assert cache.misses == 1
+
+    # Una fuente que no existe, o la caché apagada, solo llaman a la factory
+    missing = str(tmp_path / "no_existe.png")
+    assert cache.load_or_build("m", [missing], lambda: "fallback") == "fallback"
+    off = DiskSpriteCache(str(tmp_path / "off"), enabled=False)
+    assert off.load_or_build("k", [str(source)], lambda: "built") == "built"
+    assert not (tmp_path / "off").exists()
+
+
+def test_clear_removes_entries(tmp_path, source):
+    directory = tmp_path / "cache"
+    cache = DiskSpriteCache(str(directory))
+    cache.load_or_build("a", [str(source)], lambda: sprite(1, 1, (0, 0, 0, 255)))
+    cache.load_or_build("b", [str(source)], lambda: [sprite(1, 1, (0, 0, 0, 255))])
+    assert cache.stats()["entries"] == 2
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert list(directory.glob("*.rgba")) == []
@@ -0,0 +1,71 @@
+# test_input_sources.py
+import struct
+
+import pygame
+import pytest
+
+from input_sources import (
+    RECORDED_KEYS, REPLAY_MAGIC, REPLAY_VERSION, KeyState, RecordingInput, ReplayInput,
+    ScriptedInput, pack_keys,
+)
+
+
+def test_pack_keys_one_bit_per_recorded_key():
+    assert pack_keys(KeyState()) == 0
+    assert pack_keys(KeyState([pygame.K_LEFT])) == 1
+    assert pack_keys(KeyState([pygame.K_UP, pygame.K_SPACE])) == 0b10100
+    assert pack_keys(KeyState(RECORDED_KEYS)) == (1 << len(RECORDED_KEYS)) - 1
+    # Las teclas que no se graban no cuentan
+    assert pack_keys(KeyState([pygame.K_ESCAPE])) == 0
+
+
+def test_record_and_replay_round_trip(tmp_path):
+    script = [(), (pygame.K_RIGHT,), (pygame.K_UP, pygame.K_RIGHT), (pygame.K_s, pygame.K_ESCAPE)]
+    recorder = RecordingInput(ScriptedInput(script))
+    for _ in script:
+        recorder.get_pressed()
+    path = tmp_path / "run.nlr"
+    recorder.save(str(path), seed=2**40 + 7, tick_rate=60)
+
+    replay = ReplayInput.load(str(path))
+    assert replay.seed == 2**40 + 7
+    assert replay.tick_rate == 60
+    for pressed in script:
+        keys = replay.get_pressed()
+        for key in RECORDED_KEYS:
+            assert keys[key] == (key in pressed)
+        assert not keys[pygame.K_ESCAPE]
+    assert replay.finished
+    assert replay.get_pressed().pressed == frozenset()
+
+
+def test_save_writes_v2_header_then_one_byte_per_tick(tmp_path):
+    recorder = RecordingInput(ScriptedInput([(pygame.K_LEFT,), ()]))
+    for _ in range(3):
+        recorder.get_pressed()
+    path = tmp_path / "run.nlr"
+    recorder.save(str(path), seed=42, tick_rate=120)
+
+    data = path.read_bytes()
+    assert struct.unpack_from("<4sBQH", data) == (REPLAY_MAGIC, 2, 42, 120)
+    assert data[struct.calcsize("<4sBQH"):] == bytes([1, 0, 1])
+
+
+def write_replay(path, magic=REPLAY_MAGIC, version=REPLAY_VERSION):
+    path.write_bytes(struct.pack("<4sBQH", magic, version, 1, 60) + b"\x00\x01")
+
+
+def test_load_rejects_other_versions(tmp_path):
+    path = tmp_path / "old.nlr"
+    write_replay(path, version=1)
+    with pytest.raises(ValueError, match="otra versión"):
+        ReplayInput.load(str(path))
+
+
+def test_load_rejects_bad_magic(tmp_path):
+    path = tmp_path / "bad.nlr"
+    write_replay(path, magic=b"XXXX")
+    with pytest.raises(ValueError, match="no válido"):
+        ReplayInput.load(str(path))
+    write_replay(path)
+    assert ReplayInput.load(str(path)).ticks == b"\x00\x01"
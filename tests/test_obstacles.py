@@ -0,0 +1,146 @@
+# test_obstacles.py
+import random
+
+import numpy as np
+import pygame
+
+from obstacles import ObstacleArrays
+
+
+def brute_collide(obs, rect, plane):
+    """Referencia: Rect.colliderect contra la hitbox de cada fila activa del plano."""
+    hits = []
+    for i in np.flatnonzero(obs.active & (obs.plane == plane)).tolist():
+        hitbox = pygame.Rect(0, 0, int(obs.hit_w[i]), int(obs.hit_h[i]))
+        hitbox.midbottom = obs.rect(i).midbottom
+        if hitbox.colliderect(rect):
+            hits.append(i)
+    return hits
+
+
+def brute_visible(obs, plane, left, right):
+    planes = range(len(obs.capacity)) if plane is None else (plane,)
+    return sorted(
+        i for i in np.flatnonzero(obs.active).tolist()
+        if int(obs.plane[i]) in planes and obs.x[i] < right and obs.x[i] + obs.w[i] > left
+    )
+
+
+def random_world(rng, capacity=40):
+    obs = ObstacleArrays(capacity=capacity, speed=1.0)
+    for _ in range(capacity * 2):
+        w, h = rng.randint(10, 120), rng.randint(10, 200)
+        rect = pygame.Rect(rng.randint(-200, 2000), rng.randint(0, 500), w, h)
+        obs.spawn(rect, plane=rng.randrange(3), hit_size=(rng.randint(0, w), rng.randint(0, h)))
+    return obs
+
+
+def test_candidates_are_strictly_inside_window():
+    obs = ObstacleArrays(capacity=8)
+    for x in (0, 100, 200, 300):
+        obs.spawn(pygame.Rect(x, 0, 10, 10))
+    assert sorted(obs._candidates(0, 100, 300).tolist()) == [2]
+    assert sorted(obs._candidates(0, 99, 301).tolist()) == [1, 2, 3]
+    assert len(obs._candidates(1, -1000, 1000)) == 0
+
+
+def test_candidates_follow_scroll_without_reindexing():
+    obs = ObstacleArrays(capacity=8)
+    for x in (300, 100, 200):
+        obs.spawn(pygame.Rect(x, 0, 10, 10))
+    obs._candidates(0, 0, 0)  # construye el índice
+    assert not obs._dirty
+
+    obs.scroll([50.0, 0.0, 0.0])
+    assert not obs._dirty  # el scroll no desordena nada
+    rows = obs._candidates(0, 40, 260).tolist()
+    assert sorted(obs.x[rows].tolist()) == [50, 150, 250]
+
+
+def test_collide_and_visible_match_brute_force():
+    rng = random.Random(1234)
+    obs = random_world(rng)
+    for step in range(60):
+        obs.scroll([rng.uniform(0, 30), rng.uniform(0, 15), rng.uniform(0, 5)])
+        if step % 7 == 0:
+            # Reciclar: los que salen por la izquierda se recolocan a la derecha
+            for i in obs.offscreen_left().tolist():
+                plane = int(obs.plane[i])
+                obs.despawn(i)
+                obs.spawn(pygame.Rect(rng.randint(1800, 2400), rng.randint(0, 500), 60, 90),
+                          plane=plane, hit_size=(20, 80))
+        for _ in range(5):
+            rect = pygame.Rect(rng.randint(-100, 2000), rng.randint(0, 500),
+                               rng.randint(0, 80), rng.randint(0, 80))
+            for plane in range(3):
+                assert obs.collide(rect, plane).tolist() == brute_collide(obs, rect, plane)
+        left = rng.randint(-100, 800)
+        right = left + rng.randint(0, 1200)
+        for plane in (None, 0, 1, 2):
+            assert obs.visible(plane, left, right).tolist() == brute_visible(obs, plane, left, right)
+
+
+def test_touching_edges_do_not_collide():
+    obs = ObstacleArrays(capacity=4)
+    obs.spawn(pygame.Rect(100, 100, 50, 50))
+    assert len(obs.collide(pygame.Rect(50, 100, 50, 50), 0)) == 0
+    assert obs.collide(pygame.Rect(51, 100, 50, 50), 0).tolist() == [0]
+    assert len(obs.collide(pygame.Rect(120, 120, 0, 10), 0)) == 0
+
+
+def test_empty_hitbox_never_collides():
+    obs = ObstacleArrays(capacity=4)
+    obs.spawn(pygame.Rect(100, 100, 50, 50), hit_size=(0, 50))
+    assert len(obs.collide(pygame.Rect(0, 0, 500, 500), 0)) == 0
+    # ...pero se sigue viendo
+    assert obs.visible(0, 0, 800).tolist() == [0]
+
+
+def test_spawn_uses_lowest_free_row_of_its_plane():
+    obs = ObstacleArrays(capacity={0: 2, 2: 3})
+    assert obs.capacity == [2, 0, 3]
+    assert obs.spawn(pygame.Rect(0, 0, 10, 10), plane=2) == 2
+    assert obs.spawn(pygame.Rect(0, 0, 10, 10), plane=0) == 0
+    assert obs.spawn(pygame.Rect(0, 0, 10, 10), plane=2) == 3
+    assert len(obs) == 3
+
+
+def test_full_plane_overflows_without_growing():
+    obs = ObstacleArrays(capacity=2)
+    rows = [obs.spawn(pygame.Rect(i * 10, 0, 10, 10), plane=1) for i in range(3)]
+    assert rows == [2, 3, None]
+    assert obs.size == 6 and len(obs.x) == 6
+    assert obs.stats()[1] == {"active": 2, "capacity": 2, "peak": 2, "overflows": 1}
+
+
+def test_despawn_frees_row_for_reuse():
+    obs = ObstacleArrays(capacity=3)
+    a = obs.spawn(pygame.Rect(0, 0, 10, 10))
+    b = obs.spawn(pygame.Rect(100, 0, 10, 10))
+    obs.despawn(a)
+    obs.despawn(a)  # liberar dos veces no descuadra la cuenta
+    assert len(obs) == 1 and not obs.active[a]
+    assert obs.visible(0, -50, 500).tolist() == [b]
+
+    # El hueco liberado se reutiliza y sus datos se pisan
+    assert obs.spawn(pygame.Rect(300, 5, 20, 30), kind=2) == a
+    assert obs.rect(a) == pygame.Rect(300, 5, 20, 30)
+    assert obs.kind[a] == 2
+    assert obs.visible(0, -50, 500).tolist() == [a, b]
+    assert obs.stats()[0]["peak"] == 2
+
+
+def test_despawn_chunk_only_frees_that_chunk():
+    obs = ObstacleArrays(capacity=4)
+    for chunk in (7, 8, 7, 8):
+        obs.spawn(pygame.Rect(chunk * 10, 0, 10, 10), plane=0, chunk=chunk)
+    obs.spawn(pygame.Rect(0, 0, 10, 10), plane=1, chunk=7)
+
+    assert obs.despawn_chunk(7) == 3
+    assert obs.despawn_chunk(7) == 0
+    assert np.flatnonzero(obs.active).tolist() == [1, 3]
+    assert obs.stats()[0]["active"] == 2 and obs.stats()[1]["active"] == 0
+    assert len(obs.collide(pygame.Rect(-100, -100, 1000, 1000), 1)) == 0
+
+    # Los huecos del chunk descargado sirven para el siguiente
+    assert [obs.spawn(pygame.Rect(0, 0, 10, 10), chunk=9) for _ in range(3)] == [0, 2, None]
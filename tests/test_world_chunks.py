@@ -0,0 +1,86 @@
+# test_world_chunks.py
+from world_chunks import ChunkStreamer
+
+
+class FakeWorld:
+    """Mundo de prueba: cada chunk da `per_chunk` altas y apunta qué pasa."""
+
+    def __init__(self, per_chunk=3):
+        self.per_chunk = per_chunk
+        self.spawned = []   # (chunk, n)
+        self.closed = []    # chunks cuyo generador se cerró sin terminar
+        self.evicted = []
+
+    def generate(self, index):
+        try:
+            for n in range(self.per_chunk):
+                self.spawned.append((index, n))
+                yield
+        except GeneratorExit:
+            self.closed.append(index)
+            raise
+
+    def evict(self, index):
+        self.evicted.append(index)
+
+    def streamer(self, budget=4):
+        return ChunkStreamer(self.generate, self.evict, chunk_width=100, budget=budget)
+
+
+def test_request_until_queues_chunks_lazily():
+    world = FakeWorld()
+    streamer = world.streamer()
+    streamer.request_until(250)
+    assert list(streamer.live) == [0, 1, 2]
+    assert streamer.pending == 3
+    assert world.spawned == []  # nada se genera hasta step()
+
+    streamer.request_until(250)
+    streamer.request_until(300)
+    assert list(streamer.live) == [0, 1, 2]
+    streamer.request_until(301)
+    assert list(streamer.live) == [0, 1, 2, 3]
+
+
+def test_step_respects_budget_in_order():
+    world = FakeWorld(per_chunk=3)
+    streamer = world.streamer(budget=4)
+    streamer.request_until(200)
+
+    assert streamer.step() == 4
+    assert world.spawned == [(0, 0), (0, 1), (0, 2), (1, 0)]
+    assert streamer.generated == 1
+    assert streamer.step() == 2
+    assert streamer.step() == 0
+    assert streamer.pending == 0
+    assert streamer.stats()["generated"] == 2
+    assert streamer.stats()["spawned"] == 6
+    assert streamer.max_step == 4
+
+
+def test_flush_finishes_everything():
+    world = FakeWorld(per_chunk=5)
+    streamer = world.streamer(budget=1)
+    streamer.request_until(300)
+    assert streamer.flush() == 15
+    assert streamer.pending == 0 and streamer.generated == 3
+
+
+def test_evict_behind_drops_finished_chunks_and_closes_pending():
+    world = FakeWorld(per_chunk=3)
+    streamer = world.streamer(budget=2)
+    streamer.request_until(300)
+    streamer.step()  # chunk 0 a medias
+
+    # El chunk 1 termina justo en 200: se descarta; el 2 no
+    streamer.evict_behind(200)
+    assert world.evicted == [0, 1]
+    assert world.closed == [0]  # el 1 ni había empezado
+    assert list(streamer.live) == [2]
+    assert streamer.evicted == 2
+
+    # Lo pendiente sigue por el chunk 2
+    streamer.flush()
+    assert world.spawned[-3:] == [(2, 0), (2, 1), (2, 2)]
+    streamer.evict_behind(199)
+    assert list(streamer.live) == [2]